@@ -0,0 +1,191 @@
+import hashlib
+import inspect
+import logging
+from email.utils import formatdate, parsedate_to_datetime
+from functools import wraps
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+import redis
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.pagination import Page
+from app.config import settings
+from app.models.team import Team
+from app.models.player import Player
+from app.models.routing import recently_changed, use_primary
+from app.utils.cache import LEAGUES_SCOPE, get_data_versions, get_response_cache, league_scope
+
+logger = logging.getLogger(__name__)
+
+# Teams and players never move between leagues, so these lookups can be kept for good
+_team_leagues: Dict[int, int] = {}
+_player_leagues: Dict[int, int] = {}
+
+
+async def _team_league(db: AsyncSession, team_id: int) -> Optional[int]:
+    if team_id not in _team_leagues:
+        league_id = await db.scalar(select(Team.league_id).where(Team.id == team_id))
+        if league_id is None:
+            return None
+        _team_leagues[team_id] = league_id
+    return _team_leagues[team_id]
+
+
+async def _player_league(db: AsyncSession, player_id: int) -> Optional[int]:
+    if player_id not in _player_leagues:
+        league_id = await db.scalar(
+            select(Team.league_id).join(Player, Player.team_id == Team.id).where(Player.id == player_id)
+        )
+        if league_id is None:
+            return None
+        _player_leagues[player_id] = league_id
+    return _player_leagues[player_id]
+
+
+async def resolve_scope(scope: str, params: Dict[str, Any]) -> Optional[str]:
+    """Data-version scope a request reads from, or None when its entity does not exist"""
+    if scope == "leagues":
+        return LEAGUES_SCOPE
+    if scope == "league":
+        return league_scope(params["league_id"])
+    if scope == "team":
+        league_id = await _team_league(params["db"], params["team_id"])
+    elif scope == "player":
+        league_id = await _player_league(params["db"], params["player_id"])
+    else:
+        raise ValueError(f"Unknown cache scope: {scope}")
+    return league_scope(league_id) if league_id is not None else None
+
+
+def cache_key(route: str, params: Dict[str, Any], scope: str, version: int) -> str:
+    query = urlencode(sorted(
+        (name, str(value)) for name, value in params.items()
+        if name != "db" and value is not None
+    ))
+    return f"{route}?{query}|{scope}@{version}"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return any(
+        (candidate[2:] if candidate.startswith("W/") else candidate) == etag
+        for candidate in candidates
+    )
+
+
+def not_modified_since(if_modified_since: Optional[str], modified: float) -> bool:
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return int(modified) <= since.timestamp()
+
+
+async def _render(func, adapter: TypeAdapter, kwargs: Dict[str, Any]):
+    """Run an endpoint: a prebuilt Response as is, otherwise the cache entry (next cursor, newline, JSON body)"""
+    result = await func(**kwargs)
+    if isinstance(result, Response):
+        return result
+    next_cursor = ""
+    if isinstance(result, Page):
+        result, next_cursor = result.items, result.next_cursor or ""
+    body = adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+    return next_cursor.encode() + b"\n" + body
+
+
+def _entry_response(entry, headers: Dict[str, str]) -> Response:
+    if isinstance(entry, Response):
+        # Streaming and other prebuilt responses are passed through uncached
+        entry.headers.update(headers)
+        return entry
+    next_cursor, body = entry.split(b"\n", 1)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor.decode()
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cached_response(scope: str, response_model):
+    """Serve a read endpoint from the response cache with conditional GET support
+    
+    Entries are keyed by route, query params and the data version of the league the
+    route reads from ("league", "team", "player" or "leagues"), so a committed scrape
+    invalidates exactly that league's responses. The same key yields a strong ETag
+    and the version time a Last-Modified, so revalidating clients get a 304 without
+    the query or serialization running. Endpoints may return a Page, whose next
+    cursor is sent in the X-Next-Cursor header. Reads of a league changed within
+    DB_REPLICA_GRACE seconds go to the primary instead of a replica.
+    """
+    adapter = TypeAdapter(response_model)
+    
+    def decorator(func):
+        signature = inspect.signature(func)
+        # Ask FastAPI for the request so the validators can be read
+        inject_request = "request" not in signature.parameters
+        if inject_request:
+            signature = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            ])
+        
+        @wraps(func)
+        async def wrapper(**kwargs):
+            request: Request = kwargs.pop("request") if inject_request else kwargs["request"]
+            params = {name: value for name, value in kwargs.items() if name != "request"}
+            cache = get_response_cache()
+            
+            try:
+                version_scope = await resolve_scope(scope, params)
+                if version_scope is None:
+                    return _entry_response(await _render(func, adapter, kwargs), {})
+                version = await get_data_versions().get_async(version_scope)
+                key = cache_key(func.__name__, params, version_scope, version)
+                if recently_changed(version) and "db" in params:
+                    # Replicas may still lag a scrape that just committed; the response
+                    # is cached under the new version, so it must come from the primary
+                    use_primary(params["db"])
+            except redis.RedisError as e:
+                logger.warning(f"Data versions unavailable: {e}")
+                return _entry_response(await _render(func, adapter, kwargs), {})
+            
+            headers = {
+                "ETag": f'"{hashlib.sha1(key.encode()).hexdigest()}"',
+                "Last-Modified": formatdate(version / 1000, usegmt=True),
+                "Cache-Control": settings.api_cache_control,
+            }
+            if_none_match = request.headers.get("if-none-match")
+            if etag_matches(if_none_match, headers["ETag"]) or (
+                if_none_match is None
+                and not_modified_since(request.headers.get("if-modified-since"), version / 1000)
+            ):
+                return Response(status_code=304, headers=headers)
+            
+            entry = None
+            if cache is not None:
+                try:
+                    entry = await cache.get(key)
+                except redis.RedisError as e:
+                    logger.warning(f"Response cache unavailable: {e}")
+            
+            if entry is None:
+                entry = await _render(func, adapter, kwargs)
+                if cache is not None and not isinstance(entry, Response):
+                    try:
+                        await cache.set(key, entry)
+                    except redis.RedisError as e:
+                        logger.warning(f"Failed to store cached response: {e}")
+            
+            return _entry_response(entry, headers)
+        
+        wrapper.__signature__ = signature
+        return wrapper
+    
+    return decorator
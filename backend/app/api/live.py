@@ -0,0 +1,171 @@
+import asyncio
+import logging
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Optional, Set
+import redis
+import redis.asyncio as aioredis
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.utils.events import SCORES_CHANNEL_PATTERN, SCORES_CHANNEL_PREFIX, get_local_bus
+from app.utils.metrics import LIVE_CLIENTS, LIVE_EVENTS
+
+logger = logging.getLogger(__name__)
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+# Queued in place of a client's dropped backlog, or after the upstream reconnects
+RESYNC = object()
+
+
+class Subscription:
+    """One connected client's queue of pending messages for a league"""
+    
+    def __init__(self, league_id: int, queue_size: int):
+        self.league_id = league_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    
+    def offer(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too far behind: drop what is pending and tell the client to refetch
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+
+class ScoreBroadcaster:
+    """Fans the league score channels out to this process's connected clients
+    
+    There is one upstream subscription per API process however many clients are
+    connected; it starts with the first client and stops after the last one leaves.
+    """
+    
+    def __init__(self, backend: str, queue_size: int):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._clients: Dict[int, Set[Subscription]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def subscribe(self, league_id: int) -> Subscription:
+        subscription = Subscription(league_id, self.queue_size)
+        self._clients.setdefault(league_id, set()).add(subscription)
+        LIVE_CLIENTS.inc()
+        self._start()
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        clients = self._clients.get(subscription.league_id)
+        if clients is None or subscription not in clients:
+            return
+        clients.discard(subscription)
+        if not clients:
+            del self._clients[subscription.league_id]
+        LIVE_CLIENTS.dec()
+        if not self._clients:
+            self._stop()
+    
+    def dispatch(self, channel: str, message: str):
+        """Queue a published message for every client of its league"""
+        try:
+            league_id = int(channel[len(SCORES_CHANNEL_PREFIX):])
+        except ValueError:
+            return
+        for subscription in self._clients.get(league_id, ()):
+            subscription.offer(message)
+    
+    def resync_all(self):
+        for clients in self._clients.values():
+            for subscription in clients:
+                subscription.offer(RESYNC)
+    
+    def _start(self):
+        if self.backend == "memory":
+            if self._loop is None:
+                self._loop = asyncio.get_running_loop()
+                get_local_bus().subscribe(self._from_local_bus)
+        elif self.backend == "redis" and (self._listener is None or self._listener.done()):
+            self._listener = asyncio.create_task(self._listen())
+    
+    def _stop(self):
+        if self._loop is not None:
+            get_local_bus().unsubscribe(self._from_local_bus)
+            self._loop = None
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+    
+    def _from_local_bus(self, channel: str, message: str):
+        # Publishers may run in other threads; hand the message to the API's loop
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self.dispatch, channel, message)
+    
+    async def _listen(self):
+        """Relay the Redis pattern subscription, reconnecting after errors"""
+        reconnecting = False
+        while True:
+            client = aioredis.Redis.from_url(settings.redis_url)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(SCORES_CHANNEL_PATTERN)
+                if reconnecting:
+                    # Messages published while disconnected are gone
+                    self.resync_all()
+                    reconnecting = False
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self.dispatch(message["channel"].decode(), message["data"].decode())
+            except (redis.RedisError, OSError) as e:
+                logger.warning(f"Live score subscription lost, reconnecting: {e}")
+                reconnecting = True
+                await asyncio.sleep(settings.live_events_reconnect_delay)
+            finally:
+                await pubsub.close()
+                await client.close()
+    
+    async def close(self):
+        listener = self._listener
+        self._stop()
+        if listener is not None:
+            try:
+                await listener
+            except asyncio.CancelledError:
+                pass
+
+
+@lru_cache(maxsize=None)
+def get_broadcaster() -> ScoreBroadcaster:
+    return ScoreBroadcaster(settings.live_events_backend, settings.live_events_queue_size)
+
+
+async def score_events(request: Request, subscription: Subscription) -> AsyncIterator[str]:
+    """Server-sent events for one client: game deltas, resync hints and keep-alive comments"""
+    broadcaster = get_broadcaster()
+    try:
+        yield f"retry: {settings.live_events_retry_ms}\n\n"
+        while not await request.is_disconnected():
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), settings.live_events_heartbeat)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+                continue
+            if message is RESYNC:
+                LIVE_EVENTS.labels("resync").inc()
+                yield "event: resync\ndata: {}\n\n"
+            else:
+                LIVE_EVENTS.labels("game").inc()
+                yield f"event: game\ndata: {message}\n\n"
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+def event_stream_response(request: Request, league_id: int) -> StreamingResponse:
+    subscription = get_broadcaster().subscribe(league_id)
+    return StreamingResponse(
+        score_events(request, subscription),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
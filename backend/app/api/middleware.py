@@ -0,0 +1,37 @@
+import time
+from app.utils.metrics import HTTP_REQUEST_SECONDS
+
+
+class RequestMetricsMiddleware:
+    """Records request latency per route template, e.g. /api/leagues/{league_id}
+    
+    Plain ASGI rather than BaseHTTPMiddleware so streamed responses pass through
+    untouched. Requests matching no route share one label to bound cardinality.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"],
+                getattr(route, "path_format", None) or "unmatched",
+                str(status)
+            ).observe(time.perf_counter() - start)
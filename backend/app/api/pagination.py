@@ -0,0 +1,95 @@
+import json
+import base64
+import binascii
+from datetime import date, datetime
+from typing import Any, AsyncIterator, List, Optional, Sequence
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.routing import ReadSessionLocal, use_primary
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 1000
+
+
+class Page:
+    """One page of a keyset-paginated listing"""
+    
+    def __init__(self, items: List[Any], next_cursor: Optional[str]):
+        self.items = items
+        self.next_cursor = next_cursor
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([
+        value.isoformat() if isinstance(value, (date, datetime)) else value
+        for value in values
+    ])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    """Decode a cursor into values typed like the keyset columns"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match this listing")
+        typed = []
+        for column, value in zip(columns, values):
+            python_type = column.type.python_type
+            if value is not None and python_type in (date, datetime):
+                value = python_type.fromisoformat(value)
+            typed.append(value)
+        return typed
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+
+
+def apply_keyset(statement, columns: Sequence, cursor: Optional[str], descending: bool = False):
+    """Order a select by columns (the last must be unique) and start it after cursor"""
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        position = tuple_(*columns)
+        bound = tuple_(*values)
+        statement = statement.where(position < bound if descending else position > bound)
+    return statement.order_by(*(column.desc() if descending else column for column in columns))
+
+
+async def keyset_page(
+    db: AsyncSession,
+    statement,
+    columns: Sequence,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = False
+) -> Page:
+    """Fetch one page of ORM rows after cursor"""
+    statement = apply_keyset(statement, columns, cursor, descending).limit(limit + 1)
+    rows = (await db.scalars(statement)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in columns])
+    return Page(rows, next_cursor)
+
+
+def ndjson_response(model, statement, primary: bool = False) -> StreamingResponse:
+    """Stream a statement's rows as NDJSON from a server-side cursor
+    
+    The generator owns its session so rows keep flowing after the request's
+    dependencies have been torn down. It reads from a replica unless primary is set
+    (pass on_primary() of the request's session to follow its routing).
+    """
+    async def generate() -> AsyncIterator[bytes]:
+        async with ReadSessionLocal() as db:
+            if primary:
+                use_primary(db)
+            result = await db.stream(
+                statement.execution_options(yield_per=STREAM_BATCH_SIZE)
+            )
+            async for row in result.mappings():
+                yield model.model_validate(dict(row)).model_dump_json().encode() + b"\n"
+    
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE)
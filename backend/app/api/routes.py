@@ -1,18 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
-from app.models.database import get_db
+from app.config import settings
+from app.models.routing import ReadSessionLocal, get_read_db, on_primary, use_primary
 from app.models.league import League
 from app.models.team import Team
 from app.models.player import Player
 from app.models.game import Game
 from app.models.standing import Standing
 from app.models.statistics import PlayerStatistics, TeamStatistics
+from app.api.cache import cached_response
+from app.api.pagination import apply_keyset, keyset_page, ndjson_response
+from app.api.live import event_stream_response
+from app.utils.export import (
+    DATASETS, EXPORT_FORMATS, SEASON_PATTERN, SEASONAL_DATASETS, ExportUnavailable, create_writer,
+    stream_export_batches
+)
 from pydantic import BaseModel
-from datetime import date
+from datetime import date, datetime, time
 
 router = APIRouter()
 
+CURSOR_DESCRIPTION = "Opaque cursor from a previous page's X-Next-Cursor header"
+STREAM_DESCRIPTION = "Stream every matching row as NDJSON instead of returning one page"
+
 
 # Pydantic models for API responses
 class LeagueResponse(BaseModel):
@@ -60,7 +74,7 @@ class GameResponse(BaseModel):
     home_team_id: int
     away_team_id: int
     game_date: date
-    game_time: Optional[str]
+    game_time: Optional[time]
     status: str
     home_score: Optional[int]
     away_score: Optional[int]
@@ -83,146 +97,363 @@ class StandingResponse(BaseModel):
     goals_for: int
     goals_against: int
     goal_difference: int
+    win_percentage: Optional[float]
     games_played: int
     
     class Config:
         from_attributes = True
 
 
+class TeamStatisticsResponse(BaseModel):
+    id: int
+    team_id: int
+    season: str
+    games_played: Optional[int]
+    goals_for: Optional[int]
+    goals_against: Optional[int]
+    goal_difference: Optional[int]
+    goals_per_game: Optional[float]
+    shots_per_game: Optional[float]
+    power_play_percentage: Optional[float]
+    penalty_kill_percentage: Optional[float]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+class PlayerStatisticsResponse(BaseModel):
+    id: int
+    player_id: int
+    season: str
+    games_played: Optional[int]
+    goals: Optional[int]
+    assists: Optional[int]
+    points: Optional[int]
+    shots: Optional[int]
+    shots_on_goal: Optional[int]
+    penalty_minutes: Optional[int]
+    plus_minus: Optional[int]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+class LeagueOverviewResponse(BaseModel):
+    league: LeagueResponse
+    season: Optional[str]
+    teams: List[TeamResponse]
+    standings: List[StandingResponse]
+    recent_games: List[GameResponse]
+
+
+async def ensure_exists(db: AsyncSession, model, entity_id: int, detail: str):
+    """404 unless the row exists
+    
+    List endpoints query their page first and only ask when it comes back empty, so
+    a page costs one query rather than a parent lookup plus the page.
+    """
+    if await db.scalar(select(model.id).where(model.id == entity_id)) is None:
+        raise HTTPException(status_code=404, detail=detail)
+
+
 # League endpoints
 @router.get("/leagues", response_model=List[LeagueResponse])
+@cached_response("leagues", List[LeagueResponse])
 async def get_leagues(
     active: Optional[bool] = Query(None, description="Filter by active status"),
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, deprecated=True, description="Use cursor instead"),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all leagues"""
-    query = db.query(League)
+    query = select(League)
     if active is not None:
-        query = query.filter(League.active == active)
-    leagues = query.offset(skip).limit(limit).all()
-    return leagues
+        query = query.where(League.active == active)
+    if skip and not cursor:
+        query = query.offset(skip)
+    return await keyset_page(db, query, [League.id], cursor, limit)
 
 
 @router.get("/leagues/{league_id}", response_model=LeagueResponse)
-async def get_league(league_id: int, db: Session = Depends(get_db)):
+@cached_response("league", LeagueResponse)
+async def get_league(league_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific league"""
-    league = db.query(League).filter(League.id == league_id).first()
+    league = await db.get(League, league_id)
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
     return league
 
 
 @router.get("/leagues/{league_id}/teams", response_model=List[TeamResponse])
-async def get_league_teams(league_id: int, db: Session = Depends(get_db)):
+@cached_response("league", List[TeamResponse])
+async def get_league_teams(
+    league_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get all teams in a league"""
-    league = db.query(League).filter(League.id == league_id).first()
-    if not league:
-        raise HTTPException(status_code=404, detail="League not found")
-    return league.teams
+    query = select(Team).where(Team.league_id == league_id)
+    page = await keyset_page(db, query, [Team.id], cursor, limit)
+    if not page.items:
+        await ensure_exists(db, League, league_id, "League not found")
+    return page
 
 
 @router.get("/leagues/{league_id}/standings", response_model=List[StandingResponse])
+@cached_response("league", List[StandingResponse])
 async def get_league_standings(
     league_id: int,
     season: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get league standings"""
-    league = db.query(League).filter(League.id == league_id).first()
-    if not league:
-        raise HTTPException(status_code=404, detail="League not found")
-    
-    query = db.query(Standing).filter(Standing.league_id == league_id)
+    query = select(Standing).where(Standing.league_id == league_id)
     if season:
-        query = query.filter(Standing.season == season)
+        query = query.where(Standing.season == season)
     
-    standings = query.order_by(Standing.rank).all()
-    return standings
+    page = await keyset_page(db, query, [Standing.rank, Standing.id], cursor, limit)
+    if not page.items:
+        await ensure_exists(db, League, league_id, "League not found")
+    return page
 
 
 @router.get("/leagues/{league_id}/games", response_model=List[GameResponse])
+@cached_response("league", List[GameResponse])
 async def get_league_games(
     league_id: int,
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    stream: bool = Query(False, description=STREAM_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get games for a league"""
-    league = db.query(League).filter(League.id == league_id).first()
+    """Get games for a league, newest first"""
+    filters = [Game.league_id == league_id]
+    if date_from:
+        filters.append(Game.game_date >= date_from)
+    if date_to:
+        filters.append(Game.game_date <= date_to)
+    
+    keyset = [Game.game_date, Game.id]
+    if stream:
+        await ensure_exists(db, League, league_id, "League not found")
+        query = select(*Game.__table__.columns).where(*filters)
+        return ndjson_response(GameResponse, apply_keyset(query, keyset, cursor, descending=True), on_primary(db))
+    page = await keyset_page(db, select(Game).where(*filters), keyset, cursor, limit, descending=True)
+    if not page.items:
+        await ensure_exists(db, League, league_id, "League not found")
+    return page
+
+
+@router.get("/leagues/{league_id}/overview", response_model=LeagueOverviewResponse)
+@cached_response("league", LeagueOverviewResponse)
+async def get_league_overview(
+    league_id: int,
+    games: int = Query(10, ge=1, le=50, description="How many recent games to include"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get a league with its teams, latest standings and most recent games
+    
+    Served in four queries however large the league: the league, its teams (loaded
+    together with selectinload), the standings of its latest season and the games.
+    """
+    league = await db.scalar(
+        select(League).where(League.id == league_id).options(selectinload(League.teams))
+    )
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
     
-    query = db.query(Game).filter(Game.league_id == league_id)
-    if date_from:
-        query = query.filter(Game.game_date >= date_from)
-    if date_to:
-        query = query.filter(Game.game_date <= date_to)
+    latest_season = (
+        select(func.max(Standing.season)).where(Standing.league_id == league_id).scalar_subquery()
+    )
+    standings = (await db.scalars(
+        select(Standing)
+        .where(Standing.league_id == league_id, Standing.season == latest_season)
+        .order_by(Standing.rank, Standing.id)
+    )).all()
+    recent_games = (await db.scalars(
+        select(Game)
+        .where(Game.league_id == league_id, Game.game_date <= date.today())
+        .order_by(Game.game_date.desc(), Game.id.desc())
+        .limit(games)
+    )).all()
+    return {
+        "league": league,
+        "season": standings[0].season if standings else None,
+        "teams": sorted(league.teams, key=lambda team: team.id),
+        "standings": standings,
+        "recent_games": recent_games,
+    }
+
+
+@router.get("/leagues/{league_id}/export/{dataset}")
+async def export_league_dataset(
+    league_id: int,
+    dataset: str,
+    format: str = Query("csv.gz", description="csv.gz, arrow (IPC stream) or parquet"),
+    season: Optional[str] = Query(
+        None, pattern=SEASON_PATTERN,
+        description="Only this season (e.g. 2024 or 2024-25); games, standings and player_stats only"
+    ),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Download a whole league dataset (teams, games, standings, players or player_stats) as one file
+    
+    Rows stream from a server-side cursor straight into the file format a batch at a
+    time, without building ORM objects or response models. Teams and players are not
+    kept per season, so they reject a season.
+    """
+    if dataset not in DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset: {dataset}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format: {format}")
+    if season and dataset not in SEASONAL_DATASETS:
+        raise HTTPException(status_code=400, detail=f"{dataset} cannot be filtered by season")
+    await ensure_exists(db, League, league_id, "League not found")
+    
+    statement = DATASETS[dataset](league_id, season)
+    try:
+        writer = create_writer(format, statement)
+    except ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    primary = on_primary(db)
+    
+    async def generate():
+        # Owns its session, like ndjson_response, so the export outlives the request's dependencies
+        async with ReadSessionLocal() as export_db:
+            if primary:
+                use_primary(export_db)
+            async for chunk in stream_export_batches(export_db, statement, writer):
+                if chunk:
+                    yield chunk
+    
+    filename = f"league-{league_id}-{dataset}{f'-{season}' if season else ''}.{writer.extension}"
+    return StreamingResponse(
+        generate(),
+        media_type=writer.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/leagues/{league_id}/live")
+async def stream_league_scores(league_id: int, request: Request):
+    """Server-sent events with a delta per game row written by scrapes and live polls
     
-    games = query.order_by(Game.game_date.desc()).all()
-    return games
+    Each `game` event carries the game id plus only the columns that changed; a
+    `resync` event means updates were missed and the client should refetch games.
+    """
+    if settings.live_events_backend == "none":
+        raise HTTPException(status_code=503, detail="Live updates are disabled")
+    # A short-lived session, so an open stream does not hold a database connection
+    async with ReadSessionLocal() as db:
+        await ensure_exists(db, League, league_id, "League not found")
+    return event_stream_response(request, league_id)
 
 
 # Team endpoints
 @router.get("/teams/{team_id}", response_model=TeamResponse)
-async def get_team(team_id: int, db: Session = Depends(get_db)):
+@cached_response("team", TeamResponse)
+async def get_team(team_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific team"""
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = await db.get(Team, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     return team
 
 
 @router.get("/teams/{team_id}/players", response_model=List[PlayerResponse])
-async def get_team_players(team_id: int, db: Session = Depends(get_db)):
+@cached_response("team", List[PlayerResponse])
+async def get_team_players(
+    team_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get all players on a team"""
-    team = db.query(Team).filter(Team.id == team_id).first()
-    if not team:
-        raise HTTPException(status_code=404, detail="Team not found")
-    return team.players
+    query = select(Player).where(Player.team_id == team_id)
+    page = await keyset_page(db, query, [Player.id], cursor, limit)
+    if not page.items:
+        await ensure_exists(db, Team, team_id, "Team not found")
+    return page
 
 
 @router.get("/teams/{team_id}/games", response_model=List[GameResponse])
+@cached_response("team", List[GameResponse])
 async def get_team_games(
     team_id: int,
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    stream: bool = Query(False, description=STREAM_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all games for a team"""
-    team = db.query(Team).filter(Team.id == team_id).first()
-    if not team:
-        raise HTTPException(status_code=404, detail="Team not found")
+    """Get all games for a team, newest first"""
+    team_filter = (Game.home_team_id == team_id) | (Game.away_team_id == team_id)
+    keyset = [Game.game_date, Game.id]
+    if stream:
+        await ensure_exists(db, Team, team_id, "Team not found")
+        query = select(*Game.__table__.columns).where(team_filter)
+        return ndjson_response(GameResponse, apply_keyset(query, keyset, cursor, descending=True), on_primary(db))
+    page = await keyset_page(db, select(Game).where(team_filter), keyset, cursor, limit, descending=True)
+    if not page.items:
+        await ensure_exists(db, Team, team_id, "Team not found")
+    return page
+
+
+@router.get("/teams/{team_id}/stats", response_model=List[TeamStatisticsResponse])
+@cached_response("team", List[TeamStatisticsResponse])
+async def get_team_stats(
+    team_id: int,
+    season: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get team season statistics"""
+    query = select(TeamStatistics).where(TeamStatistics.team_id == team_id)
+    if season:
+        query = query.where(TeamStatistics.season == season)
     
-    games = db.query(Game).filter(
-        (Game.home_team_id == team_id) | (Game.away_team_id == team_id)
-    ).order_by(Game.game_date.desc()).all()
-    return games
+    page = await keyset_page(db, query, [TeamStatistics.season, TeamStatistics.id], cursor, limit)
+    if not page.items:
+        await ensure_exists(db, Team, team_id, "Team not found")
+    return page
 
 
 # Player endpoints
 @router.get("/players/{player_id}", response_model=PlayerResponse)
-async def get_player(player_id: int, db: Session = Depends(get_db)):
+@cached_response("player", PlayerResponse)
+async def get_player(player_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific player"""
-    player = db.query(Player).filter(Player.id == player_id).first()
+    player = await db.get(Player, player_id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     return player
 
 
-@router.get("/players/{player_id}/stats")
+@router.get("/players/{player_id}/stats", response_model=List[PlayerStatisticsResponse])
+@cached_response("player", List[PlayerStatisticsResponse])
 async def get_player_stats(
     player_id: int,
     season: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get player statistics"""
-    player = db.query(Player).filter(Player.id == player_id).first()
-    if not player:
-        raise HTTPException(status_code=404, detail="Player not found")
-    
-    query = db.query(PlayerStatistics).filter(PlayerStatistics.player_id == player_id)
+    query = select(PlayerStatistics).where(PlayerStatistics.player_id == player_id)
     if season:
-        query = query.filter(PlayerStatistics.season == season)
+        query = query.where(PlayerStatistics.season == season)
     
-    stats = query.all()
-    return stats
+    page = await keyset_page(db, query, [PlayerStatistics.season, PlayerStatistics.id], cursor, limit)
+    if not page.items:
+        await ensure_exists(db, Player, player_id, "Player not found")
+    return page
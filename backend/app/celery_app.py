@@ -1,11 +1,13 @@
-from celery import Celery
+from celery import Celery, signals
 from app.config import settings
+from app.models.database import dispose_engines
+from app.utils.metrics import instrument_celery
 
 celery_app = Celery(
     "stats_scraper",
     broker=settings.redis_url,
     backend=settings.redis_url,
-    include=["app.tasks.scraper_tasks"]
+    include=["app.tasks.scraper_tasks", "app.tasks.statistics_tasks"]
 )
 
 celery_app.conf.update(
@@ -19,5 +21,24 @@ celery_app.conf.update(
             "task": "app.tasks.scraper_tasks.scrape_all_leagues",
             "schedule": 86400.0,  # Run daily
         },
+        "prune-scrape-log": {
+            "task": "app.tasks.scraper_tasks.prune_scrape_log",
+            "schedule": 86400.0,
+        },
     },
 )
+
+if settings.live_polling_enabled:
+    # Each tick only dispatches leagues whose own adaptive poll interval has elapsed
+    celery_app.conf.beat_schedule["live-scores"] = {
+        "task": "app.tasks.scraper_tasks.poll_live_scores",
+        "schedule": settings.live_poll_tick,
+    }
+
+instrument_celery()
+
+
+@signals.worker_process_init.connect(weak=False)
+def reset_database_pools(**kwargs):
+    """Give each forked worker process fresh pools instead of the parent's connections"""
+    dispose_engines()
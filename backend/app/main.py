@@ -1,7 +1,11 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api.routes import router
+from app.api.middleware import RequestMetricsMiddleware
+from app.api.live import get_broadcaster
+from app.models.routing import start_replica_checks, stop_replica_checks
+from app.utils.metrics import render_metrics
 
 app = FastAPI(
     title=settings.api_title,
@@ -18,9 +22,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency per route, exposed at /metrics
+app.add_middleware(RequestMetricsMiddleware)
+
 # Include API routes
 app.include_router(router, prefix=settings.api_prefix, tags=["api"])
 
+# Stop relaying live score events with the app
+app.add_event_handler("shutdown", get_broadcaster().close)
+
+# Health-check read replicas while the app runs
+app.add_event_handler("startup", start_replica_checks)
+app.add_event_handler("shutdown", stop_replica_checks)
+
 
 @app.get("/")
 async def root():
@@ -34,3 +48,9 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, headers={"Content-Type": content_type})
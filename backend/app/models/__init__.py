@@ -1,10 +1,11 @@
 from app.models.database import Base, engine, SessionLocal
 from app.models.league import League
-from app.models.team import Team
+from app.models.team import Team, TeamAlias
 from app.models.player import Player
 from app.models.game import Game
 from app.models.standing import Standing
 from app.models.statistics import PlayerStatistics, TeamStatistics
+from app.models.scrape_log import ScrapeChange, ScrapeCheckpoint, ScrapeRun
 
 __all__ = [
     "Base",
@@ -12,9 +13,13 @@ __all__ = [
     "SessionLocal",
     "League",
     "Team",
+    "TeamAlias",
     "Player",
     "Game",
     "Standing",
     "PlayerStatistics",
     "TeamStatistics",
+    "ScrapeRun",
+    "ScrapeChange",
+    "ScrapeCheckpoint",
 ]
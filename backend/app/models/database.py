@@ -1,16 +1,94 @@
+from typing import Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.utils.metrics import instrument_pool
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    echo=settings.debug
-)
+# asyncio drivers used by the API for each sync backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(database_url: str) -> str:
+    """Map a sync database URL onto its asyncio driver"""
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
+def engine_options(role: str, asyncio: bool = False, database_url: Optional[str] = None) -> dict:
+    """Pool and connection options for the workers' engine or an API engine (primary or replica)
+
+    The API serves many concurrent requests from one pool per process; a worker
+    process runs one task at a time, so it keeps a small pool of its own. Statements
+    running past the role's timeout are cancelled by the server (PostgreSQL only).
+    """
+    options = {"pool_pre_ping": True, "echo": settings.db_echo}
+    backend = make_url(database_url or settings.database_url).get_backend_name()
+    if backend == "sqlite":
+        return options
+    if role == "worker":
+        pool_size, max_overflow, timeout = (
+            settings.db_worker_pool_size, settings.db_worker_max_overflow, settings.db_worker_statement_timeout
+        )
+    else:
+        pool_size, max_overflow, timeout = settings.db_pool_size, settings.db_max_overflow, settings.db_statement_timeout
+    options.update(
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    if timeout and backend == "postgresql":
+        if asyncio:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def create_worker_engine() -> Engine:
+    """Sync engine for Celery workers, scrapers and scripts"""
+    worker_engine = create_engine(settings.database_url, **engine_options("worker"))
+    instrument_pool(worker_engine, "worker")
+    return worker_engine
+
+
+def create_api_engine(database_url: Optional[str] = None, role: str = "api") -> AsyncEngine:
+    """asyncio engine for the API, on the primary unless given a replica's URL"""
+    database_url = database_url or settings.database_url
+    api_engine = create_async_engine(
+        async_database_url(database_url), **engine_options(role, asyncio=True, database_url=database_url)
+    )
+    instrument_pool(api_engine.sync_engine, role)
+    return api_engine
+
+
+def dispose_engines():
+    """Drop the pooled connections inherited from a parent process, without closing them
+
+    Call in each forked child (e.g. Celery's prefork workers) before it touches the
+    database; the parent keeps using its own connections.
+    """
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
+
+# Pools are lazy: no connection is opened until a session first needs one
+engine = create_worker_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_api_engine()
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -21,3 +99,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
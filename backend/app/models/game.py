@@ -1,11 +1,25 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date, Time
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date, Time, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.database import Base
 
+# Statuses after which a game's score can no longer change
+FINAL_STATUSES = ("final", "completed", "forfeit", "cancelled")
+# Statuses of games not yet under way; a game that is neither final nor pending is live
+PENDING_STATUSES = ("scheduled", "postponed")
+
 
 class Game(Base):
     __tablename__ = "games"
+    __table_args__ = (
+        Index("uq_games_league_source", "league_id", "source_game_id", unique=True),
+        # League and team schedules are keyset-paginated by (game_date, id)
+        Index("ix_games_league_date", "league_id", "game_date", "id"),
+        Index("ix_games_home_team_date", "home_team_id", "game_date", "id"),
+        Index("ix_games_away_team_date", "away_team_id", "game_date", "id"),
+        # Incremental scrapes look for open games per league
+        Index("ix_games_league_status_date", "league_id", "status", "game_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     league_id = Column(Integer, ForeignKey("leagues.id"), nullable=False, index=True)
@@ -18,6 +32,7 @@ class Game(Base):
     away_score = Column(Integer, nullable=True)
     venue = Column(String(255), nullable=True)
     source_game_id = Column(String(100), nullable=True)
+    fingerprint = Column(String(32), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -15,6 +15,7 @@ class League(Base):
     source_platform = Column(String(100), nullable=True)
     logo_url = Column(String(500), nullable=True)
     active = Column(Boolean, default=True, index=True)
+    fingerprint = Column(String(32), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
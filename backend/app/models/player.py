@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.database import Base
@@ -6,6 +6,9 @@ from app.models.database import Base
 
 class Player(Base):
     __tablename__ = "players"
+    __table_args__ = (
+        Index("uq_players_team_source", "team_id", "source_player_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
@@ -20,6 +23,7 @@ class Player(Base):
     photo_url = Column(String(500), nullable=True)
     source_player_id = Column(String(100), nullable=True)
     active = Column(String(10), default=True, index=True)
+    fingerprint = Column(String(32), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import List, Optional
+from sqlalchemy import Delete, Insert, Update, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.database import async_engine, create_api_engine
+from app.utils.metrics import DB_READ_SESSIONS, DB_REPLICA_HEALTHY
+
+logger = logging.getLogger(__name__)
+
+
+class Replica:
+    """One read replica: its engine, weight and last known health"""
+
+    def __init__(self, url: str, weight: int, engine: AsyncEngine):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.weight = max(weight, 0)
+        self.engine = engine
+        self.healthy = True
+        self.current = 0
+        DB_REPLICA_HEALTHY.labels(self.name).set(1)
+
+    def set_health(self, healthy: bool, reason: str = ""):
+        if healthy != self.healthy:
+            if healthy:
+                logger.info(f"Replica {self.name} is back in rotation")
+            else:
+                logger.warning(f"Replica {self.name} taken out of rotation: {reason}")
+        self.healthy = healthy
+        DB_REPLICA_HEALTHY.labels(self.name).set(1 if healthy else 0)
+
+
+class ReplicaRouter:
+    """Weighted round-robin over the healthy replicas, checked in the background
+
+    Picks interleave replicas in proportion to their weights (smooth weighted
+    round-robin), so a 2:1 pair goes A, B, A rather than A, A, B. With no healthy
+    replica left every read goes to the primary.
+    """
+
+    def __init__(self, replicas: List[Replica]):
+        self.replicas = replicas
+        self._lock = threading.Lock()
+        self._checks: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[Replica]:
+        with self._lock:
+            healthy = [replica for replica in self.replicas if replica.healthy and replica.weight]
+            if not healthy:
+                return None
+            for replica in healthy:
+                replica.current += replica.weight
+            chosen = max(healthy, key=lambda replica: replica.current)
+            chosen.current -= sum(replica.weight for replica in healthy)
+            return chosen
+
+    async def check(self):
+        """Probe every replica once, updating which ones take reads"""
+        for replica in self.replicas:
+            try:
+                await asyncio.wait_for(self._probe(replica), settings.db_replica_check_timeout)
+            except (DBAPIError, OSError, asyncio.TimeoutError) as e:
+                replica.set_health(False, str(e) or type(e).__name__)
+            else:
+                replica.set_health(True)
+
+    def start(self):
+        if self._checks is None or self._checks.done():
+            self._checks = asyncio.create_task(self._run_checks())
+
+    async def close(self):
+        if self._checks is not None:
+            self._checks.cancel()
+            try:
+                await self._checks
+            except asyncio.CancelledError:
+                pass
+            self._checks = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    @staticmethod
+    async def _probe(replica: Replica):
+        async with replica.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _run_checks(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(settings.db_replica_check_interval)
+
+
+@lru_cache(maxsize=None)
+def get_replica_router() -> Optional[ReplicaRouter]:
+    """Router over DB_REPLICA_URLS, or None when no replicas are configured"""
+    if not settings.db_replica_urls:
+        return None
+    weights = list(settings.db_replica_weights) + [1] * len(settings.db_replica_urls)
+    return ReplicaRouter([
+        Replica(url, weight, create_api_engine(url, role="replica"))
+        for url, weight in zip(settings.db_replica_urls, weights)
+    ])
+
+
+async def start_replica_checks():
+    """Check the replicas once, then keep checking them in the background"""
+    router = get_replica_router()
+    if router is not None:
+        await router.check()
+        router.start()
+
+
+async def stop_replica_checks():
+    router = get_replica_router()
+    if router is not None:
+        await router.close()
+
+
+class RoutingSession(Session):
+    """Session that reads from one replica per session and sends everything else to the primary
+
+    Flushes and INSERT/UPDATE/DELETE statements always use the primary, as does a
+    session marked with use_primary() (reads that must see a write just made).
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        if "replica" not in self.info:
+            router = get_replica_router()
+            replica = None if self.info.get("primary") or router is None else router.choose()
+            self.info["replica"] = replica
+            DB_READ_SESSIONS.labels("primary" if replica is None else "replica").inc()
+        replica = self.info["replica"]
+        if replica is None or self.info.get("primary"):
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        return replica.engine.sync_engine
+
+
+def use_primary(db: AsyncSession):
+    """Send a read session's queries to the primary from here on"""
+    db.info["primary"] = True
+
+
+def on_primary(db: AsyncSession) -> bool:
+    return bool(db.info.get("primary"))
+
+
+def recently_changed(version: int) -> bool:
+    """Whether data stamped with this version may not have reached the replicas yet"""
+    return time.time() * 1000 - version < settings.db_replica_grace * 1000
+
+
+ReadSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_read_db():
+    """Dependency for a read-only session, served by a replica when one is configured"""
+    async with ReadSessionLocal() as db:
+        try:
+            yield db
+        except DBAPIError as e:
+            replica = db.info.get("replica")
+            if replica is not None and e.connection_invalidated:
+                # Out of rotation until the next health check finds it answering again
+                replica.set_health(False, str(e.orig))
+            raise
@@ -0,0 +1,70 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, JSON, Index
+from sqlalchemy.orm import relationship
+from app.models.database import Base
+
+
+class ScrapeRun(Base):
+    """One league scrape or live poll that wrote data, with its row counts"""
+    __tablename__ = "scrape_runs"
+    __table_args__ = (
+        Index("ix_scrape_runs_league_started", "league_id", "started_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    league_id = Column(Integer, ForeignKey("leagues.id"), nullable=True)
+    platform = Column(String(100), nullable=False)
+    mode = Column(String(20), nullable=False)
+    status = Column(String(20), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    inserted = Column(Integer, default=0)
+    updated = Column(Integer, default=0)
+    unchanged = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=1)
+    touched_teams = Column(JSON, nullable=True)
+
+    # Relationships
+    changes = relationship("ScrapeChange", back_populates="run", cascade="all, delete-orphan")
+    checkpoints = relationship("ScrapeCheckpoint", back_populates="run", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<ScrapeRun(id={self.id}, league_id={self.league_id}, mode='{self.mode}', status='{self.status}')>"
+
+
+class ScrapeChange(Base):
+    """A row a scrape run inserted, or updated along with the names of the fields that changed"""
+    __tablename__ = "scrape_changes"
+    __table_args__ = (
+        Index("ix_scrape_changes_table_row", "table_name", "row_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("scrape_runs.id", ondelete="CASCADE"), nullable=False, index=True)
+    table_name = Column(String(50), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)
+    fields = Column(JSON, nullable=True)
+
+    # Relationships
+    run = relationship("ScrapeRun", back_populates="changes")
+
+    def __repr__(self):
+        return f"<ScrapeChange(run_id={self.run_id}, table='{self.table_name}', row_id={self.row_id}, operation='{self.operation}')>"
+
+
+class ScrapeCheckpoint(Base):
+    """A stage of a scrape run, or one team within a stage, whose data has been committed"""
+    __tablename__ = "scrape_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("scrape_runs.id", ondelete="CASCADE"), nullable=False, index=True)
+    stage = Column(String(20), nullable=False)
+    team_id = Column(Integer, nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Relationships
+    run = relationship("ScrapeRun", back_populates="checkpoints")
+
+    def __repr__(self):
+        return f"<ScrapeCheckpoint(run_id={self.run_id}, stage='{self.stage}', team_id={self.team_id})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.database import Base
@@ -6,6 +6,10 @@ from app.models.database import Base
 
 class Standing(Base):
     __tablename__ = "standings"
+    __table_args__ = (
+        Index("uq_standings_league_team_season", "league_id", "team_id", "season", unique=True),
+        Index("ix_standings_league_season_rank", "league_id", "season", "rank"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     league_id = Column(Integer, ForeignKey("leagues.id"), nullable=False, index=True)
@@ -21,6 +25,7 @@ class Standing(Base):
     goal_difference = Column(Integer, default=0)
     win_percentage = Column(Float, default=0.0)
     games_played = Column(Integer, default=0)
+    fingerprint = Column(String(32), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
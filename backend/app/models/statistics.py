@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, Date, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.database import Base
@@ -6,6 +6,9 @@ from app.models.database import Base
 
 class PlayerStatistics(Base):
     __tablename__ = "player_statistics"
+    __table_args__ = (
+        Index("uq_player_statistics_player_season", "player_id", "season", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
@@ -18,6 +21,7 @@ class PlayerStatistics(Base):
     shots_on_goal = Column(Integer, default=0)
     penalty_minutes = Column(Integer, default=0)
     plus_minus = Column(Integer, default=0)
+    fingerprint = Column(String(32), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -30,6 +34,9 @@ class PlayerStatistics(Base):
 
 class TeamStatistics(Base):
     __tablename__ = "team_statistics"
+    __table_args__ = (
+        Index("uq_team_statistics_team_season", "team_id", "season", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
@@ -42,6 +49,7 @@ class TeamStatistics(Base):
     goals_per_game = Column(Float, default=0.0)
     power_play_percentage = Column(Float, default=0.0)
     penalty_kill_percentage = Column(Float, default=0.0)
+    fingerprint = Column(String(32), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
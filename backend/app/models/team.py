@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, String
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.database import Base
@@ -6,6 +6,9 @@ from app.models.database import Base
 
 class Team(Base):
     __tablename__ = "teams"
+    __table_args__ = (
+        Index("uq_teams_league_slug", "league_id", "slug", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     league_id = Column(Integer, ForeignKey("leagues.id"), nullable=False, index=True)
@@ -24,6 +27,27 @@ class Team(Base):
     away_games = relationship("Game", foreign_keys="Game.away_team_id", back_populates="away_team")
     standings = relationship("Standing", back_populates="team", cascade="all, delete-orphan")
     team_statistics = relationship("TeamStatistics", back_populates="team", cascade="all, delete-orphan")
+    aliases = relationship("TeamAlias", back_populates="team", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Team(id={self.id}, name='{self.name}', league_id={self.league_id})>"
+
+
+class TeamAlias(Base):
+    """Alternative spelling of a team name used by a platform"""
+    __tablename__ = "team_aliases"
+    __table_args__ = (
+        Index("uq_team_aliases_league_alias", "league_id", "alias", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    league_id = Column(Integer, ForeignKey("leagues.id"), nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
+    alias = Column(String(255), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    team = relationship("Team", back_populates="aliases")
+
+    def __repr__(self):
+        return f"<TeamAlias(id={self.id}, alias='{self.alias}', team_id={self.team_id})>"
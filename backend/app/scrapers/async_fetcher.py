@@ -0,0 +1,103 @@
+import time
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import httpx
+from app.scrapers.rate_limit import backoff_delay, get_host_limiter, retry_after_seconds
+from app.utils.metrics import count_fetch_failure, count_fetch_retry, observe_fetch
+
+logger = logging.getLogger(__name__)
+
+FetchRequest = Union[str, Tuple[str, Optional[Dict]]]
+
+
+def split_request(request: FetchRequest) -> Tuple[str, Optional[Dict]]:
+    """Normalize a URL or (URL, params) pair"""
+    return (request, None) if isinstance(request, str) else request
+
+
+class AsyncFetcher:
+    """Pooled asyncio HTTP client honouring the per-host rate limiters"""
+    
+    def __init__(
+        self,
+        headers: Dict[str, str],
+        timeout: float,
+        max_retries: int,
+        retry_delay: float,
+        retry_backoff_max: float,
+        max_connections: int,
+        max_concurrency: int,
+        requests_per_second: Optional[float] = None,
+        platform: str = "unknown"
+    ):
+        self.headers = headers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.retry_backoff_max = retry_backoff_max
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.platform = platform
+        self.client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    async def __aenter__(self) -> "AsyncFetcher":
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            ),
+            follow_redirects=True
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
+    
+    async def fetch(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Optional[httpx.Response]:
+        """Fetch a URL with rate limiting and jittered exponential backoff"""
+        limiter = get_host_limiter(url, self.requests_per_second)
+        async with self._semaphore:
+            for attempt in range(self.max_retries):
+                response = None
+                try:
+                    if limiter:
+                        await limiter.acquire_async()
+                    start = time.perf_counter()
+                    response = await self.client.get(url, params=params, headers=headers)
+                    observe_fetch(self.platform, time.perf_counter() - start, len(response.content))
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return response
+                except httpx.HTTPError as e:
+                    logger.warning(
+                        f"Attempt {attempt + 1}/{self.max_retries} failed for {url}: {e}"
+                    )
+                    if attempt < self.max_retries - 1:
+                        count_fetch_retry(self.platform)
+                        delay = backoff_delay(attempt, self.retry_delay, self.retry_backoff_max)
+                        if response is not None:
+                            delay = max(delay, retry_after_seconds(response.headers) or 0)
+                        await asyncio.sleep(delay)
+                    else:
+                        count_fetch_failure(self.platform)
+                        logger.error(f"Failed to fetch {url} after {self.max_retries} attempts")
+                        return None
+        return None
+    
+    async def fetch_all(self, requests: Iterable[FetchRequest]) -> List[Optional[httpx.Response]]:
+        """Fetch many URLs concurrently, preserving request order"""
+        return await asyncio.gather(*(
+            self.fetch(*split_request(request)) for request in requests
+        ))
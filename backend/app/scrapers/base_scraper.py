@@ -1,17 +1,38 @@
 import time
+import asyncio
 import logging
 import requests
-from typing import Optional, Dict, Any
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, Iterator, List
 from abc import ABC, abstractmethod
 from app.config import settings
+from app.scrapers.async_fetcher import AsyncFetcher, FetchRequest, split_request
+from app.scrapers.http_cache import CacheEntry, HttpCache, PageUnchanged, content_hash, get_http_cache
+from app.scrapers.parsing import Document, element_text, iter_table_rows, parse_html, select, select_one
+from app.scrapers.rate_limit import TokenBucket, backoff_delay, get_host_limiter, retry_after_seconds
+from app.utils.metrics import PARSE_SECONDS, count_fetch_failure, count_fetch_retry, observe_fetch
 
 logger = logging.getLogger(__name__)
 
 
+class FetchFailed(Exception):
+    """Raised when a page could not be fetched after the last retry"""
+    
+    def __init__(self, url: str):
+        super().__init__(f"Failed to fetch {url}")
+        self.url = url
+
+
 class BaseScraper(ABC):
     """Base class for all league platform scrapers"""
     
+    # Per-host request rate; None derives it from settings.rate_limit_delay
+    requests_per_second: Optional[float] = None
+    # "bs4" or "lxml"; None uses settings.parser_backend
+    parser_backend: Optional[str] = None
+    # Concurrent roster/player page fetches; None uses the platform's configured limit
+    fetch_workers: Optional[int] = None
+    
     def __init__(self, platform_name: str, base_url: str):
         self.platform_name = platform_name
         self.base_url = base_url
@@ -19,48 +40,223 @@ class BaseScraper(ABC):
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        adapter = HTTPAdapter(pool_maxsize=settings.http_max_connections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.request_timeout = settings.request_timeout
         self.max_retries = settings.max_retries
         self.retry_delay = settings.retry_delay
+        self.retry_backoff_max = settings.retry_backoff_max
         self.rate_limit_delay = settings.rate_limit_delay
+        self.http_cache: Optional[HttpCache] = get_http_cache()
+        # Bypass validators and always return fresh content (e.g. after a database reset)
+        self.force_refresh = False
+        self._pending_cache: Dict[str, CacheEntry] = {}
+    
+    def rate_limiter(self, url: str) -> Optional[TokenBucket]:
+        """Limiter shared by every request to the URL's host"""
+        return get_host_limiter(url, self.requests_per_second)
+    
+    def worker_count(self) -> int:
+        """Threads to use when fetching many pages of this platform at once"""
+        if self.fetch_workers:
+            return self.fetch_workers
+        return settings.fetch_platform_workers.get(self.platform_name, settings.fetch_workers)
+    
+    def parse(self, content: bytes) -> Document:
+        """Parse a fetched page with the configured backend"""
+        backend = self.parser_backend or settings.parser_backend
+        with PARSE_SECONDS.labels(self.platform_name, backend).time():
+            return parse_html(content, backend)
+    
+    def _cache_lookup(self, url: str, params: Optional[Dict]):
+        """Return the cache key, stored entry and conditional request headers for a page"""
+        if self.http_cache is None:
+            return None, None, {}
+        key = HttpCache.make_key(url, params)
+        entry = self.http_cache.get(key)
+        headers = {} if self.force_refresh else HttpCache.conditional_headers(entry)
+        return key, entry, headers
+    
+    def _cache_resolve(
+        self,
+        url: str,
+        key: Optional[str],
+        entry: Optional[CacheEntry],
+        status_code: int,
+        headers,
+        content: bytes,
+        skip_unchanged: bool
+    ) -> bytes:
+        """Turn a response into page content, raising PageUnchanged when it matches the last scrape"""
+        if key is None:
+            return content
+        if status_code == 304 and entry is not None:
+            unchanged = True
+            content = entry.body
+            digest = entry.content_hash
+        else:
+            digest = content_hash(content)
+            unchanged = entry is not None and entry.content_hash == digest
+        self.http_cache.record(hit=unchanged, not_modified=status_code == 304)
+        
+        # Staged until commit_http_cache() so a failed upsert is retried on the next run
+        self._pending_cache[key] = CacheEntry(
+            key=key,
+            url=url,
+            etag=headers.get('ETag') or (entry.etag if entry else None),
+            last_modified=headers.get('Last-Modified') or (entry.last_modified if entry else None),
+            content_hash=digest,
+            body=content
+        )
+        if unchanged and skip_unchanged and not self.force_refresh:
+            raise PageUnchanged(url)
+        return content
+    
+    def commit_http_cache(self):
+        """Persist validators for pages whose data has been committed, and when cached pages were used"""
+        if self.http_cache is not None:
+            self.http_cache.put_many(self._pending_cache.values())
+        self._pending_cache = {}
+    
+    def discard_http_cache(self):
+        """Forget validators staged since the last commit"""
+        self._pending_cache = {}
+    
+    def fetch_page(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        skip_unchanged: bool = False
+    ) -> Document:
+        """Fetch a webpage and return the parsed document with retry logic
+        
+        With skip_unchanged and the HTTP cache enabled, raises PageUnchanged when the
+        page matches the last committed scrape, which makes the manager drop the whole
+        scrape call. Only pass it for the single page a scrape call reads; a call that
+        reads several pages would lose changes on the pages after an unchanged one.
+        """
+        return self.parse(self.fetch_content(url, params, skip_unchanged))
+    
+    def fetch_table_rows(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        table_id: Optional[str] = None,
+        table_index: int = 0,
+        skip_unchanged: bool = False
+    ) -> Iterator[Dict[str, str]]:
+        """Fetch a page and stream one of its tables as row dicts without building a tree"""
+        content = self.fetch_content(url, params, skip_unchanged)
+        return iter_table_rows(content, table_id=table_id, table_index=table_index)
+    
+    def fetch_content(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        skip_unchanged: bool = False
+    ) -> bytes:
+        """Fetch a webpage's raw body with retry logic
         
-    def fetch_page(self, url: str, params: Optional[Dict] = None) -> Optional[BeautifulSoup]:
-        """Fetch a webpage and return BeautifulSoup object with retry logic"""
+        Raises FetchFailed after the last retry, so a missing page fails its scrape
+        call (and leaves its team unchecked) instead of reading as an empty one.
+        """
+        limiter = self.rate_limiter(url)
+        key, entry, cache_headers = self._cache_lookup(url, params)
         for attempt in range(self.max_retries):
+            response = None
             try:
-                time.sleep(self.rate_limit_delay)
+                if limiter:
+                    limiter.acquire()
+                start = time.perf_counter()
                 response = self.session.get(
                     url,
                     params=params,
+                    headers=cache_headers,
                     timeout=self.request_timeout
                 )
+                observe_fetch(self.platform_name, time.perf_counter() - start, len(response.content))
                 response.raise_for_status()
-                return BeautifulSoup(response.content, 'lxml')
+                return self._cache_resolve(
+                    url, key, entry, response.status_code, response.headers,
+                    response.content, skip_unchanged
+                )
             except requests.exceptions.RequestException as e:
                 logger.warning(
                     f"Attempt {attempt + 1}/{self.max_retries} failed for {url}: {e}"
                 )
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
+                    count_fetch_retry(self.platform_name)
+                    delay = backoff_delay(attempt, self.retry_delay, self.retry_backoff_max)
+                    if response is not None:
+                        delay = max(delay, retry_after_seconds(response.headers) or 0)
+                    time.sleep(delay)
                 else:
+                    count_fetch_failure(self.platform_name)
                     logger.error(f"Failed to fetch {url} after {self.max_retries} attempts")
-                    return None
-        return None
+        raise FetchFailed(url)
+    
+    def async_fetcher(self) -> AsyncFetcher:
+        """Create a pooled async fetcher configured like this scraper's session"""
+        return AsyncFetcher(
+            headers=dict(self.session.headers),
+            timeout=self.request_timeout,
+            max_retries=self.max_retries,
+            retry_delay=self.retry_delay,
+            retry_backoff_max=self.retry_backoff_max,
+            max_connections=settings.http_max_connections,
+            max_concurrency=settings.http_max_concurrency,
+            requests_per_second=self.requests_per_second,
+            platform=self.platform_name
+        )
+    
+    async def fetch_page_async(
+        self,
+        fetcher: AsyncFetcher,
+        url: str,
+        params: Optional[Dict] = None,
+        skip_unchanged: bool = False
+    ) -> Document:
+        """Fetch a webpage through an open AsyncFetcher, raising FetchFailed if it fails"""
+        key, entry, cache_headers = self._cache_lookup(url, params)
+        response = await fetcher.fetch(url, params, cache_headers)
+        if response is None:
+            raise FetchFailed(url)
+        content = self._cache_resolve(
+            url, key, entry, response.status_code, response.headers,
+            response.content, skip_unchanged
+        )
+        return self.parse(content)
+    
+    async def fetch_pages_async(self, requests: List[FetchRequest]) -> List[Document]:
+        """Fetch many pages concurrently over one connection pool
+        
+        Unchanged pages are still returned (served from the cache on a 304).
+        """
+        async with self.async_fetcher() as fetcher:
+            return await asyncio.gather(*(
+                self.fetch_page_async(fetcher, *split_request(request), skip_unchanged=False)
+                for request in requests
+            ))
+    
+    def fetch_pages(self, requests: List[FetchRequest]) -> List[Document]:
+        """Fetch many pages concurrently from synchronous scraper code (e.g. rosters, box scores)"""
+        return asyncio.run(self.fetch_pages_async(requests))
     
-    def extract_text(self, soup: BeautifulSoup, selector: str, default: str = "") -> str:
+    def extract_text(self, soup: Document, selector: str, default: str = "") -> str:
         """Extract text from a CSS selector"""
-        element = soup.select_one(selector)
-        return element.get_text(strip=True) if element else default
+        element = select_one(soup, selector)
+        return element_text(element) if element is not None else default
     
-    def extract_all_text(self, soup: BeautifulSoup, selector: str) -> list[str]:
+    def extract_all_text(self, soup: Document, selector: str) -> list[str]:
         """Extract all text from a CSS selector"""
-        elements = soup.select(selector)
-        return [elem.get_text(strip=True) for elem in elements if elem]
+        elements = select(soup, selector)
+        return [element_text(elem) for elem in elements if elem is not None]
     
-    def extract_attribute(self, soup: BeautifulSoup, selector: str, attribute: str, default: str = "") -> str:
+    def extract_attribute(self, soup: Document, selector: str, attribute: str, default: str = "") -> str:
         """Extract an attribute value from a CSS selector"""
-        element = soup.select_one(selector)
-        return element.get(attribute, default) if element else default
+        element = select_one(soup, selector)
+        return element.get(attribute, default) if element is not None else default
     
     @abstractmethod
     def scrape_league_info(self, league_url: str) -> Dict[str, Any]:
@@ -0,0 +1,475 @@
+import json
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import and_, func, insert, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.player import Player
+from app.models.game import Game
+from app.models.standing import Standing
+from app.models.statistics import PlayerStatistics, TeamStatistics
+from app.scrapers.team_resolver import TeamResolver, game_team_source_ids
+from app.utils.metrics import timed_upsert
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEASON = "2024"
+
+STANDING_FIELDS = (
+    "rank", "wins", "losses", "ties", "points", "goals_for",
+    "goals_against", "goal_difference", "win_percentage", "games_played",
+)
+GAME_FIELDS = (
+    "home_team_id", "away_team_id", "game_date", "game_time",
+    "status", "home_score", "away_score", "venue",
+)
+PLAYER_FIELDS = (
+    "first_name", "last_name", "full_name", "jersey_number", "position", "photo_url",
+)
+TEAM_STATISTICS_FIELDS = (
+    "games_played", "goals_for", "goals_against", "goal_difference", "shots_per_game",
+    "goals_per_game", "power_play_percentage", "penalty_kill_percentage",
+)
+PLAYER_STATISTICS_FIELDS = (
+    "games_played", "goals", "assists", "points", "shots", "shots_on_goal",
+    "penalty_minutes", "plus_minus",
+)
+
+
+@dataclass
+class UpsertResult:
+    """Row counts (and written rows) for one bulk upsert"""
+    table: str
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    changed: List[Dict[str, Any]] = field(default_factory=list)
+    inserted_ids: Set[int] = field(default_factory=set)
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"inserted": self.inserted, "updated": self.updated, "unchanged": self.unchanged}
+
+    def __str__(self) -> str:
+        return (
+            f"{self.table}: {self.inserted} inserted, "
+            f"{self.updated} updated, {self.unchanged} unchanged"
+        )
+
+
+def win_percentage(wins: int, losses: int, ties: int) -> float:
+    """Share of games won, counting a tie as half a win"""
+    games = wins + losses + ties
+    return round((wins + ties / 2) / games, 3) if games else 0.0
+
+
+def _chunks(items: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def changed_fields(existing: Dict[str, Any], record: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Return the fields of record that are present and differ from existing"""
+    return {
+        name: record[name]
+        for name in fields
+        if name in record and record[name] != existing.get(name)
+    }
+
+
+def fingerprint(record: Dict[str, Any], fields: Iterable[str]) -> str:
+    """Digest of the fields a scraped record carries, stored with the row it was written to
+    
+    A rescrape whose record hashes the same as the stored fingerprint is skipped
+    without comparing fields. Absent fields are left out rather than hashed as None,
+    since they leave the stored value alone.
+    """
+    values = [[name, record[name]] for name in fields if name in record]
+    payload = json.dumps(values, default=str, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class BulkUpserter:
+    """Writes a whole scraped batch with one lookup query and batched statements per table
+    
+    On PostgreSQL, rows with a natural key are written with INSERT .. ON CONFLICT
+    against the unique indexes instead, one statement per batch with no lookup.
+    """
+
+    def __init__(self, db: Session, batch_size: Optional[int] = None, teams: Optional[TeamResolver] = None):
+        self.db = db
+        self.batch_size = batch_size or settings.bulk_upsert_batch_size
+        self.on_conflict = settings.bulk_upsert_on_conflict and db.get_bind().dialect.name == "postgresql"
+        self.teams = teams or TeamResolver(db, self.batch_size)
+
+    def resolve_teams(self, league_id: int, team_names: Iterable[str]) -> Dict[str, int]:
+        """Map team names to ids through the scrape's team identity map"""
+        return self.teams.resolve(league_id, team_names)
+
+    def upsert_standings(self, league_id: int, standings_data: List[Dict]) -> UpsertResult:
+        """Create or update scraped standings keyed by (league_id, team_id, season)"""
+        team_ids = self.resolve_teams(
+            league_id, [data.get('team_name') for data in standings_data]
+        )
+        self.teams.assign_source_ids(league_id, {
+            data['team_name']: data['source_team_id'] for data in standings_data if data.get('source_team_id')
+        })
+
+        records = []
+        for data in standings_data:
+            record = {name: data[name] for name in STANDING_FIELDS if name in data}
+            record["team_id"] = team_ids[data.get('team_name')]
+            record["season"] = data.get('season', DEFAULT_SEASON)
+            if "win_percentage" not in record and "wins" in record:
+                record["win_percentage"] = win_percentage(
+                    record["wins"], record.get("losses", 0), record.get("ties", 0)
+                )
+            records.append(record)
+        return self.upsert_standing_records(league_id, records)
+    
+    @timed_upsert
+    def upsert_standing_records(self, league_id: int, standing_records: List[Dict]) -> UpsertResult:
+        """Create or update standings from records already carrying team_id and season"""
+        result = UpsertResult("standings")
+        records: Dict[Tuple[int, str], Dict[str, Any]] = {
+            (record["team_id"], record["season"]): {**record, "fingerprint": fingerprint(record, STANDING_FIELDS)}
+            for record in standing_records
+        }
+        if self.on_conflict:
+            defaults = {name: 0 for name in STANDING_FIELDS}
+            defaults["win_percentage"] = 0.0
+            self._upsert_on_conflict(
+                Standing, ("league_id", "team_id", "season"), STANDING_FIELDS, defaults,
+                [{**record, "league_id": league_id} for record in records.values()], result
+            )
+            return result
+
+        existing: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        seasons = sorted({season for _, season in records})
+        keys = sorted({team_id for team_id, _ in records})
+        for chunk in _chunks(keys, self.batch_size):
+            rows = self.db.execute(
+                select(
+                    Standing.id, Standing.team_id, Standing.season, Standing.fingerprint,
+                    *[getattr(Standing, name) for name in STANDING_FIELDS]
+                ).where(
+                    Standing.league_id == league_id,
+                    Standing.team_id.in_(chunk),
+                    Standing.season.in_(seasons),
+                )
+            ).mappings()
+            for row in rows:
+                existing[(row["team_id"], row["season"])] = dict(row)
+
+        inserts, updates = [], []
+        for key, record in records.items():
+            current = existing.get(key)
+            if current is None:
+                row = {name: 0 for name in STANDING_FIELDS}
+                row["win_percentage"] = 0.0
+                row.update(record, league_id=league_id)
+                inserts.append(row)
+                continue
+            self._stage_update(current, record, STANDING_FIELDS, result, updates)
+
+        self._write(Standing, result, inserts, updates)
+        return result
+
+    @timed_upsert
+    def upsert_games(self, league_id: int, games_data: List[Dict]) -> UpsertResult:
+        """Create or update games keyed by (league_id, source_game_id)"""
+        result = UpsertResult("games")
+        team_names = []
+        for data in games_data:
+            team_names.extend([data.get('home_team'), data.get('away_team')])
+        team_ids = self.resolve_teams(league_id, team_names)
+        self.teams.assign_source_ids(league_id, game_team_source_ids(games_data))
+
+        records: Dict[Tuple, Dict[str, Any]] = {}
+        for data in games_data:
+            record = {name: data[name] for name in GAME_FIELDS if name in data}
+            record["home_team_id"] = team_ids[data.get('home_team')]
+            record["away_team_id"] = team_ids[data.get('away_team')]
+            record["source_game_id"] = data.get('source_game_id')
+            record["fingerprint"] = fingerprint(record, GAME_FIELDS)
+            records[self._game_key(record)] = record
+
+        if self.on_conflict:
+            defaults = {name: None for name in GAME_FIELDS}
+            defaults["status"] = "scheduled"
+            self._upsert_on_conflict(
+                Game, ("league_id", "source_game_id"), GAME_FIELDS, defaults,
+                [
+                    {**record, "league_id": league_id} for record in records.values()
+                    if record["source_game_id"] is not None
+                ],
+                result
+            )
+            # Fixtures without a source id have no unique key and go through the lookup below
+            records = {key: record for key, record in records.items() if record["source_game_id"] is None}
+        
+        source_ids = sorted({
+            record["source_game_id"] for record in records.values()
+            if record["source_game_id"] is not None
+        })
+        fixture_dates = sorted({
+            record.get("game_date") for record in records.values()
+            if record["source_game_id"] is None and record.get("game_date") is not None
+        })
+        columns = [Game.id, Game.source_game_id, Game.fingerprint, *[getattr(Game, name) for name in GAME_FIELDS]]
+
+        existing: Dict[Tuple, Dict[str, Any]] = {}
+        conditions = [Game.source_game_id.in_(chunk) for chunk in _chunks(source_ids, self.batch_size)]
+        conditions += [
+            and_(Game.source_game_id.is_(None), Game.game_date.in_(chunk))
+            for chunk in _chunks(fixture_dates, self.batch_size)
+        ]
+        for condition in conditions:
+            rows = self.db.execute(
+                select(*columns).where(Game.league_id == league_id, condition)
+            ).mappings()
+            for row in rows:
+                existing[self._game_key(row)] = dict(row)
+
+        inserts, updates = [], []
+        for key, record in records.items():
+            current = existing.get(key)
+            if current is None:
+                row = {name: None for name in GAME_FIELDS}
+                row["status"] = "scheduled"
+                row.update(record, league_id=league_id)
+                inserts.append(row)
+                continue
+            self._stage_update(current, record, GAME_FIELDS, result, updates)
+
+        self._write(Game, result, inserts, updates)
+        return result
+
+    @timed_upsert
+    def upsert_rosters(self, rosters: Dict[int, List[Dict]]) -> UpsertResult:
+        """Create or update players for several teams keyed by (team_id, source_player_id)"""
+        result = UpsertResult("players")
+
+        records: Dict[Tuple, Dict[str, Any]] = {}
+        for team_id, roster_data in rosters.items():
+            for data in roster_data:
+                record = {name: data[name] for name in PLAYER_FIELDS if name in data}
+                record["team_id"] = team_id
+                record["source_player_id"] = data.get('source_player_id')
+                record["fingerprint"] = fingerprint(record, PLAYER_FIELDS)
+                records[self._player_key(record)] = record
+
+        if self.on_conflict:
+            defaults = {name: None for name in PLAYER_FIELDS}
+            defaults.update(first_name='', last_name='', full_name='')
+            self._upsert_on_conflict(
+                Player, ("team_id", "source_player_id"), PLAYER_FIELDS, defaults,
+                [record for record in records.values() if record["source_player_id"] is not None],
+                result
+            )
+            records = {key: record for key, record in records.items() if record["source_player_id"] is None}
+            if not records:
+                return result
+        
+        existing: Dict[Tuple, Dict[str, Any]] = {}
+        columns = [
+            Player.id, Player.team_id, Player.source_player_id, Player.fingerprint,
+            *[getattr(Player, name) for name in PLAYER_FIELDS]
+        ]
+        for chunk in _chunks(sorted(rosters), self.batch_size):
+            rows = self.db.execute(select(*columns).where(Player.team_id.in_(chunk))).mappings()
+            for row in rows:
+                existing.setdefault(self._player_key(row), dict(row))
+
+        inserts, updates = [], []
+        for key, record in records.items():
+            current = existing.get(key)
+            if current is None:
+                row = {name: None for name in PLAYER_FIELDS}
+                row.update(first_name='', last_name='', full_name='')
+                row.update(record)
+                inserts.append(row)
+                continue
+            self._stage_update(current, record, PLAYER_FIELDS, result, updates)
+
+        self._write(Player, result, inserts, updates)
+        return result
+
+    @timed_upsert
+    def upsert_team_statistics(self, records: List[Dict]) -> UpsertResult:
+        """Create or update team season statistics keyed by (team_id, season)"""
+        return self._upsert_season_rows(TeamStatistics, "team_id", TEAM_STATISTICS_FIELDS, records)
+    
+    @timed_upsert
+    def upsert_player_statistics(self, records: List[Dict]) -> UpsertResult:
+        """Create or update player season statistics keyed by (player_id, season)"""
+        return self._upsert_season_rows(PlayerStatistics, "player_id", PLAYER_STATISTICS_FIELDS, records)
+    
+    def _upsert_season_rows(
+        self,
+        model,
+        owner: str,
+        fields: Sequence[str],
+        season_records: List[Dict]
+    ) -> UpsertResult:
+        """Create or update one row per (owner id, season), writing only changed fields"""
+        result = UpsertResult(model.__tablename__)
+        owner_column = getattr(model, owner)
+        records: Dict[Tuple[int, str], Dict[str, Any]] = {
+            (record[owner], record["season"]): {**record, "fingerprint": fingerprint(record, fields)}
+            for record in season_records
+        }
+        if self.on_conflict:
+            self._upsert_on_conflict(
+                model, (owner, "season"), fields, {name: 0 for name in fields},
+                list(records.values()), result
+            )
+            return result
+        
+        existing: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        seasons = sorted({season for _, season in records})
+        for chunk in _chunks(sorted({owner_id for owner_id, _ in records}), self.batch_size):
+            rows = self.db.execute(
+                select(
+                    model.id, owner_column, model.season, model.fingerprint,
+                    *[getattr(model, name) for name in fields]
+                ).where(owner_column.in_(chunk), model.season.in_(seasons))
+            ).mappings()
+            for row in rows:
+                existing[(row[owner], row["season"])] = dict(row)
+        
+        inserts, updates = [], []
+        for key, record in records.items():
+            current = existing.get(key)
+            if current is None:
+                row = {name: 0 for name in fields}
+                row.update(record)
+                inserts.append(row)
+                continue
+            self._stage_update(current, record, fields, result, updates)
+        
+        self._write(model, result, inserts, updates)
+        return result
+    
+    @staticmethod
+    def _game_key(record) -> Tuple:
+        if record["source_game_id"] is not None:
+            return ("source", record["source_game_id"])
+        return ("fixture", record.get("game_date"), record["home_team_id"], record["away_team_id"])
+
+    @staticmethod
+    def _player_key(record) -> Tuple:
+        if record["source_player_id"] is not None:
+            return (record["team_id"], "source", record["source_player_id"])
+        return (record["team_id"], "name", record.get("full_name"))
+
+    def _insert(self, model, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert rows in batches and return their new ids in order"""
+        ids: List[int] = []
+        for chunk in _chunks(rows, self.batch_size):
+            ids.extend(self.db.scalars(
+                insert(model).returning(model.id, sort_by_parameter_order=True),
+                list(chunk),
+            ))
+        return ids
+
+    def _upsert_on_conflict(
+        self,
+        model,
+        keys: Sequence[str],
+        fields: Sequence[str],
+        defaults: Dict[str, Any],
+        records: List[Dict[str, Any]],
+        result: UpsertResult
+    ):
+        """Write records keyed by a unique index with one INSERT .. ON CONFLICT per batch
+        
+        Conflicting rows are only updated when the record's fingerprint differs from
+        the stored one and a field differs too (rows written before fingerprints have
+        none), so RETURNING lists just the inserted and changed rows; xmax = 0 tells
+        the inserted ones apart. The old values are not visible to RETURNING, so
+        an updated row's changes list every field the record carries.
+        """
+        # One statement needs one column set, so batch records by the fields they carry
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for record in records:
+            groups.setdefault(tuple(name for name in fields if name in record), []).append(record)
+        
+        for present, group in groups.items():
+            for chunk in _chunks(group, self.batch_size):
+                statement = pg_insert(model).values([{**defaults, **record} for record in chunk])
+                if present:
+                    excluded = statement.excluded
+                    statement = statement.on_conflict_do_update(
+                        index_elements=list(keys),
+                        set_={
+                            **{name: excluded[name] for name in present},
+                            "fingerprint": excluded.fingerprint,
+                            "updated_at": func.now(),
+                        },
+                        where=and_(
+                            model.fingerprint.is_distinct_from(excluded.fingerprint),
+                            tuple_(*[getattr(model, name) for name in present]).is_distinct_from(
+                                tuple_(*[excluded[name] for name in present])
+                            ),
+                        ),
+                    )
+                else:
+                    statement = statement.on_conflict_do_nothing(index_elements=list(keys))
+                statement = statement.returning(
+                    model.id, literal_column("xmax = 0"), *[getattr(model, name) for name in keys]
+                )
+                
+                # Keys come back as stored, e.g. an integer source id as a string
+                by_key = {tuple(str(record[name]) for name in keys): record for record in chunk}
+                written = 0
+                for row_id, inserted, *key in self.db.execute(statement):
+                    record = by_key[tuple(str(value) for value in key)]
+                    written += 1
+                    if inserted:
+                        result.inserted += 1
+                        result.inserted_ids.add(row_id)
+                        result.changed.append({"id": row_id, **defaults, **record})
+                    else:
+                        result.updated += 1
+                        result.changed.append({"id": row_id, **{name: record[name] for name in present}})
+                result.unchanged += len(chunk) - written
+    
+    @staticmethod
+    def _stage_update(
+        current: Dict[str, Any],
+        record: Dict[str, Any],
+        fields: Sequence[str],
+        result: UpsertResult,
+        updates: List[Dict]
+    ):
+        """Queue the changed fields of an existing row, or count it unchanged"""
+        if current["fingerprint"] == record["fingerprint"]:
+            result.unchanged += 1
+            return
+        changes = changed_fields(current, record, fields)
+        if not changes:
+            # Same values under another fingerprint (e.g. a scrape carrying other fields
+            # than the one that wrote the row): like ON CONFLICT, no write
+            result.unchanged += 1
+            return
+        updates.append({"id": current["id"], **changes, "fingerprint": record["fingerprint"]})
+    
+    def _write(self, model, result: UpsertResult, inserts: List[Dict], updates: List[Dict]):
+        """Apply batched inserts and primary-key updates, recording the rows whose values changed"""
+        if inserts:
+            for row, row_id in zip(inserts, self._insert(model, inserts)):
+                result.changed.append({"id": row_id, **row})
+                result.inserted_ids.add(row_id)
+            result.inserted += len(inserts)
+        if updates:
+            for chunk in _chunks(updates, self.batch_size):
+                self.db.execute(update(model), list(chunk))
+            result.changed.extend(updates)
+            result.updated += len(updates)
@@ -0,0 +1,66 @@
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.scrape_log import ScrapeChange, ScrapeRun
+from app.scrapers.bulk_upsert import UpsertResult, _chunks
+
+logger = logging.getLogger(__name__)
+
+# Keys of a written row that are bookkeeping rather than scraped fields
+_ROW_KEYS = {"id", "fingerprint"}
+
+
+def change_rows(run_id: int, results: List[UpsertResult]) -> List[Dict]:
+    """One change log row per inserted or changed row of the results"""
+    rows = []
+    for result in results:
+        for row in result.changed:
+            inserted = row["id"] in result.inserted_ids
+            rows.append({
+                "run_id": run_id,
+                "table_name": result.table,
+                "row_id": row["id"],
+                "operation": "insert" if inserted else "update",
+                "fields": None if inserted else sorted(set(row) - _ROW_KEYS),
+            })
+    return rows
+
+
+def record_scrape_run(
+    db: Session,
+    league_id: Optional[int],
+    platform: str,
+    mode: str,
+    started_at: datetime,
+    results: List[UpsertResult],
+    status: str = "success",
+    error: Optional[str] = None
+) -> ScrapeRun:
+    """Add a run and its change log to the session, to commit with the data it describes"""
+    run = ScrapeRun(
+        league_id=league_id,
+        platform=platform,
+        mode=mode,
+        status=status,
+        started_at=started_at,
+        finished_at=datetime.now(timezone.utc),
+        inserted=sum(result.inserted for result in results),
+        updated=sum(result.updated for result in results),
+        unchanged=sum(result.unchanged for result in results),
+        error=error,
+    )
+    db.add(run)
+    db.flush()
+    add_change_log(db, run.id, results)
+    return run
+
+
+def add_change_log(db: Session, run_id: int, results: List[UpsertResult]):
+    """Add the change log rows of written results to the session (unless SCRAPE_CHANGE_LOG is off)"""
+    if not settings.scrape_change_log:
+        return
+    for chunk in _chunks(change_rows(run_id, results), settings.bulk_upsert_batch_size):
+        db.execute(insert(ScrapeChange), list(chunk))
@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.scrape_log import ScrapeCheckpoint, ScrapeRun
+from app.scrapers.bulk_upsert import UpsertResult
+from app.scrapers.change_log import add_change_log
+
+
+class StageIncomplete(Exception):
+    """Raised once a stage has committed what it could, when some of its pages failed"""
+    
+    def __init__(self, stage: str, failures: Dict[str, Exception]):
+        self.stage = stage
+        self.failures = failures
+        key, error = next(iter(failures.items()))
+        super().__init__(f"{len(failures)} {stage} pages failed (first {key}: {error})")
+
+
+class ScrapeCheckpoints:
+    """A league scrape's run row and the stages and teams it has committed so far
+    
+    Each stage adds its checkpoint to the session alongside its data, so both commit
+    together. A resumed run skips the stages, and the teams within a stage, that an
+    earlier attempt already committed.
+    """
+    
+    def __init__(self, db: Session, run: ScrapeRun):
+        self.db = db
+        self.run = run
+        self._stages: Set[str] = set()
+        self._teams: Dict[str, Set[int]] = {}
+        for stage, team_id in db.query(ScrapeCheckpoint.stage, ScrapeCheckpoint.team_id).filter(
+            ScrapeCheckpoint.run_id == run.id
+        ):
+            self._remember(stage, [] if team_id is None else [team_id], team_id is None)
+    
+    @classmethod
+    def start(cls, db: Session, platform_name: str, mode: str) -> "ScrapeCheckpoints":
+        """Create and commit a new running scrape run"""
+        run = ScrapeRun(
+            platform=platform_name,
+            mode=mode,
+            status="running",
+            started_at=datetime.now(timezone.utc),
+            inserted=0,
+            updated=0,
+            unchanged=0,
+            attempts=1,
+        )
+        db.add(run)
+        db.commit()
+        return cls(db, run)
+    
+    @classmethod
+    def resume(cls, db: Session, run_id: int, platform_name: str, mode: str) -> Optional["ScrapeCheckpoints"]:
+        """Reopen an unfinished run of the same kind, or None when there is nothing to resume"""
+        run = db.get(ScrapeRun, run_id)
+        if run is None or run.status == "success" or run.platform != platform_name or run.mode != mode:
+            return None
+        run.status = "running"
+        run.attempts = (run.attempts or 1) + 1
+        run.finished_at = None
+        run.error = None
+        db.commit()
+        return cls(db, run)
+    
+    def done(self, stage: str) -> bool:
+        return stage in self._stages
+    
+    def done_teams(self, stage: str) -> Set[int]:
+        return self._teams.get(stage, set())
+    
+    def touched(self) -> Dict[str, Optional[List[int]]]:
+        """Seasons and teams written by the stages committed so far"""
+        return dict(self.run.touched_teams or {})
+    
+    def complete(
+        self,
+        stage: str,
+        results: List[UpsertResult],
+        touched: Dict[str, Optional[List[int]]],
+        team_ids: Iterable[int] = (),
+        finished: bool = True
+    ):
+        """Add a stage's counts, change log and checkpoints to the session
+        
+        team_ids checkpoints those teams within the stage; the stage as a whole is only
+        checkpointed once finished.
+        """
+        run = self.run
+        run.inserted += sum(result.inserted for result in results)
+        run.updated += sum(result.updated for result in results)
+        run.unchanged += sum(result.unchanged for result in results)
+        # A fresh dict so the JSON column registers the change
+        run.touched_teams = {season: teams for season, teams in touched.items()}
+        add_change_log(self.db, run.id, results)
+        
+        team_ids = list(team_ids)
+        completed_at = datetime.now(timezone.utc)
+        rows = [
+            {"run_id": run.id, "stage": stage, "team_id": team_id, "completed_at": completed_at}
+            for team_id in team_ids
+        ]
+        if finished:
+            rows.append({"run_id": run.id, "stage": stage, "team_id": None, "completed_at": completed_at})
+        if rows:
+            self.db.execute(insert(ScrapeCheckpoint), rows)
+        self._remember(stage, team_ids, finished)
+    
+    def finish(self, status: str = "success", error: Optional[str] = None):
+        """Close the run; the caller commits"""
+        self.run.status = status
+        self.run.finished_at = datetime.now(timezone.utc)
+        self.run.error = error
+    
+    def _remember(self, stage: str, team_ids: Iterable[int], finished: bool):
+        self._teams.setdefault(stage, set()).update(team_ids)
+        if finished:
+            self._stages.add(stage)
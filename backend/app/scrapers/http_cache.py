@@ -0,0 +1,179 @@
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlencode
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PageUnchanged(Exception):
+    """Raised when a fetched page is identical to the one seen by the last committed scrape"""
+    
+    def __init__(self, url: str):
+        super().__init__(f"Page unchanged since last scrape: {url}")
+        self.url = url
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+    body: bytes
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class HttpCache:
+    """On-disk, size-bounded LRU store of page bodies and their HTTP validators"""
+    
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_accessed ON entries (accessed)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        # Last use of entries read since the last put_many, written with it in one batch
+        self._accessed: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Cache key for a URL and its query parameters"""
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        return hashlib.sha1(f"{url}?{query}".encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Look up an entry, marking it used so eviction drops the least recently used first
+        
+        The use is only noted in memory; put_many writes it, so a lookup stays a read.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, etag, last_modified, content_hash, body FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is not None:
+                self._accessed[key] = time.time()
+        if row is None:
+            return None
+        return CacheEntry(key, row[0], row[1], row[2], row[3], row[4])
+    
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """Validators to send so the server can answer 304 Not Modified"""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+    
+    def record(self, hit: bool, not_modified: bool = False):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if not_modified:
+                self.not_modified += 1
+    
+    def put_many(self, entries: Iterable[CacheEntry]):
+        """Store entries and the uses noted by get, then evict least recently used ones beyond max_bytes"""
+        now = time.time()
+        rows = [
+            (e.key, e.url, e.etag, e.last_modified, e.content_hash, e.body, len(e.body), now)
+            for e in entries
+        ]
+        with self._lock:
+            if not rows and not self._accessed:
+                return
+            if self._accessed:
+                self._conn.executemany(
+                    "UPDATE entries SET accessed = ? WHERE key = ?",
+                    [(accessed, key) for key, accessed in self._accessed.items()]
+                )
+                self._accessed = {}
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries "
+                "(key, url, etag, last_modified, content_hash, body, size, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._evict()
+            self._conn.commit()
+    
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        self.evictions += evicted
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+        }
+
+
+_cache: Optional[HttpCache] = None
+_cache_pid: Optional[int] = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Process-wide HTTP cache, or None when caching is disabled"""
+    global _cache, _cache_pid
+    if not settings.http_cache_enabled:
+        return None
+    with _cache_lock:
+        # SQLite connections must not cross a fork, so each worker process opens its own
+        if _cache is None or _cache_pid != os.getpid():
+            _cache = HttpCache(
+                os.path.join(settings.http_cache_dir, "http_cache.sqlite3"),
+                settings.http_cache_max_bytes
+            )
+            _cache_pid = os.getpid()
+        return _cache
@@ -0,0 +1,122 @@
+import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import redis
+from app.config import settings
+
+
+@dataclass
+class ScorePoll:
+    """Outcome of one live-score poll of a league"""
+    payload_hash: Optional[str]
+    changed: bool
+    live_games: int
+    day_hashes: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class PollState:
+    """Where a league's live polling stands: last payload seen, current interval and next due time"""
+    payload_hash: Optional[str] = None
+    interval: float = 0.0
+    due: float = 0.0
+    live_games: int = 0
+    day_hashes: Dict[str, str] = field(default_factory=dict)
+
+
+def live_window(today: Optional[date] = None) -> Tuple[date, date]:
+    """Game dates a live poll covers: today plus a look-back for games running past midnight"""
+    today = today or date.today()
+    return today - timedelta(days=settings.live_poll_lookback_days), today
+
+
+def payload_hash(games_data: List[Dict[str, Any]]) -> str:
+    """Stable digest of scraped score rows, independent of row order"""
+    rows = sorted(json.dumps(game, sort_keys=True, default=str) for game in games_data)
+    return hashlib.sha256("\n".join(rows).encode()).hexdigest()
+
+
+def window_hash(day_hashes: Dict[str, str]) -> str:
+    """Digest of a whole live window from the payload hashes of its days"""
+    days = "\n".join(f"{day}:{digest}" for day, digest in sorted(day_hashes.items()))
+    return hashlib.sha256(days.encode()).hexdigest()
+
+
+def next_interval(previous: float, poll: ScorePoll) -> float:
+    """Seconds until a league's next poll
+    
+    A changed payload snaps back to the fastest interval; while games are live but
+    the score has not moved the interval grows by the backoff factor up to the live
+    ceiling, and with nothing under way (games later today) it drops to the idle rate.
+    """
+    if not poll.live_games:
+        return settings.live_poll_idle_interval
+    if poll.changed or not previous:
+        return settings.live_poll_min_interval
+    return min(previous * settings.live_poll_backoff, settings.live_poll_max_interval)
+
+
+class LivePollSchedule:
+    """Per-league poll state shared by the beat dispatcher and the poll tasks"""
+    
+    def __init__(self, client: Optional[redis.Redis] = None, prefix: str = "live:league:"):
+        self.client = client
+        self.prefix = prefix
+        self._local: Dict[int, PollState] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, league_id: int) -> PollState:
+        if self.client is None:
+            with self._lock:
+                return self._local.get(league_id, PollState())
+        fields = self.client.hgetall(f"{self.prefix}{league_id}")
+        if not fields:
+            return PollState()
+        return PollState(
+            payload_hash=fields.get(b"hash", b"").decode() or None,
+            interval=float(fields.get(b"interval", 0)),
+            due=float(fields.get(b"due", 0)),
+            live_games=int(fields.get(b"live", 0)),
+            day_hashes=json.loads(fields.get(b"days") or b"{}"),
+        )
+    
+    def save(self, league_id: int, state: PollState):
+        if self.client is None:
+            with self._lock:
+                self._local[league_id] = state
+            return
+        key = f"{self.prefix}{league_id}"
+        with self.client.pipeline() as pipe:
+            pipe.hset(key, mapping={
+                "hash": state.payload_hash or "",
+                "interval": state.interval,
+                "due": state.due,
+                "live": state.live_games,
+                "days": json.dumps(state.day_hashes),
+            })
+            # Leagues with no open games stop being polled; let their state lapse
+            pipe.expire(key, settings.live_poll_state_ttl)
+            pipe.execute()
+    
+    def claim(self, league_id: int, now: Optional[float] = None) -> bool:
+        """Take a league whose poll is due, pushing its due time out so later ticks skip it"""
+        now = time.time() if now is None else now
+        state = self.get(league_id)
+        if state.due > now:
+            return False
+        state.due = now + max(state.interval, settings.live_poll_claim_seconds)
+        self.save(league_id, state)
+        return True
+    
+    def record(self, league_id: int, poll: ScorePoll, now: Optional[float] = None) -> PollState:
+        """Store a poll's outcome and schedule the league's next poll"""
+        now = time.time() if now is None else now
+        previous = self.get(league_id)
+        interval = next_interval(previous.interval, poll)
+        state = PollState(poll.payload_hash, interval, now + interval, poll.live_games, poll.day_hashes)
+        self.save(league_id, state)
+        return state
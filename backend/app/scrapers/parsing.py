@@ -0,0 +1,115 @@
+from io import BytesIO
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Union
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+from bs4 import BeautifulSoup, Tag
+
+Document = Union[BeautifulSoup, Tag, etree._Element]
+
+PARSER_BACKENDS = ("bs4", "lxml")
+
+
+@lru_cache(maxsize=1024)
+def compile_selector(selector: str) -> CSSSelector:
+    """Translate a CSS selector to a compiled XPath expression once per process"""
+    return CSSSelector(selector, translator="html")
+
+
+def parse_html(content: bytes, backend: str = "bs4") -> Document:
+    """Parse a page with the given backend"""
+    if backend == "lxml":
+        return lxml.html.document_fromstring(content)
+    if backend == "bs4":
+        return BeautifulSoup(content, 'lxml')
+    raise ValueError(f"Unknown parser backend: {backend}")
+
+
+# Elements whose text BeautifulSoup get_text() leaves out
+NON_TEXT_TAGS = frozenset(("script", "style", "template"))
+
+
+def _iter_text(element) -> Iterator[str]:
+    """itertext() without the contents of script, style and template elements"""
+    if element.text:
+        yield element.text
+    for child in element:
+        # Comments and processing instructions have no string tag; only their tail is text
+        if isinstance(child.tag, str) and child.tag not in NON_TEXT_TAGS:
+            yield from _iter_text(child)
+        if child.tail:
+            yield child.tail
+
+
+def element_text(element) -> str:
+    """Element text with each string stripped, matching BeautifulSoup get_text(strip=True)"""
+    if isinstance(element, etree._Element):
+        return "".join(text.strip() for text in _iter_text(element))
+    return element.get_text(strip=True)
+
+
+def select_one(document: Document, selector: str):
+    if isinstance(document, etree._Element):
+        matches = compile_selector(selector)(document)
+        return matches[0] if matches else None
+    return document.select_one(selector)
+
+
+def select(document: Document, selector: str) -> list:
+    if isinstance(document, etree._Element):
+        return compile_selector(selector)(document)
+    return document.select(selector)
+
+
+def iter_table_rows(
+    content: bytes,
+    table_id: Optional[str] = None,
+    table_index: int = 0
+) -> Iterator[Dict[str, str]]:
+    """Stream the rows of one HTML table as dicts keyed by its header cells
+    
+    Uses lxml iterparse and frees each row once yielded, so memory stays flat on
+    very large schedule and stats tables. The table is chosen by id, or else by its
+    position among the page's tables. Rows without a matching header are keyed by
+    column position.
+    """
+    headers: List[str] = []
+    seen_tables = 0
+    depth = 0
+    in_target = False
+    
+    for event, element in etree.iterparse(
+        BytesIO(content), events=("start", "end"), tag=("table", "tr"), html=True
+    ):
+        if element.tag == "table":
+            if event == "start":
+                if in_target:
+                    depth += 1
+                elif (element.get("id") == table_id) if table_id else seen_tables == table_index:
+                    in_target = True
+                    depth = 0
+                seen_tables += 1
+                continue
+            if in_target:
+                if depth == 0:
+                    element.clear()
+                    return
+                depth -= 1
+            continue
+        
+        if event != "end" or not in_target or depth:
+            continue
+        cells = [cell for cell in element if cell.tag in ("td", "th")]
+        if cells and all(cell.tag == "th" for cell in cells):
+            # First header row names the columns; repeated header rows are skipped
+            headers = headers or [element_text(cell) for cell in cells]
+        elif cells:
+            yield {
+                headers[index] if index < len(headers) else str(index): element_text(cell)
+                for index, cell in enumerate(cells)
+            }
+        element.clear()
+        # Drop already-processed siblings so the partial tree does not grow
+        while element.getprevious() is not None:
+            del element.getparent()[0]
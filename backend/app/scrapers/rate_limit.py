@@ -0,0 +1,77 @@
+import time
+import random
+import asyncio
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from app.config import settings
+
+
+class TokenBucket:
+    """Token bucket limiter shared by threads and event loops"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+    
+    def acquire(self):
+        """Block until a token is available"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def acquire_async(self):
+        """Wait for a token without blocking the event loop"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_host_limiter(url: str, requests_per_second: Optional[float] = None) -> Optional[TokenBucket]:
+    """Return the process-wide limiter for the URL's host, or None when rate limiting is off"""
+    if requests_per_second is None:
+        if settings.rate_limit_delay <= 0:
+            return None
+        requests_per_second = 1.0 / settings.rate_limit_delay
+    
+    host = urlsplit(url).netloc.lower()
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(requests_per_second, max(1, settings.rate_limit_burst))
+            _buckets[host] = bucket
+        return bucket
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for the given zero-based attempt"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def retry_after_seconds(headers) -> Optional[float]:
+    """Parse a numeric Retry-After header"""
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
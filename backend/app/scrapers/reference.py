@@ -0,0 +1,144 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.bulk_upsert import DEFAULT_SEASON
+
+logger = logging.getLogger(__name__)
+
+# Column headers of each table on a reference site
+STANDINGS_COLUMNS = ("Team", "Team ID", "Season", "GP", "W", "L", "T", "PTS", "GF", "GA")
+SCORES_COLUMNS = (
+    "Game ID", "Date", "Time", "Home", "Home ID", "Away", "Away ID",
+    "Home Score", "Away Score", "Status", "Venue",
+)
+ROSTER_COLUMNS = ("Player ID", "First", "Last", "Number", "Position")
+PLAYER_STATS_COLUMNS = ("Season", "GP", "G", "A", "PTS", "S", "SOG", "PIM", "+/-")
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    value = (value or "").strip()
+    return int(value) if value.lstrip("+-").isdigit() else None
+
+
+class ReferenceScraper(BaseScraper):
+    """Scraper for the plain-HTML reference site layout
+    
+    Serves as the template for platform scrapers and as the scraper the benchmark
+    suite replays recorded pages through. Relative to a league URL the site has:
+    
+    - the league page, with h1.league-name, .league-description and img.league-logo
+    - /standings, with table#standings
+    - /scores (optionally ?date=YYYY-MM-DD), with table#scores
+    - /teams/<team id>/roster, with table#roster
+    - /players/<player id>, with table#stats, one row per season (latest last)
+    
+    Tables are streamed with fetch_table_rows, so they are never built into a tree.
+    Every scrape call reads exactly one page, so each passes skip_unchanged and an
+    unchanged page skips the call.
+    """
+    
+    def __init__(self, platform_name: str = "reference", base_url: str = ""):
+        super().__init__(platform_name, base_url)
+    
+    def url(self, path: str) -> str:
+        return f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
+    
+    def scrape_league_info(self, league_url: str) -> Dict[str, Any]:
+        """Scrape league information"""
+        soup = self.fetch_page(league_url, skip_unchanged=True)
+        path = urlsplit(league_url).path.strip("/")
+        return {
+            "name": self.extract_text(soup, "h1.league-name"),
+            "slug": path.rsplit("/", 1)[-1] or urlsplit(league_url).hostname,
+            "description": self.extract_text(soup, ".league-description") or None,
+            "logo_url": self.extract_attribute(soup, "img.league-logo", "src") or None,
+            "source_url": league_url,
+        }
+    
+    def scrape_standings(self, league_url: str) -> List[Dict[str, Any]]:
+        """Scrape league standings"""
+        standings = []
+        for rank, row in enumerate(
+            self.fetch_table_rows(
+                f"{league_url.rstrip('/')}/standings", table_id="standings", skip_unchanged=True
+            ),
+            start=1
+        ):
+            wins, losses, ties = _int(row.get("W")) or 0, _int(row.get("L")) or 0, _int(row.get("T")) or 0
+            goals_for, goals_against = _int(row.get("GF")) or 0, _int(row.get("GA")) or 0
+            standings.append({
+                "team_name": row.get("Team"),
+                "source_team_id": row.get("Team ID") or None,
+                "season": row.get("Season") or DEFAULT_SEASON,
+                "rank": rank,
+                "games_played": _int(row.get("GP")) or wins + losses + ties,
+                "wins": wins,
+                "losses": losses,
+                "ties": ties,
+                "points": _int(row.get("PTS")) or 0,
+                "goals_for": goals_for,
+                "goals_against": goals_against,
+                "goal_difference": goals_for - goals_against,
+            })
+        return standings
+    
+    def scrape_scores(self, league_url: str, date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Scrape game scores"""
+        params = {"date": date} if date else None
+        games = []
+        scores_url = f"{league_url.rstrip('/')}/scores"
+        for row in self.fetch_table_rows(scores_url, params, table_id="scores", skip_unchanged=True):
+            game_time = row.get("Time")
+            games.append({
+                "source_game_id": row.get("Game ID") or None,
+                "game_date": datetime.strptime(row["Date"], "%Y-%m-%d").date(),
+                "game_time": datetime.strptime(game_time, "%H:%M").time() if game_time else None,
+                "home_team": row.get("Home"),
+                "home_source_team_id": row.get("Home ID") or None,
+                "away_team": row.get("Away"),
+                "away_source_team_id": row.get("Away ID") or None,
+                "home_score": _int(row.get("Home Score")),
+                "away_score": _int(row.get("Away Score")),
+                "status": (row.get("Status") or "scheduled").lower(),
+                "venue": row.get("Venue") or None,
+            })
+        return games
+    
+    def scrape_rosters(self, team_url: str) -> List[Dict[str, Any]]:
+        """Scrape team rosters (a roster URL, or a platform team id)"""
+        if "://" not in team_url:
+            team_url = self.url(f"teams/{team_url}/roster")
+        roster = []
+        for row in self.fetch_table_rows(team_url, table_id="roster", skip_unchanged=True):
+            first_name, last_name = row.get("First", ""), row.get("Last", "")
+            roster.append({
+                "source_player_id": row.get("Player ID") or None,
+                "first_name": first_name,
+                "last_name": last_name,
+                "full_name": f"{first_name} {last_name}".strip(),
+                "jersey_number": _int(row.get("Number")),
+                "position": row.get("Position") or None,
+            })
+        return roster
+    
+    def scrape_player_stats(self, player_url: str) -> Dict[str, Any]:
+        """Scrape player statistics for the latest season (a player URL, or a platform player id)"""
+        if "://" not in player_url:
+            player_url = self.url(f"players/{player_url}")
+        rows = list(self.fetch_table_rows(player_url, table_id="stats", skip_unchanged=True))
+        if not rows:
+            return {}
+        row = rows[-1]
+        return {
+            "season": row.get("Season") or DEFAULT_SEASON,
+            "games_played": _int(row.get("GP")),
+            "goals": _int(row.get("G")),
+            "assists": _int(row.get("A")),
+            "points": _int(row.get("PTS")),
+            "shots": _int(row.get("S")),
+            "shots_on_goal": _int(row.get("SOG")),
+            "penalty_minutes": _int(row.get("PIM")),
+            "plus_minus": _int(row.get("+/-")),
+        }
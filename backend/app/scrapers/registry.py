@@ -0,0 +1,27 @@
+from typing import Dict, Type
+from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.reference import ReferenceScraper
+
+# Platform name (League.source_platform) -> scraper class
+SCRAPERS: Dict[str, Type[BaseScraper]] = {
+    "reference": ReferenceScraper,
+}
+
+
+def register(platform_name: str):
+    """Class decorator adding a scraper to the registry"""
+    def decorator(scraper_class: Type[BaseScraper]) -> Type[BaseScraper]:
+        SCRAPERS[platform_name] = scraper_class
+        return scraper_class
+    return decorator
+
+
+def create_scraper(platform_name: str, base_url: str) -> BaseScraper:
+    """New scraper instance for a platform, rooted at the league's URL"""
+    try:
+        scraper_class = SCRAPERS[platform_name]
+    except KeyError:
+        raise ValueError(
+            f"No scraper for platform {platform_name!r} (known: {', '.join(sorted(SCRAPERS))})"
+        ) from None
+    return scraper_class(platform_name, base_url)
@@ -0,0 +1,102 @@
+import logging
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from app.scrapers.bulk_upsert import BulkUpserter, UpsertResult
+from app.scrapers.standings import StandingsEngine
+from app.utils.metrics import timed_upsert
+from app.models.team import Team
+from app.models.player import Player
+from app.models.statistics import PlayerStatistics
+
+logger = logging.getLogger(__name__)
+
+
+def per_game(total: int, games_played: int) -> float:
+    return round(total / games_played, 3) if games_played else 0.0
+
+
+class StatisticsRollup:
+    """Materializes team and player season aggregates so stats endpoints read stored rows
+    
+    Team totals come from the same GROUP BY over final games as computed standings;
+    shots per game sums the team's player season shots, the only shot data scraped.
+    Games carry no per-player lines, so player rows stay as scraped apart from their
+    derived points, which are corrected in one UPDATE per season.
+    """
+    
+    def __init__(self, db: Session, upserter: Optional[BulkUpserter] = None):
+        self.db = db
+        self.upserter = upserter or BulkUpserter(db)
+        self.standings = StandingsEngine(db, self.upserter)
+    
+    def run(self, league_id: int, touched: Dict[str, Optional[Iterable[int]]]) -> List[UpsertResult]:
+        """Roll up each touched season for its teams (None meaning all of them)"""
+        results = []
+        for season, team_ids in sorted(touched.items()):
+            team_ids = None if team_ids is None else sorted(set(team_ids))
+            results.append(self.roll_up_teams(league_id, season, team_ids))
+            results.append(self.roll_up_players(league_id, season, team_ids))
+        return results
+    
+    def roll_up_teams(
+        self,
+        league_id: int,
+        season: str,
+        team_ids: Optional[List[int]] = None
+    ) -> UpsertResult:
+        """Write TeamStatistics for a season from final games and player shot totals"""
+        totals = self.standings.aggregate(league_id, season, team_ids)
+        
+        statement = select(
+            Player.team_id, func.coalesce(func.sum(PlayerStatistics.shots), 0)
+        ).join(Player, Player.id == PlayerStatistics.player_id).where(
+            PlayerStatistics.season == season
+        ).group_by(Player.team_id)
+        if team_ids is None:
+            statement = statement.join(Team, Team.id == Player.team_id).where(Team.league_id == league_id)
+        else:
+            statement = statement.where(Player.team_id.in_(team_ids))
+        shots = {team_id: int(total) for team_id, total in self.db.execute(statement)}
+        
+        records = []
+        for team_id, total in totals.items():
+            games_played = total["games_played"]
+            records.append({
+                "team_id": team_id,
+                "season": season,
+                "games_played": games_played,
+                "goals_for": total["goals_for"],
+                "goals_against": total["goals_against"],
+                "goal_difference": total["goal_difference"],
+                "goals_per_game": per_game(total["goals_for"], games_played),
+                "shots_per_game": per_game(shots.get(team_id, 0), games_played),
+            })
+        return self.upserter.upsert_team_statistics(records)
+    
+    @timed_upsert
+    def roll_up_players(
+        self,
+        league_id: int,
+        season: str,
+        team_ids: Optional[List[int]] = None
+    ) -> UpsertResult:
+        """Derive points from goals and assists for the season's player rows"""
+        players = select(Player.id)
+        if team_ids is None:
+            players = players.join(Team, Team.id == Player.team_id).where(Team.league_id == league_id)
+        else:
+            players = players.where(Player.team_id.in_(team_ids))
+        
+        points = func.coalesce(PlayerStatistics.goals, 0) + func.coalesce(PlayerStatistics.assists, 0)
+        updated = self.db.execute(
+            update(PlayerStatistics)
+            .where(
+                PlayerStatistics.season == season,
+                PlayerStatistics.player_id.in_(players),
+                PlayerStatistics.points.is_distinct_from(points),
+            )
+            .values(points=points)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        return UpsertResult(PlayerStatistics.__tablename__, updated=updated)
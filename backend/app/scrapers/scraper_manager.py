@@ -1,70 +1,504 @@
+import time
 import logging
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_
+from app.config import settings
 from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.http_cache import PageUnchanged
+from app.scrapers.bulk_upsert import (
+    BulkUpserter, UpsertResult, DEFAULT_SEASON, GAME_FIELDS, PLAYER_FIELDS, PLAYER_STATISTICS_FIELDS,
+    STANDING_FIELDS, _chunks, fingerprint, win_percentage,
+)
+from app.scrapers.change_log import record_scrape_run
+from app.scrapers.checkpoints import ScrapeCheckpoints, StageIncomplete
+from app.scrapers.team_resolver import TeamResolver, game_team_source_ids
+from app.scrapers.standings import StandingsEngine
+from app.scrapers.live import ScorePoll, live_window, payload_hash, window_hash
 from app.models.database import SessionLocal
+from app.utils.cache import bump_league_version
+from app.utils.events import publish_game_changes
+from app.utils.metrics import observe_upsert, scrape_endpoint
 from app.models.league import League
 from app.models.team import Team
 from app.models.player import Player
-from app.models.game import Game
+from app.models.game import Game, FINAL_STATUSES, PENDING_STATUSES
 from app.models.standing import Standing
 from app.models.statistics import PlayerStatistics, TeamStatistics
 
 logger = logging.getLogger(__name__)
 
+LEAGUE_FIELDS = ("name", "description", "source_url", "logo_url")
+
 
 class ScraperManager:
     """Manages scrapers and coordinates data storage"""
     
-    def __init__(self):
+    def __init__(self, bulk_upsert: Optional[bool] = None):
         self.scrapers: Dict[str, BaseScraper] = {}
         self.db = SessionLocal()
+        self.bulk_upsert = settings.bulk_upsert if bulk_upsert is None else bulk_upsert
+        self.teams = TeamResolver(self.db)
+        self.upserter: Optional[BulkUpserter] = None
+        self.last_results: List[UpsertResult] = []
+        self.touched: Dict[str, Optional[List[int]]] = {}
+        self.checkpoints: Optional[ScrapeCheckpoints] = None
     
     def register_scraper(self, platform_name: str, scraper: BaseScraper):
         """Register a scraper for a platform"""
         self.scrapers[platform_name] = scraper
         logger.info(f"Registered scraper for platform: {platform_name}")
     
-    def scrape_league(self, platform_name: str, league_url: str) -> bool:
-        """Scrape all data for a league"""
+    def scrape_league(
+        self,
+        platform_name: str,
+        league_url: str,
+        incremental: bool = False,
+        run_id: Optional[int] = None
+    ) -> bool:
+        """Scrape all data for a league
+        
+        In incremental mode only score dates that can still change are fetched and
+        rosters and player stats are left alone, which keeps intra-day refreshes
+        cheap. With STANDINGS_SOURCE=computed the standings page is not scraped;
+        standings are derived from the stored games instead. The seasons and teams
+        touched by the scrape are left in self.touched for the statistics rollup.
+        
+        Each stage (league info, standings, scores, rosters, player stats) commits on
+        its own with a checkpoint in the scrape run, and rosters and player stats also
+        commit every SCRAPE_CHECKPOINT_TEAMS teams. A failure keeps what was committed;
+        passing the failed run's id (self.checkpoints.run) resumes it after its last
+        checkpoint. Rows whose scraped values did not change are not written, and every
+        inserted or changed row is logged in the same transaction as the data.
+        """
         if platform_name not in self.scrapers:
             logger.error(f"No scraper registered for platform: {platform_name}")
             return False
         
         scraper = self.scrapers[platform_name]
+        # Team names resolve against an identity map kept for the length of the scrape
+        self.teams = TeamResolver(self.db)
+        self.upserter = BulkUpserter(self.db, teams=self.teams) if self.bulk_upsert else None
+        self.last_results = []
+        self.touched = {}
+        self.checkpoints = None
+        compute_standings = settings.standings_source == "computed"
+        mode = "incremental" if incremental else "full"
         
         try:
+            self.checkpoints = self._open_run(platform_name, mode, run_id)
+            self.touched = self.checkpoints.touched()
+            
             # Scrape league info
-            league_data = scraper.scrape_league_info(league_url)
-            league = self._upsert_league(league_data, platform_name)
+            league = self._scrape_league_info(scraper, platform_name, league_url)
             
             # Scrape standings
-            standings_data = scraper.scrape_standings(league_url)
-            self._upsert_standings(league.id, standings_data)
+            if not compute_standings and not self.checkpoints.done("standings"):
+                standings_data = self._scrape_if_changed(scraper.scrape_standings, league_url)
+                results = [] if standings_data is None else [self._upsert_standings(league.id, standings_data)]
+                self._commit_stage(scraper, league.id, "standings", results)
             
             # Scrape scores
-            scores_data = scraper.scrape_scores(league_url)
-            self._upsert_games(league.id, scores_data)
+            if not self.checkpoints.done("scores"):
+                self._scrape_scores(scraper, league.id, league_url, incremental, compute_standings)
             
-            # Scrape rosters and player stats for each team
-            for team in league.teams:
-                if team.source_team_id:
-                    roster_data = scraper.scrape_rosters(team.source_team_id)
-                    self._upsert_roster(team.id, roster_data)
+            # Scrape rosters for each team, then every rostered player's stats
+            if not incremental:
+                if not self.checkpoints.done("rosters"):
+                    self._scrape_rosters(scraper, league.id)
+                if settings.player_stats_enabled and not self.checkpoints.done("player_stats"):
+                    self._scrape_player_stats(scraper, league.id)
             
+            self.checkpoints.finish()
             self.db.commit()
+            if scraper.http_cache is not None:
+                logger.info(f"HTTP cache for {platform_name}: {scraper.http_cache.stats()}")
             logger.info(f"Successfully scraped league: {league.name}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Error scraping league: {e}")
             self.db.rollback()
+            scraper.discard_http_cache()
+            self._fail_run(e)
             return False
         finally:
             scraper.cleanup()
     
-    def _upsert_league(self, data: Dict, platform_name: str) -> League:
+    def poll_scores(
+        self,
+        platform_name: str,
+        league_id: int,
+        league_url: str,
+        previous_days: Optional[Dict[str, str]] = None
+    ) -> Optional[ScorePoll]:
+        """Poll only the scores of a league's open games in the live window
+        
+        Each day's rows are hashed, and a day whose page is unchanged (HTTP cache)
+        keeps its hash from previous_days, so the window hash always covers every
+        day. Only days whose rows changed since the previous poll are written. When
+        a game goes final the standings are refreshed too, scraped or computed per
+        STANDINGS_SOURCE. Returns None on error.
+        """
+        if platform_name not in self.scrapers:
+            logger.error(f"No scraper registered for platform: {platform_name}")
+            return None
+        
+        scraper = self.scrapers[platform_name]
+        self.teams = TeamResolver(self.db)
+        self.upserter = BulkUpserter(self.db, teams=self.teams) if self.bulk_upsert else None
+        self.last_results = []
+        self.touched = {}
+        started_at = datetime.now(timezone.utc)
+        
+        try:
+            score_dates = self._live_score_dates(league_id)
+            previous_days = previous_days or {}
+            day_hashes: Dict[str, str] = {}
+            scores_data = []
+            for score_date in score_dates:
+                day = score_date.isoformat()
+                day_data = self._scrape_if_changed(scraper.scrape_scores, league_url, date=day)
+                if day_data is None:
+                    # The page matches the last committed scrape, so its rows are stored already
+                    day_hashes[day] = previous_days.get(day, "unchanged")
+                    continue
+                day_hashes[day] = payload_hash(day_data)
+                if day_hashes[day] != previous_days.get(day):
+                    scores_data.extend(day_data)
+            changed = bool(scores_data)
+            if changed:
+                scores_data = self._drop_final_games(league_id, score_dates, scores_data)
+                games_result = self._upsert_games(league_id, scores_data)
+                self.last_results.append(games_result)
+                if any(game.get('status') in FINAL_STATUSES for game in scores_data):
+                    self.touched = self._touched_teams(league_id, games_result)
+                    if settings.standings_source == "computed":
+                        engine = StandingsEngine(self.db, self.upserter)
+                        self.last_results.extend(engine.recompute_seasons(league_id, self.touched))
+                    else:
+                        standings_data = self._scrape_if_changed(scraper.scrape_standings, league_url)
+                        if standings_data is not None:
+                            self.last_results.append(self._upsert_standings(league_id, standings_data))
+                if self._wrote_changes(self.last_results):
+                    record_scrape_run(self.db, league_id, platform_name, "live", started_at, self.last_results)
+                self.db.commit()
+                scraper.commit_http_cache()
+                if self._wrote_changes(self.last_results):
+                    bump_league_version(league_id)
+                    self._publish_game_changes(league_id, self.last_results)
+                for result in self.last_results:
+                    logger.info(f"League {league_id} live {result}")
+            else:
+                logger.info(f"League {league_id} scores unchanged, nothing written")
+            return ScorePoll(
+                window_hash(day_hashes), changed, self._live_game_count(league_id, score_dates), day_hashes
+            )
+        
+        except Exception as e:
+            logger.error(f"Error polling scores for league {league_id}: {e}")
+            self.db.rollback()
+            scraper.discard_http_cache()
+            return None
+        finally:
+            scraper.cleanup()
+    
+    def _open_run(self, platform_name: str, mode: str, run_id: Optional[int]) -> ScrapeCheckpoints:
+        """Resume the given unfinished run, or start a new one"""
+        if run_id is not None:
+            checkpoints = ScrapeCheckpoints.resume(self.db, run_id, platform_name, mode)
+            if checkpoints is not None:
+                logger.info(f"Resuming scrape run {run_id} (attempt {checkpoints.run.attempts})")
+                return checkpoints
+            logger.info(f"Scrape run {run_id} cannot be resumed, starting over")
+        return ScrapeCheckpoints.start(self.db, platform_name, mode)
+    
+    def _commit_stage(
+        self,
+        scraper: BaseScraper,
+        league_id: int,
+        stage: str,
+        results: List[UpsertResult],
+        team_ids: Iterable[int] = (),
+        finished: bool = True
+    ):
+        """Commit a stage's writes together with its checkpoint, then act on what it changed"""
+        self.checkpoints.complete(stage, results, self.touched, team_ids, finished)
+        self.db.commit()
+        scraper.commit_http_cache()
+        self.last_results.extend(results)
+        if self._wrote_changes(results):
+            bump_league_version(league_id)
+            self._publish_game_changes(league_id, results)
+        for result in results:
+            logger.info(f"League {league_id} {stage} {result}")
+    
+    def _fail_run(self, error: Exception):
+        """Mark the run failed in its own transaction; the stages it committed stay"""
+        if self.checkpoints is None:
+            return
+        try:
+            self.checkpoints.finish("failed", str(error))
+            self.db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to record failed scrape run: {e}")
+            self.db.rollback()
+    
+    @staticmethod
+    def _wrote_changes(results: List[UpsertResult]) -> bool:
+        return any(result.inserted or result.updated for result in results)
+    
+    def _publish_game_changes(self, league_id: int, results: List[UpsertResult]):
+        """Push the game rows a commit wrote to live score clients"""
+        rows = [row for result in results if result.table == "games" for row in result.changed]
+        if rows:
+            sent = publish_game_changes(league_id, rows)
+            logger.info(f"Published {sent} game updates for league {league_id}")
+    
+    def _live_score_dates(self, league_id: int) -> List[date]:
+        """Dates in the live window that still have open games"""
+        start, end = live_window()
+        return [
+            game_date for (game_date,) in self.db.query(Game.game_date).filter(
+                Game.league_id == league_id,
+                Game.status.notin_(FINAL_STATUSES),
+                Game.game_date.between(start, end)
+            ).distinct().order_by(Game.game_date)
+        ]
+    
+    def _live_game_count(self, league_id: int, score_dates: List[date]) -> int:
+        """Games on the given dates that are under way (neither final nor pending)"""
+        if not score_dates:
+            return 0
+        return self.db.query(Game.id).filter(
+            Game.league_id == league_id,
+            Game.game_date.in_(score_dates),
+            Game.status.notin_(FINAL_STATUSES + PENDING_STATUSES)
+        ).count()
+    
+    def _scrape_if_changed(self, scrape, *args, **kwargs):
+        """Run a scrape call, returning None when its page is unchanged since the last run"""
+        try:
+            with scrape_endpoint(scrape.__name__):
+                return scrape(*args, **kwargs)
+        except PageUnchanged as e:
+            logger.info(f"Skipping unchanged page: {e.url}")
+            return None
+    
+    def _scrape_many(
+        self,
+        scraper: BaseScraper,
+        scrape,
+        keys: List[str]
+    ) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+        """Run a scrape call per key on a bounded thread pool, dropping unchanged pages
+        
+        The pages are I/O bound, so overlapping their requests is what saves time; the
+        per-host token bucket still paces them. Results come back to the calling
+        thread, which does all database writes. Pages that fail are returned apart
+        so the ones that succeeded can still be stored.
+        """
+        if not keys:
+            return {}, {}
+        workers = min(scraper.worker_count(), len(keys))
+        results: Dict[str, Any] = {}
+        failures: Dict[str, Exception] = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"scrape-{scraper.platform_name}") as pool:
+            futures = {key: pool.submit(self._scrape_if_changed, scrape, key) for key in keys}
+            for key, future in futures.items():
+                try:
+                    data = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to scrape {scrape.__name__} for {key}: {e}")
+                    failures[key] = e
+                    continue
+                if data is not None:
+                    results[key] = data
+        return results, failures
+    
+    def _scrape_rosters(self, scraper: BaseScraper, league_id: int):
+        """Scrape and store team rosters, committing and checkpointing a few teams at a time"""
+        done = self.checkpoints.done_teams("rosters")
+        team_ids = {
+            source_team_id: team_id for team_id, source_team_id in self.db.query(
+                Team.id, Team.source_team_id
+            ).filter(Team.league_id == league_id, Team.source_team_id.isnot(None))
+            if team_id not in done
+        }
+        failures: Dict[str, Exception] = {}
+        for chunk in _chunks(sorted(team_ids), settings.scrape_checkpoint_teams):
+            rosters, failed = self._scrape_many(scraper, scraper.scrape_rosters, list(chunk))
+            failures.update(failed)
+            result = self._upsert_rosters({
+                team_ids[source_team_id]: roster_data for source_team_id, roster_data in rosters.items()
+            })
+            completed = [team_ids[source_team_id] for source_team_id in chunk if source_team_id not in failed]
+            self._commit_stage(scraper, league_id, "rosters", [result], completed, finished=False)
+        if failures:
+            raise StageIncomplete("rosters", failures)
+        self._commit_stage(scraper, league_id, "rosters", [])
+    
+    def _scrape_player_stats(self, scraper: BaseScraper, league_id: int):
+        """Scrape the stats page of every rostered player and bulk write their season rows
+        
+        Players are taken a few teams at a time; each batch commits with a checkpoint for
+        the teams whose pages all succeeded.
+        """
+        done = self.checkpoints.done_teams("player_stats")
+        players = {
+            source_player_id: (player_id, team_id)
+            for player_id, team_id, source_player_id in self.db.query(
+                Player.id, Player.team_id, Player.source_player_id
+            ).join(Team, Team.id == Player.team_id).filter(
+                Team.league_id == league_id,
+                Player.source_player_id.isnot(None)
+            )
+            if team_id not in done
+        }
+        team_players: Dict[int, List[str]] = {}
+        for source_player_id, (_, team_id) in players.items():
+            team_players.setdefault(team_id, []).append(source_player_id)
+        upserter = self.upserter or BulkUpserter(self.db, teams=self.teams)
+        
+        failures: Dict[str, Exception] = {}
+        for chunk in _chunks(sorted(team_players), settings.scrape_checkpoint_teams):
+            keys = [source_player_id for team_id in chunk for source_player_id in team_players[team_id]]
+            stats, failed = self._scrape_many(scraper, scraper.scrape_player_stats, keys)
+            failures.update(failed)
+            
+            records = []
+            for source_player_id, data in stats.items():
+                if not data:
+                    continue
+                player_id, team_id = players[source_player_id]
+                record = {name: data[name] for name in PLAYER_STATISTICS_FIELDS if name in data}
+                record["player_id"] = player_id
+                record["season"] = data.get('season', DEFAULT_SEASON)
+                records.append(record)
+                # Team shot totals are rolled up from player rows
+                teams = self.touched.setdefault(record["season"], [])
+                if teams is not None and team_id not in teams:
+                    teams.append(team_id)
+            
+            result = upserter.upsert_player_statistics(records)
+            failed_teams = {players[source_player_id][1] for source_player_id in failed}
+            completed = [team_id for team_id in chunk if team_id not in failed_teams]
+            self._commit_stage(scraper, league_id, "player_stats", [result], completed, finished=False)
+        if failures:
+            raise StageIncomplete("player_stats", failures)
+        self._commit_stage(scraper, league_id, "player_stats", [])
+    
+    def _open_score_dates(self, league_id: int) -> Optional[List[date]]:
+        """Dates whose scores can still change, or None when the league needs a full scrape
+        
+        The watermark is the oldest game up to today that is not yet final; every date
+        from there with an open game is refetched, plus a short look-back window.
+        """
+        if not self.db.query(Game.id).filter(Game.league_id == league_id).first():
+            return None
+        
+        today = date.today()
+        open_dates = {
+            game_date for (game_date,) in self.db.query(Game.game_date).filter(
+                Game.league_id == league_id,
+                Game.status.notin_(FINAL_STATUSES),
+                Game.game_date <= today
+            ).distinct()
+        }
+        if open_dates:
+            logger.info(f"League {league_id} score watermark: {min(open_dates)}")
+        lookback = {today - timedelta(days=days) for days in range(settings.incremental_lookback_days + 1)}
+        return sorted(open_dates | lookback)
+    
+    def _scrape_scores_for_dates(
+        self,
+        scraper: BaseScraper,
+        league_id: int,
+        league_url: str,
+        score_dates: List[date]
+    ) -> Optional[List[Dict]]:
+        """Scrape scores date by date, dropping games already stored as final"""
+        scores_data = []
+        changed = False
+        for score_date in score_dates:
+            day_data = self._scrape_if_changed(scraper.scrape_scores, league_url, date=score_date.isoformat())
+            if day_data is not None:
+                scores_data.extend(day_data)
+                changed = True
+        if not changed:
+            return None
+        return self._drop_final_games(league_id, score_dates, scores_data)
+    
+    def _drop_final_games(self, league_id: int, score_dates: List[date], scores_data: List[Dict]) -> List[Dict]:
+        """Scraped games minus those already stored as final"""
+        final_ids = {
+            source_game_id for (source_game_id,) in self.db.query(Game.source_game_id).filter(
+                Game.league_id == league_id,
+                Game.status.in_(FINAL_STATUSES),
+                Game.game_date.in_(score_dates),
+                Game.source_game_id.isnot(None)
+            )
+        }
+        return [
+            game_data for game_data in scores_data
+            if game_data.get('source_game_id') not in final_ids
+        ]
+    
+    def _scrape_scores(
+        self,
+        scraper: BaseScraper,
+        league_id: int,
+        league_url: str,
+        incremental: bool,
+        compute_standings: bool
+    ):
+        """Scrape and store scores, recomputing the touched seasons' standings when they are computed"""
+        results = []
+        score_dates = self._open_score_dates(league_id) if incremental else None
+        if score_dates is None:
+            scores_data = self._scrape_if_changed(scraper.scrape_scores, league_url)
+        else:
+            scores_data = self._scrape_scores_for_dates(scraper, league_id, league_url, score_dates)
+        if scores_data is not None:
+            games_result = self._upsert_games(league_id, scores_data)
+            results.append(games_result)
+            self.touched = self._touched_teams(league_id, games_result)
+            if compute_standings:
+                engine = StandingsEngine(self.db, self.upserter)
+                results.extend(engine.recompute_seasons(league_id, self.touched))
+        self._commit_stage(scraper, league_id, "scores", results)
+    
+    def _scrape_league_info(self, scraper: BaseScraper, platform_name: str, league_url: str) -> League:
+        """Scrape and store league info, reusing the stored league when its page is unchanged"""
+        if self.checkpoints.done("league"):
+            return self.db.get(League, self.checkpoints.run.league_id)
+        
+        results = []
+        league = None
+        league_data = self._scrape_if_changed(scraper.scrape_league_info, league_url)
+        if league_data is None:
+            league = self.db.query(League).filter_by(source_url=league_url).first()
+            if league is None:
+                # Cached page but no stored league (e.g. database reset): fetch it fresh
+                scraper.force_refresh = True
+                try:
+                    with scrape_endpoint(scraper.scrape_league_info.__name__):
+                        league_data = scraper.scrape_league_info(league_url)
+                finally:
+                    scraper.force_refresh = False
+        if league is None:
+            league, result = self._upsert_league(league_data, platform_name)
+            results.append(result)
+        self.checkpoints.run.league_id = league.id
+        self._commit_stage(scraper, league.id, "league", results)
+        return league
+    
+    def _upsert_league(self, data: Dict, platform_name: str) -> Tuple[League, UpsertResult]:
         """Create or update league"""
+        result = UpsertResult("leagues")
         league = self.db.query(League).filter_by(slug=data.get('slug')).first()
+        digest = fingerprint(data, LEAGUE_FIELDS)
         
         if not league:
             league = League(
@@ -74,34 +508,54 @@ class ScraperManager:
                 source_url=data.get('source_url'),
                 source_platform=platform_name,
                 logo_url=data.get('logo_url'),
+                fingerprint=digest,
                 active=True
             )
             self.db.add(league)
+            self.db.flush()
+            self._record_insert(result, league, LEAGUE_FIELDS)
         else:
-            league.name = data.get('name', league.name)
-            league.description = data.get('description', league.description)
-            league.source_url = data.get('source_url', league.source_url)
-            league.logo_url = data.get('logo_url', league.logo_url)
-        
-        self.db.flush()
-        return league
+            self._apply_changes(result, league, data, LEAGUE_FIELDS, digest)
+        return league, result
     
-    def _upsert_standings(self, league_id: int, standings_data: List[Dict]):
+    def _upsert_standings(self, league_id: int, standings_data: List[Dict]) -> UpsertResult:
         """Create or update standings"""
+        if self.upserter:
+            return self.upserter.upsert_standings(league_id, standings_data)
+        
+        start = time.perf_counter()
+        result = UpsertResult("standings")
+        team_ids = self.teams.resolve(league_id, [data.get('team_name') for data in standings_data])
+        self.teams.assign_source_ids(league_id, {
+            data['team_name']: data['source_team_id'] for data in standings_data if data.get('source_team_id')
+        })
+        # One query for the rows this page can match rather than one per standing
+        seasons = {data.get('season', DEFAULT_SEASON) for data in standings_data}
+        existing = {
+            (standing.team_id, standing.season): standing
+            for standing in self.db.query(Standing).filter(
+                Standing.league_id == league_id,
+                Standing.season.in_(seasons)
+            )
+        }
+        new_standings = []
         for standing_data in standings_data:
-            team = self._find_or_create_team(league_id, standing_data.get('team_name'))
+            team_id = team_ids[standing_data.get('team_name')]
+            season = standing_data.get('season', DEFAULT_SEASON)
+            record = {name: standing_data[name] for name in STANDING_FIELDS if name in standing_data}
+            if "win_percentage" not in record and "wins" in record:
+                record["win_percentage"] = win_percentage(
+                    record["wins"], record.get("losses", 0), record.get("ties", 0)
+                )
+            digest = fingerprint(record, STANDING_FIELDS)
             
-            standing = self.db.query(Standing).filter_by(
-                league_id=league_id,
-                team_id=team.id,
-                season=standing_data.get('season', '2024')
-            ).first()
+            standing = existing.get((team_id, season))
             
             if not standing:
                 standing = Standing(
                     league_id=league_id,
-                    team_id=team.id,
-                    season=standing_data.get('season', '2024'),
+                    team_id=team_id,
+                    season=season,
                     rank=standing_data.get('rank', 0),
                     wins=standing_data.get('wins', 0),
                     losses=standing_data.get('losses', 0),
@@ -110,52 +564,143 @@ class ScraperManager:
                     goals_for=standing_data.get('goals_for', 0),
                     goals_against=standing_data.get('goals_against', 0),
                     goal_difference=standing_data.get('goal_difference', 0),
-                    games_played=standing_data.get('games_played', 0)
+                    win_percentage=record.get('win_percentage', 0.0),
+                    games_played=standing_data.get('games_played', 0),
+                    fingerprint=digest
                 )
                 self.db.add(standing)
+                existing[(team_id, season)] = standing
+                new_standings.append(standing)
             else:
-                standing.rank = standing_data.get('rank', standing.rank)
-                standing.wins = standing_data.get('wins', standing.wins)
-                standing.losses = standing_data.get('losses', standing.losses)
-                standing.points = standing_data.get('points', standing.points)
+                self._apply_changes(result, standing, record, STANDING_FIELDS, digest)
+        self.db.flush()
+        for standing in new_standings:
+            self._record_insert(result, standing, STANDING_FIELDS)
+        observe_upsert(result, time.perf_counter() - start)
+        return result
+    
+    def _touched_teams(self, league_id: int, games_result: UpsertResult) -> Dict[str, Optional[List[int]]]:
+        """Seasons and teams whose games were written, for standings and statistics rollups"""
+        if not games_result.changed:
+            return {}
+        engine = StandingsEngine(self.db, self.upserter)
+        touched = engine.touched_teams(league_id, [game["id"] for game in games_result.changed])
+        return {
+            season: None if team_ids is None else sorted(team_ids)
+            for season, team_ids in touched.items()
+        }
     
-    def _upsert_games(self, league_id: int, games_data: List[Dict]):
+    def _upsert_games(self, league_id: int, games_data: List[Dict]) -> UpsertResult:
         """Create or update games"""
+        if self.upserter:
+            return self.upserter.upsert_games(league_id, games_data)
+        
+        start = time.perf_counter()
+        result = UpsertResult("games")
+        team_ids = self.teams.resolve(league_id, [
+            name for data in games_data for name in (data.get('home_team'), data.get('away_team'))
+        ])
+        self.teams.assign_source_ids(league_id, game_team_source_ids(games_data))
+        existing = self._existing_games(league_id, games_data)
+        new_games = []
         for game_data in games_data:
-            home_team = self._find_or_create_team(league_id, game_data.get('home_team'))
-            away_team = self._find_or_create_team(league_id, game_data.get('away_team'))
+            home_team_id = team_ids[game_data.get('home_team')]
+            away_team_id = team_ids[game_data.get('away_team')]
+            record = {name: game_data[name] for name in GAME_FIELDS if name in game_data}
+            record.update(home_team_id=home_team_id, away_team_id=away_team_id)
+            digest = fingerprint(record, GAME_FIELDS)
+            key = self._game_key(
+                game_data.get('source_game_id'), game_data.get('game_date'), home_team_id, away_team_id
+            )
             
-            game = self.db.query(Game).filter_by(
-                league_id=league_id,
-                source_game_id=game_data.get('source_game_id')
-            ).first()
+            game = existing.get(key)
             
             if not game:
                 game = Game(
                     league_id=league_id,
-                    home_team_id=home_team.id,
-                    away_team_id=away_team.id,
+                    home_team_id=home_team_id,
+                    away_team_id=away_team_id,
                     game_date=game_data.get('game_date'),
                     game_time=game_data.get('game_time'),
                     status=game_data.get('status', 'scheduled'),
                     home_score=game_data.get('home_score'),
                     away_score=game_data.get('away_score'),
                     venue=game_data.get('venue'),
-                    source_game_id=game_data.get('source_game_id')
+                    source_game_id=game_data.get('source_game_id'),
+                    fingerprint=digest
                 )
                 self.db.add(game)
+                existing[key] = game
+                new_games.append(game)
             else:
-                game.status = game_data.get('status', game.status)
-                game.home_score = game_data.get('home_score', game.home_score)
-                game.away_score = game_data.get('away_score', game.away_score)
+                self._apply_changes(result, game, record, GAME_FIELDS, digest)
+        # New games need their ids for the change log and live score events
+        self.db.flush()
+        for game in new_games:
+            self._record_insert(result, game, GAME_FIELDS)
+        observe_upsert(result, time.perf_counter() - start)
+        return result
+    
+    def _existing_games(self, league_id: int, games_data: List[Dict]) -> Dict[Tuple, Game]:
+        """Load the league's games a page can match, a chunk of keys per query"""
+        source_ids = sorted({
+            data['source_game_id'] for data in games_data if data.get('source_game_id') is not None
+        })
+        fixture_dates = sorted({
+            data['game_date'] for data in games_data
+            if data.get('source_game_id') is None and data.get('game_date') is not None
+        })
+        batch_size = settings.bulk_upsert_batch_size
+        conditions = [Game.source_game_id.in_(chunk) for chunk in _chunks(source_ids, batch_size)]
+        conditions += [
+            and_(Game.source_game_id.is_(None), Game.game_date.in_(chunk))
+            for chunk in _chunks(fixture_dates, batch_size)
+        ]
+        existing = {}
+        for condition in conditions:
+            for game in self.db.query(Game).filter(Game.league_id == league_id, condition):
+                key = self._game_key(game.source_game_id, game.game_date, game.home_team_id, game.away_team_id)
+                existing[key] = game
+        return existing
+    
+    @staticmethod
+    def _game_key(source_game_id, game_date, home_team_id: int, away_team_id: int) -> Tuple:
+        """Games match on their source id, or on date and teams for fixtures without one"""
+        if source_game_id is not None:
+            return ("source", source_game_id)
+        return ("fixture", game_date, home_team_id, away_team_id)
+    
+    def _upsert_rosters(self, rosters: Dict[int, List[Dict]]) -> UpsertResult:
+        """Create or update the rosters of several teams"""
+        if self.upserter:
+            return self.upserter.upsert_rosters(rosters)
+        
+        start = time.perf_counter()
+        result = UpsertResult("players")
+        # Every listed team's players in one query per chunk of teams, not one per player
+        existing: Dict[Tuple, Player] = {}
+        for chunk in _chunks(list(rosters), settings.bulk_upsert_batch_size):
+            for player in self.db.query(Player).filter(Player.team_id.in_(chunk)):
+                existing[self._player_key(player.team_id, player.source_player_id, player.full_name)] = player
+        for team_id, roster_data in rosters.items():
+            roster_result = self._upsert_roster(team_id, roster_data, existing)
+            result.inserted += roster_result.inserted
+            result.updated += roster_result.updated
+            result.unchanged += roster_result.unchanged
+            result.changed.extend(roster_result.changed)
+            result.inserted_ids.update(roster_result.inserted_ids)
+        observe_upsert(result, time.perf_counter() - start)
+        return result
     
-    def _upsert_roster(self, team_id: int, roster_data: List[Dict]):
-        """Create or update team roster"""
+    def _upsert_roster(self, team_id: int, roster_data: List[Dict], existing: Dict[Tuple, Player]) -> UpsertResult:
+        """Create or update team roster against its preloaded players"""
+        result = UpsertResult("players")
+        new_players = []
         for player_data in roster_data:
-            player = self.db.query(Player).filter_by(
-                team_id=team_id,
-                source_player_id=player_data.get('source_player_id')
-            ).first()
+            record = {name: player_data[name] for name in PLAYER_FIELDS if name in player_data}
+            digest = fingerprint(record, PLAYER_FIELDS)
+            key = self._player_key(team_id, player_data.get('source_player_id'), player_data.get('full_name', ''))
+            player = existing.get(key)
             
             if not player:
                 player = Player(
@@ -167,29 +712,51 @@ class ScraperManager:
                     position=player_data.get('position'),
                     photo_url=player_data.get('photo_url'),
                     source_player_id=player_data.get('source_player_id'),
+                    fingerprint=digest,
                     active=True
                 )
                 self.db.add(player)
+                existing[key] = player
+                new_players.append(player)
+            else:
+                self._apply_changes(result, player, record, PLAYER_FIELDS, digest)
+        # The session does not autoflush, and player stats look the new players up next
+        self.db.flush()
+        for player in new_players:
+            self._record_insert(result, player, PLAYER_FIELDS)
+        return result
     
-    def _find_or_create_team(self, league_id: int, team_name: str) -> Team:
-        """Find or create a team"""
-        if not team_name:
-            raise ValueError("Team name is required")
-        
-        slug = team_name.lower().replace(' ', '-')
-        team = self.db.query(Team).filter_by(league_id=league_id, slug=slug).first()
-        
-        if not team:
-            team = Team(
-                league_id=league_id,
-                name=team_name,
-                slug=slug,
-                active=True
-            )
-            self.db.add(team)
-            self.db.flush()
-        
-        return team
+    @staticmethod
+    def _player_key(team_id: int, source_player_id, full_name: str) -> Tuple:
+        if source_player_id is not None:
+            return (team_id, "source", source_player_id)
+        return (team_id, "name", full_name)
+    
+    @staticmethod
+    def _apply_changes(result: UpsertResult, row, record: Dict, fields, digest: str):
+        """Per-row update: skip a row whose fingerprint matches, else assign only the fields that changed"""
+        if row.fingerprint == digest:
+            result.unchanged += 1
+            return
+        changes = {
+            name: record[name] for name in fields
+            if name in record and getattr(row, name) != record[name]
+        }
+        if not changes:
+            # Same values under another fingerprint, as the ON CONFLICT path: leave the row alone
+            result.unchanged += 1
+            return
+        for name, value in changes.items():
+            setattr(row, name, value)
+        row.fingerprint = digest
+        result.updated += 1
+        result.changed.append({"id": row.id, **changes})
+    
+    @staticmethod
+    def _record_insert(result: UpsertResult, row, fields):
+        result.inserted += 1
+        result.inserted_ids.add(row.id)
+        result.changed.append({"id": row.id, **{name: getattr(row, name) for name in fields}})
     
     def close(self):
         """Close database connection"""
@@ -0,0 +1,226 @@
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import and_, case, func, select, union_all
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.scrapers.bulk_upsert import BulkUpserter, UpsertResult, STANDING_FIELDS, win_percentage, _chunks
+from app.models.game import Game
+from app.models.standing import Standing
+
+logger = logging.getLogger(__name__)
+
+# Statuses whose score counts towards the table ("cancelled" is final but has no result)
+SCORED_STATUSES = ("final", "completed", "forfeit")
+
+
+def season_bounds(season: str) -> Tuple[date, date]:
+    """First and last day of a season named "YYYY" (calendar year) or "YYYY-YY" (split year)"""
+    start, _, end = season.partition("-")
+    year = int(start)
+    if not end:
+        return date(year, 1, 1), date(year, 12, 31)
+    month = settings.season_start_month
+    return date(year, month, 1), date(year + 1, month, 1) - timedelta(days=1)
+
+
+def season_name(game_date: date) -> str:
+    """Name of the season a game date falls in when the league has no stored seasons"""
+    month = settings.season_start_month
+    if month == 1:
+        return str(game_date.year)
+    year = game_date.year if game_date.month >= month else game_date.year - 1
+    return f"{year}-{(year + 1) % 100:02d}"
+
+
+def _empty_record() -> Dict[str, Any]:
+    record = {name: 0 for name in STANDING_FIELDS}
+    record["win_percentage"] = 0.0
+    return record
+
+
+def _rank_key(item: Tuple[int, Dict[str, Any]]) -> Tuple:
+    """Points, then win %, goal difference and goals for; team id keeps ties stable"""
+    team_id, record = item
+    return (
+        -record["points"], -record["win_percentage"], -record["goal_difference"],
+        -record["goals_for"], team_id,
+    )
+
+
+class StandingsEngine:
+    """Builds standings from final game results instead of a scraped standings page
+    
+    Each team's record is aggregated in the database from one GROUP BY over the
+    home and away side of every game, so a league recompute is a single query plus
+    a batched write of the rows that changed. When games go final only their teams
+    are re-aggregated; the rest of the table is read back to rerank the league.
+    """
+    
+    def __init__(self, db: Session, upserter: Optional[BulkUpserter] = None):
+        self.db = db
+        self.upserter = upserter or BulkUpserter(db)
+    
+    def aggregate(
+        self,
+        league_id: int,
+        season: str,
+        team_ids: Optional[Iterable[int]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """Unranked standing records per team for a season, optionally for some teams only"""
+        start, end = season_bounds(season)
+        window = (Game.league_id == league_id, Game.game_date.between(start, end))
+        home = select(
+            Game.home_team_id.label("team_id"),
+            Game.home_score.label("scored"),
+            Game.away_score.label("conceded"),
+            Game.status.label("status"),
+        ).where(*window)
+        away = select(
+            Game.away_team_id, Game.away_score, Game.home_score, Game.status
+        ).where(*window)
+        if team_ids is not None:
+            team_ids = list(team_ids)
+            home = home.where(Game.home_team_id.in_(team_ids))
+            away = away.where(Game.away_team_id.in_(team_ids))
+        sides = union_all(home, away).subquery()
+        
+        played = and_(
+            sides.c.status.in_(SCORED_STATUSES),
+            sides.c.scored.isnot(None),
+            sides.c.conceded.isnot(None),
+        )
+        
+        def tally(condition):
+            return func.coalesce(func.sum(case((and_(played, condition), 1), else_=0)), 0)
+        
+        def goals(column):
+            return func.coalesce(func.sum(case((played, column), else_=0)), 0)
+        
+        statement = select(
+            sides.c.team_id,
+            tally(sides.c.scored > sides.c.conceded).label("wins"),
+            tally(sides.c.scored < sides.c.conceded).label("losses"),
+            tally(sides.c.scored == sides.c.conceded).label("ties"),
+            goals(sides.c.scored).label("goals_for"),
+            goals(sides.c.conceded).label("goals_against"),
+        ).group_by(sides.c.team_id)
+        
+        records = {}
+        for row in self.db.execute(statement).mappings():
+            wins, losses, ties = int(row["wins"]), int(row["losses"]), int(row["ties"])
+            goals_for, goals_against = int(row["goals_for"]), int(row["goals_against"])
+            records[row["team_id"]] = {
+                "wins": wins,
+                "losses": losses,
+                "ties": ties,
+                "games_played": wins + losses + ties,
+                "points": (
+                    wins * settings.standings_points_win
+                    + ties * settings.standings_points_tie
+                    + losses * settings.standings_points_loss
+                ),
+                "goals_for": goals_for,
+                "goals_against": goals_against,
+                "goal_difference": goals_for - goals_against,
+                "win_percentage": win_percentage(wins, losses, ties),
+            }
+        return records
+    
+    def recompute(
+        self,
+        league_id: int,
+        season: str,
+        team_ids: Optional[Iterable[int]] = None
+    ) -> UpsertResult:
+        """Recompute a season's standings (or just some teams') and rerank the league"""
+        stored: Dict[int, Dict[str, Any]] = {
+            row["team_id"]: dict(row) for row in self.db.execute(
+                select(
+                    Standing.team_id, *[getattr(Standing, name) for name in STANDING_FIELDS]
+                ).where(Standing.league_id == league_id, Standing.season == season)
+            ).mappings()
+        }
+        if not stored:
+            team_ids = None
+        affected = None if team_ids is None else set(team_ids)
+        
+        table = dict(stored)
+        for team_id in stored:
+            # Teams left without counted games fall back to an empty record
+            if affected is None or team_id in affected:
+                table[team_id] = _empty_record()
+        table.update(self.aggregate(league_id, season, affected))
+        
+        records = []
+        for rank, (team_id, record) in enumerate(sorted(table.items(), key=_rank_key), start=1):
+            records.append({
+                **record,
+                "rank": rank,
+                "team_id": team_id,
+                "season": season,
+            })
+        return self.upserter.upsert_standing_records(league_id, records)
+    
+    def refresh(self, league_id: int, game_ids: Optional[Iterable[int]] = None) -> List[UpsertResult]:
+        """Bring standings up to date after the given games changed (None means all games)"""
+        return self.recompute_seasons(league_id, self.touched_teams(league_id, game_ids))
+    
+    def recompute_seasons(
+        self,
+        league_id: int,
+        touched: Dict[str, Optional[Iterable[int]]]
+    ) -> List[UpsertResult]:
+        """Recompute each season for its touched teams (None meaning all of them)"""
+        results = []
+        for season, team_ids in sorted(touched.items()):
+            scope = "all" if team_ids is None else len(set(team_ids))
+            logger.info(f"Recomputing {season} standings of league {league_id} for {scope} teams")
+            results.append(self.recompute(league_id, season, team_ids))
+        return results
+    
+    def touched_teams(
+        self,
+        league_id: int,
+        game_ids: Optional[Iterable[int]] = None
+    ) -> Dict[str, Optional[Set[int]]]:
+        """Seasons the given games fall in, each with the teams that played them
+        
+        Without game ids every season with games is returned with None, meaning
+        all of its teams.
+        """
+        if game_ids is None:
+            dates = self.db.scalars(
+                select(Game.game_date).where(Game.league_id == league_id).distinct()
+            ).all()
+            return {season: None for season in set(self.seasons_for_dates(league_id, dates).values())}
+        
+        games = []
+        for chunk in _chunks(sorted(set(game_ids)), self.upserter.batch_size):
+            games.extend(self.db.execute(
+                select(Game.game_date, Game.home_team_id, Game.away_team_id).where(Game.id.in_(chunk))
+            ).all())
+        seasons = self.seasons_for_dates(league_id, {game_date for game_date, _, _ in games})
+        touched: Dict[str, Optional[Set[int]]] = {}
+        for game_date, home_team_id, away_team_id in games:
+            touched.setdefault(seasons[game_date], set()).update((home_team_id, away_team_id))
+        return touched
+    
+    def seasons_for_dates(self, league_id: int, dates: Iterable[date]) -> Dict[date, str]:
+        """Map game dates to the league's stored seasons, naming new ones from the date"""
+        known = []
+        for season in self.db.scalars(
+            select(Standing.season).where(Standing.league_id == league_id).distinct()
+        ):
+            try:
+                known.append((season, season_bounds(season)))
+            except ValueError:
+                logger.warning(f"Ignoring unparseable season {season!r} in league {league_id}")
+        
+        return {
+            game_date: next(
+                (season for season, (start, end) in known if start <= game_date <= end),
+                season_name(game_date)
+            )
+            for game_date in dates
+        }
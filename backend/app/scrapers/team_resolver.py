@@ -0,0 +1,205 @@
+import re
+import difflib
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.team import Team, TeamAlias
+
+logger = logging.getLogger(__name__)
+
+
+def slugify_team_name(team_name: str) -> str:
+    """Derive the team slug used as its natural key within a league"""
+    return team_name.lower().replace(' ', '-')
+
+
+def match_key(name: str) -> str:
+    """Spelling-insensitive form of a team name: lowercase letters and digits only"""
+    return re.sub(r"[^a-z0-9]+", "", name.lower())
+
+
+def game_team_source_ids(games_data: Iterable[Dict]) -> Dict[str, str]:
+    """Platform team ids carried by scraped games, keyed by team name"""
+    source_ids = {}
+    for data in games_data:
+        for side in ("home", "away"):
+            if data.get(f"{side}_source_team_id"):
+                source_ids[data[f"{side}_team"]] = data[f"{side}_source_team_id"]
+    return source_ids
+
+
+class LeagueTeams:
+    """Every way a league's teams are known: slugs, names, abbreviations and aliases"""
+    
+    def __init__(self):
+        self.by_slug: Dict[str, int] = {}
+        self.by_key: Dict[str, int] = {}
+        self.names: Dict[str, int] = {}
+        self.source_ids: Dict[int, Optional[str]] = {}
+    
+    def add(self, team_id: int, slug: str, key: str):
+        self.by_slug[slug] = team_id
+        self.by_key.setdefault(key, team_id)
+    
+    def lookup(self, team_name: str) -> Optional[int]:
+        team_id = self.names.get(team_name)
+        if team_id is None:
+            team_id = self.by_slug.get(slugify_team_name(team_name))
+        if team_id is None:
+            team_id = self.by_key.get(match_key(team_name))
+        return team_id
+
+
+class TeamResolver:
+    """Identity map from scraped team names to team ids, scoped to one scrape
+    
+    A league's teams and aliases are loaded with one query each the first time the
+    league is seen; after that a name costs a dict lookup. Names that match no slug,
+    alias or abbreviation are created in one batch. With TEAM_MATCH_CUTOFF below 1
+    they are first fuzzy-matched against the known names; a match holds for this
+    scrape only and is logged as an alias to add, never stored. Aliases are added with
+    scripts/add_team_alias.py and matched by match_key, like names.
+    """
+    
+    def __init__(self, db: Session, batch_size: Optional[int] = None, cutoff: Optional[float] = None):
+        self.db = db
+        self.batch_size = batch_size or settings.bulk_upsert_batch_size
+        self.cutoff = settings.team_match_cutoff if cutoff is None else cutoff
+        self.on_conflict = settings.bulk_upsert_on_conflict and db.get_bind().dialect.name == "postgresql"
+        self._leagues: Dict[int, LeagueTeams] = {}
+    
+    def league(self, league_id: int) -> LeagueTeams:
+        """Known names of a league's teams, loaded on first use"""
+        teams = self._leagues.get(league_id)
+        if teams is None:
+            teams = LeagueTeams()
+            for team_id, name, slug, abbreviation, source_team_id in self.db.execute(
+                select(
+                    Team.id, Team.name, Team.slug, Team.abbreviation, Team.source_team_id
+                ).where(Team.league_id == league_id)
+            ):
+                teams.add(team_id, slug, match_key(name))
+                teams.source_ids[team_id] = source_team_id
+                if abbreviation:
+                    teams.by_key.setdefault(match_key(abbreviation), team_id)
+            for team_id, alias in self.db.execute(
+                select(TeamAlias.team_id, TeamAlias.alias).where(TeamAlias.league_id == league_id)
+            ):
+                teams.by_key.setdefault(match_key(alias), team_id)
+            self._leagues[league_id] = teams
+        return teams
+    
+    def resolve(self, league_id: int, team_names: Iterable[str]) -> Dict[str, int]:
+        """Map team names to ids, matching aliases and near spellings and creating the rest"""
+        teams = self.league(league_id)
+        unresolved: List[str] = []
+        for team_name in team_names:
+            if not team_name:
+                raise ValueError("Team name is required")
+            if team_name in teams.names:
+                continue
+            team_id = teams.lookup(team_name)
+            if team_id is None:
+                unresolved.append(team_name)
+            else:
+                teams.names[team_name] = team_id
+        
+        if unresolved:
+            self._resolve_new(league_id, teams, list(dict.fromkeys(unresolved)))
+        return {team_name: teams.names[team_name] for team_name in team_names}
+    
+    def assign_source_ids(self, league_id: int, source_ids: Dict[str, str]) -> int:
+        """Record platform team ids (keyed by team name) so rosters can be scraped per team"""
+        teams = self.league(league_id)
+        team_ids = self.resolve(league_id, source_ids)
+        changed = {}
+        for team_name, source_team_id in source_ids.items():
+            team_id = team_ids[team_name]
+            if source_team_id and teams.source_ids.get(team_id) != source_team_id:
+                changed[team_id] = source_team_id
+        if changed:
+            self.db.execute(update(Team), [
+                {"id": team_id, "source_team_id": source_team_id}
+                for team_id, source_team_id in changed.items()
+            ])
+            teams.source_ids.update(changed)
+        return len(changed)
+    
+    def _resolve_new(self, league_id: int, teams: LeagueTeams, team_names: List[str]):
+        # New teams by slug; spellings that differ only in punctuation share one
+        missing: Dict[str, str] = {}
+        key_slugs: Dict[str, str] = {}
+        name_slugs: Dict[str, str] = {}
+        for team_name in team_names:
+            key = match_key(team_name)
+            # An earlier spelling in this batch may already have matched the same key
+            team_id = teams.by_key.get(key)
+            if team_id is None:
+                match = self._fuzzy_match(teams, key)
+                if match is not None:
+                    matched_key, team_id = match
+                    logger.warning(
+                        f"Fuzzy-matched team name {team_name!r} to team {team_id} ({matched_key!r}) in "
+                        f"league {league_id} for this scrape; if they are the same team, add the alias with "
+                        f"scripts/add_team_alias.py {league_id} {team_id} {team_name!r}"
+                    )
+            if team_id is not None:
+                teams.names[team_name] = team_id
+                teams.by_key[key] = team_id
+                continue
+            slug = key_slugs.setdefault(key, slugify_team_name(team_name))
+            missing.setdefault(slug, team_name)
+            name_slugs[team_name] = slug
+        
+        if missing:
+            rows = [
+                {"league_id": league_id, "name": team_name, "slug": slug}
+                for slug, team_name in missing.items()
+            ]
+            self._insert_teams(league_id, teams, rows)
+            logger.info(f"Created {len(rows)} teams for league {league_id}")
+            for team_name in team_names:
+                if team_name not in teams.names:
+                    teams.names[team_name] = teams.by_slug[name_slugs[team_name]]
+    
+    def _fuzzy_match(self, teams: LeagueTeams, key: str) -> Optional[Tuple[str, int]]:
+        """Known key and team closest to key, if close enough, unambiguous and with the same numbers
+        
+        Names that differ in their digits ("U12" and "U13", "2nd" and "3rd") are
+        different teams however similar the rest of the name is.
+        """
+        if not key or self.cutoff >= 1:
+            return None
+        numbers = re.findall(r"\d+", key)
+        known = [name for name in teams.by_key if re.findall(r"\d+", name) == numbers]
+        matches = difflib.get_close_matches(key, known, n=2, cutoff=self.cutoff)
+        candidates = {teams.by_key[match] for match in matches}
+        if len(candidates) != 1:
+            return None
+        return matches[0], candidates.pop()
+    
+    def _insert_teams(self, league_id: int, teams: LeagueTeams, rows: List[Dict]):
+        for start in range(0, len(rows), self.batch_size):
+            chunk = rows[start:start + self.batch_size]
+            if self.on_conflict:
+                # Another scrape of the league may be creating the same teams
+                statement = pg_insert(Team).values(chunk).on_conflict_do_nothing(
+                    index_elements=["league_id", "slug"]
+                ).returning(Team.id, Team.slug)
+                created = {slug: team_id for team_id, slug in self.db.execute(statement)}
+                raced = [row["slug"] for row in chunk if row["slug"] not in created]
+                if raced:
+                    created.update((slug, team_id) for team_id, slug in self.db.execute(
+                        select(Team.id, Team.slug).where(Team.league_id == league_id, Team.slug.in_(raced))
+                    ))
+            else:
+                ids = self.db.scalars(
+                    insert(Team).returning(Team.id, sort_by_parameter_order=True), chunk
+                )
+                created = {row["slug"]: team_id for row, team_id in zip(chunk, ids)}
+            
+            for row in chunk:
+                teams.add(created[row["slug"]], row["slug"], match_key(row["name"]))
@@ -1,72 +1,261 @@
 import logging
-from celery import Task
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional
+from celery import Task, chord, group
+from celery.exceptions import Retry
 from app.celery_app import celery_app
+from app.config import settings
 from app.scrapers.scraper_manager import ScraperManager
+from app.scrapers.registry import create_scraper
+from app.scrapers.live import LivePollSchedule, live_window
+from app.tasks.statistics_tasks import rollup_league_statistics
 from app.models.database import SessionLocal
 from app.models.league import League
+from app.models.game import Game, FINAL_STATUSES
+from app.models.scrape_log import ScrapeChange, ScrapeCheckpoint, ScrapeRun
+from app.utils.redis_client import get_redis
+from app.utils.redis_semaphore import RedisSemaphore
 
 logger = logging.getLogger(__name__)
 
 
+def platform_slots(platform_name: str) -> RedisSemaphore:
+    """Semaphore capping concurrent league scrapes against one platform"""
+    limit = settings.scrape_platform_limits.get(platform_name, settings.scrape_platform_concurrency)
+    return RedisSemaphore(
+        get_redis(),
+        f"scrape:{platform_name}",
+        limit,
+        settings.scrape_slot_lease_seconds
+    )
+
+
+@lru_cache(maxsize=None)
+def live_schedule() -> LivePollSchedule:
+    return LivePollSchedule(get_redis())
+
+
 @celery_app.task(bind=True, name="app.tasks.scraper_tasks.scrape_all_leagues")
-def scrape_all_leagues(self: Task):
-    """Scrape all active leagues"""
+def scrape_all_leagues(self: Task, incremental: bool = False):
+    """Fan out one scrape_single_league task per active league"""
     db = SessionLocal()
-    manager = ScraperManager()
     
     try:
         active_leagues = db.query(League).filter(League.active == True).all()
         logger.info(f"Starting scrape for {len(active_leagues)} active leagues")
         
+        subtasks = []
         for league in active_leagues:
             if not league.source_url or not league.source_platform:
                 logger.warning(f"League {league.name} missing source_url or source_platform")
                 continue
-            
-            try:
-                success = manager.scrape_league(league.source_platform, league.source_url)
-                if success:
-                    logger.info(f"Successfully scraped league: {league.name}")
-                else:
-                    logger.error(f"Failed to scrape league: {league.name}")
-            except Exception as e:
-                logger.error(f"Error scraping league {league.name}: {e}")
+            subtasks.append(scrape_single_league.s(league.id, incremental=incremental))
+        
+        if subtasks:
+            chord(group(subtasks))(summarize_league_scrapes.s())
         
-        return {"status": "completed", "leagues_processed": len(active_leagues)}
+        return {"status": "dispatched", "leagues_dispatched": len(subtasks)}
     except Exception as e:
         logger.error(f"Error in scrape_all_leagues task: {e}")
         raise
     finally:
-        manager.close()
         db.close()
 
 
+@celery_app.task(name="app.tasks.scraper_tasks.summarize_league_scrapes")
+def summarize_league_scrapes(results: List[Dict]):
+    """Chord callback totalling the per-league scrape results"""
+    succeeded = [r for r in results if r.get("status") == "success"]
+    failed = [r for r in results if r.get("status") != "success"]
+    logger.info(
+        f"Scrape run finished: {len(succeeded)} succeeded, {len(failed)} failed "
+        f"out of {len(results)} leagues"
+    )
+    for result in failed:
+        logger.error(f"League {result.get('league_id')} failed: {result.get('message', result.get('status'))}")
+    
+    return {
+        "status": "completed",
+        "leagues_processed": len(results),
+        "leagues_succeeded": len(succeeded),
+        "leagues_failed": len(failed),
+    }
+
+
 @celery_app.task(bind=True, name="app.tasks.scraper_tasks.scrape_single_league")
-def scrape_single_league(self: Task, league_id: int):
-    """Scrape a single league by ID"""
+def scrape_single_league(self: Task, league_id: int, incremental: bool = False, run_id: Optional[int] = None):
+    """Scrape a single league by ID, retrying a failed scrape from its last checkpoint"""
     db = SessionLocal()
-    manager = ScraperManager()
+    manager = None
+    slots = None
+    token = None
     
     try:
         league = db.query(League).filter(League.id == league_id).first()
         if not league:
             logger.error(f"League with ID {league_id} not found")
-            return {"status": "error", "message": "League not found"}
+            return {"status": "error", "league_id": league_id, "message": "League not found"}
         
         if not league.source_url or not league.source_platform:
             logger.error(f"League {league.name} missing source_url or source_platform")
-            return {"status": "error", "message": "Missing source information"}
+            return {"status": "error", "league_id": league_id, "message": "Missing source information"}
+        
+        slots = platform_slots(league.source_platform)
+        token = slots.acquire()
+        if token is None:
+            logger.info(
+                f"Platform {league.source_platform} at its concurrency limit, "
+                f"deferring league {league.name}"
+            )
+            raise self.retry(countdown=settings.scrape_slot_retry_delay, max_retries=None)
         
-        success = manager.scrape_league(league.source_platform, league.source_url)
+        manager = ScraperManager()
+        manager.register_scraper(league.source_platform, create_scraper(league.source_platform, league.source_url))
+        success = manager.scrape_league(
+            league.source_platform, league.source_url, incremental=incremental, run_id=run_id
+        )
+        run = manager.checkpoints.run if manager.checkpoints is not None else None
+        if not success and run is not None and run.attempts <= settings.scrape_resume_attempts:
+            logger.warning(
+                f"Failed to scrape league: {league.name}, resuming run {run.id} "
+                f"in {settings.scrape_resume_delay}s"
+            )
+            raise self.retry(
+                kwargs={"league_id": league_id, "incremental": incremental, "run_id": run.id},
+                countdown=settings.scrape_resume_delay,
+                max_retries=None
+            )
+        
+        # Stages a failed run committed are kept, so their teams are rolled up either way
+        if settings.rollup_statistics and manager.touched:
+            rollup_league_statistics.delay(league_id, manager.touched)
         if success:
             logger.info(f"Successfully scraped league: {league.name}")
-            return {"status": "success", "league": league.name}
+            return {"status": "success", "league_id": league_id, "league": league.name}
         else:
             logger.error(f"Failed to scrape league: {league.name}")
-            return {"status": "error", "league": league.name}
+            return {"status": "error", "league_id": league_id, "league": league.name}
+    except Retry:
+        raise
     except Exception as e:
+        # Report instead of raising so one broken league cannot fail the whole chord
         logger.error(f"Error in scrape_single_league task: {e}")
+        return {"status": "error", "league_id": league_id, "message": str(e)}
+    finally:
+        if token is not None:
+            slots.release(token)
+        if manager is not None:
+            manager.close()
+        db.close()
+
+
+@celery_app.task(name="app.tasks.scraper_tasks.poll_live_scores")
+def poll_live_scores():
+    """Beat tick: dispatch a score poll for each league with open games whose interval has elapsed"""
+    db = SessionLocal()
+    
+    try:
+        start, end = live_window()
+        league_ids = [
+            league_id for (league_id,) in db.query(Game.league_id).join(League).filter(
+                League.active == True,
+                League.source_url.isnot(None),
+                League.source_platform.isnot(None),
+                Game.status.notin_(FINAL_STATUSES),
+                Game.game_date.between(start, end)
+            ).distinct()
+        ]
+        schedule = live_schedule()
+        dispatched = [league_id for league_id in league_ids if schedule.claim(league_id)]
+        for league_id in dispatched:
+            poll_league_scores.delay(league_id)
+        
+        if dispatched:
+            logger.info(f"Live polling {len(dispatched)} of {len(league_ids)} leagues with open games")
+        return {"status": "dispatched", "leagues_open": len(league_ids), "leagues_dispatched": len(dispatched)}
+    except Exception as e:
+        logger.error(f"Error in poll_live_scores task: {e}")
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.scraper_tasks.poll_league_scores")
+def poll_league_scores(league_id: int):
+    """Poll one league's live scores and schedule its next poll from the outcome"""
+    db = SessionLocal()
+    manager = None
+    slots = None
+    token = None
+    
+    try:
+        league = db.query(League).filter(League.id == league_id).first()
+        if not league or not league.source_url or not league.source_platform:
+            return {"status": "error", "league_id": league_id, "message": "League not found or missing source"}
+        
+        slots = platform_slots(league.source_platform)
+        token = slots.acquire()
+        if token is None:
+            # The claim keeps the league off the next few ticks; it is picked up again after that
+            logger.info(f"Platform {league.source_platform} at its concurrency limit, skipping live poll")
+            return {"status": "deferred", "league_id": league_id}
+        
+        schedule = live_schedule()
+        manager = ScraperManager()
+        manager.register_scraper(league.source_platform, create_scraper(league.source_platform, league.source_url))
+        poll = manager.poll_scores(
+            league.source_platform, league_id, league.source_url, schedule.get(league_id).day_hashes
+        )
+        if poll is None:
+            return {"status": "error", "league_id": league_id, "league": league.name}
+        
+        state = schedule.record(league_id, poll)
+        if poll.changed and settings.rollup_statistics and manager.touched:
+            rollup_league_statistics.delay(league_id, manager.touched)
+        logger.info(
+            f"League {league.name}: {poll.live_games} live games, "
+            f"{'changed' if poll.changed else 'unchanged'}, next poll in {state.interval:.0f}s"
+        )
+        return {
+            "status": "success",
+            "league_id": league_id,
+            "changed": poll.changed,
+            "live_games": poll.live_games,
+            "next_poll_seconds": state.interval,
+        }
+    except Exception as e:
+        logger.error(f"Error in poll_league_scores task: {e}")
+        return {"status": "error", "league_id": league_id, "message": str(e)}
+    finally:
+        if token is not None:
+            slots.release(token)
+        if manager is not None:
+            manager.close()
+        db.close()
+
+
+@celery_app.task(name="app.tasks.scraper_tasks.prune_scrape_log")
+def prune_scrape_log():
+    """Delete scrape runs, their change logs and checkpoints older than the retention period"""
+    db = SessionLocal()
+    
+    try:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.scrape_log_retention_days)
+        old_runs = db.query(ScrapeRun.id).filter(ScrapeRun.started_at < cutoff)
+        changes = db.query(ScrapeChange).filter(ScrapeChange.run_id.in_(old_runs.scalar_subquery())).delete(
+            synchronize_session=False
+        )
+        db.query(ScrapeCheckpoint).filter(ScrapeCheckpoint.run_id.in_(old_runs.scalar_subquery())).delete(
+            synchronize_session=False
+        )
+        runs = db.query(ScrapeRun).filter(ScrapeRun.started_at < cutoff).delete(synchronize_session=False)
+        db.commit()
+        logger.info(f"Pruned {runs} scrape runs and {changes} change log rows before {cutoff:%Y-%m-%d}")
+        return {"status": "success", "runs": runs, "changes": changes}
+    except Exception as e:
+        logger.error(f"Error in prune_scrape_log task: {e}")
+        db.rollback()
         raise
     finally:
-        manager.close()
         db.close()
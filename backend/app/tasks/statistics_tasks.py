@@ -0,0 +1,41 @@
+import logging
+from typing import Dict, List, Optional
+from app.celery_app import celery_app
+from app.scrapers.rollups import StatisticsRollup
+from app.models.database import SessionLocal
+from app.utils.cache import bump_league_version
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.statistics_tasks.rollup_league_statistics")
+def rollup_league_statistics(league_id: int, touched: Optional[Dict[str, Optional[List[int]]]] = None):
+    """Refresh a league's team and player season statistics
+    
+    touched maps each season to the team ids whose games changed (None for all
+    teams); without it every season of the league is rolled up.
+    """
+    db = SessionLocal()
+    
+    try:
+        rollup = StatisticsRollup(db)
+        if touched is None:
+            touched = rollup.standings.touched_teams(league_id)
+        results = rollup.run(league_id, touched)
+        db.commit()
+        bump_league_version(league_id)
+        
+        for result in results:
+            logger.info(f"League {league_id} rollup {result}")
+        return {
+            "status": "success",
+            "league_id": league_id,
+            "seasons": sorted(touched),
+            "results": [{"table": result.table, **result.as_dict()} for result in results],
+        }
+    except Exception as e:
+        logger.error(f"Error rolling up statistics for league {league_id}: {e}")
+        db.rollback()
+        return {"status": "error", "league_id": league_id, "message": str(e)}
+    finally:
+        db.close()
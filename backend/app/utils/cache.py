@@ -0,0 +1,159 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+import redis
+import redis.asyncio as aioredis
+from app.config import settings
+from app.utils.redis_client import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+# Versions are millisecond timestamps that only move forward, so a version also
+# says when its data last changed and survives a lost counter without reuse.
+BUMP_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local version = math.max(current + 1, tonumber(ARGV[1]))
+redis.call('SET', KEYS[1], version)
+return version
+"""
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class LRUCache:
+    """Thread-safe in-process LRU with a per-entry TTL
+    
+    get and set are coroutines only to share RedisCache's interface; they never wait.
+    """
+    
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[1]
+    
+    async def set(self, key: str, value: bytes):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class RedisCache:
+    """Response cache shared by all API processes, read without blocking the event loop"""
+    
+    def __init__(self, client: aioredis.Redis, ttl: int, prefix: str = "api:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+    
+    async def set(self, key: str, value: bytes):
+        await self.client.set(self.prefix + key, value, ex=self.ttl)
+
+
+class DataVersions:
+    """Version counters per data scope (e.g. one league), bumped whenever a scrape commits
+    
+    Scrapes bump through the blocking client; the API reads with get_async over the
+    asyncio client so a slow Redis does not stall its event loop.
+    """
+    
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        prefix: str = "version:",
+        async_client: Optional[aioredis.Redis] = None
+    ):
+        self.client = client
+        self.async_client = async_client
+        self.prefix = prefix
+        self._local = {}
+        self._lock = threading.Lock()
+        self._bump = client.register_script(BUMP_SCRIPT) if client is not None else None
+    
+    def get(self, scope: str) -> int:
+        if self.client is None:
+            with self._lock:
+                return self._local.setdefault(scope, _now_ms())
+        key = self.prefix + scope
+        value = self.client.get(key)
+        if value is None:
+            # Unknown scope: start from the current time so versions are never reused
+            self.client.set(key, _now_ms(), nx=True)
+            value = self.client.get(key)
+        return int(value)
+    
+    async def get_async(self, scope: str) -> int:
+        if self.async_client is None:
+            return self.get(scope)
+        key = self.prefix + scope
+        value = await self.async_client.get(key)
+        if value is None:
+            await self.async_client.set(key, _now_ms(), nx=True)
+            value = await self.async_client.get(key)
+        return int(value)
+    
+    def bump(self, scopes: Iterable[str]):
+        now = _now_ms()
+        for scope in scopes:
+            if self.client is None:
+                with self._lock:
+                    self._local[scope] = max(self._local.get(scope, 0) + 1, now)
+            else:
+                self._bump(keys=[self.prefix + scope], args=[now])
+
+
+def league_scope(league_id: int) -> str:
+    return f"league:{league_id}"
+
+
+# Scope of the league list itself, bumped with every league
+LEAGUES_SCOPE = "leagues"
+
+
+@lru_cache(maxsize=None)
+def get_response_cache():
+    """Configured API response cache, or None when caching is off"""
+    if settings.api_cache_backend == "memory":
+        return LRUCache(settings.api_cache_max_entries, settings.api_cache_ttl)
+    if settings.api_cache_backend == "redis":
+        return RedisCache(get_async_redis(), settings.api_cache_ttl)
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_data_versions() -> DataVersions:
+    if settings.cache_versions_backend == "redis":
+        return DataVersions(get_redis(), async_client=get_async_redis())
+    return DataVersions()
+
+
+def bump_league_version(league_id: int):
+    """Invalidate cached API responses for a league after its data changed"""
+    try:
+        get_data_versions().bump([league_scope(league_id), LEAGUES_SCOPE])
+    except redis.RedisError as e:
+        logger.warning(f"Failed to bump data version for league {league_id}: {e}")
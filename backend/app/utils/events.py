@@ -0,0 +1,90 @@
+import json
+import logging
+import threading
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List
+import redis
+from app.config import settings
+from app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# One pub/sub channel per league; API processes subscribe to the pattern
+SCORES_CHANNEL_PREFIX = "scores:league:"
+SCORES_CHANNEL_PATTERN = SCORES_CHANNEL_PREFIX + "*"
+
+# Game columns that can appear in a delta (the platform's own game id stays internal)
+GAME_DELTA_FIELDS = (
+    "home_team_id", "away_team_id", "game_date", "game_time",
+    "status", "home_score", "away_score", "venue",
+)
+
+
+def scores_channel(league_id: int) -> str:
+    return f"{SCORES_CHANNEL_PREFIX}{league_id}"
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def game_delta(league_id: int, row: Dict[str, Any]) -> str:
+    """Compact JSON for one written game row: its id plus only the columns that were written"""
+    delta = {"id": row["id"], "league_id": league_id}
+    delta.update((name, row[name]) for name in GAME_DELTA_FIELDS if name in row)
+    return json.dumps(delta, default=_json_default, separators=(",", ":"))
+
+
+class LocalBus:
+    """In-process stand-in for Redis pub/sub, for running the API and scrapes in one process"""
+    
+    def __init__(self):
+        self._subscribers: List[Callable[[str, str], None]] = []
+        self._lock = threading.Lock()
+    
+    def subscribe(self, callback: Callable[[str, str], None]):
+        with self._lock:
+            self._subscribers.append(callback)
+    
+    def unsubscribe(self, callback: Callable[[str, str], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+    
+    def publish(self, channel: str, message: str):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(channel, message)
+
+
+@lru_cache(maxsize=None)
+def get_local_bus() -> LocalBus:
+    return LocalBus()
+
+
+def publish_game_changes(league_id: int, rows: Iterable[Dict[str, Any]]) -> int:
+    """Broadcast one delta per written game row after a commit; returns the messages sent"""
+    if settings.live_events_backend == "none":
+        return 0
+    channel = scores_channel(league_id)
+    messages = [game_delta(league_id, row) for row in rows]
+    if not messages:
+        return 0
+    if settings.live_events_backend == "memory":
+        for message in messages:
+            get_local_bus().publish(channel, message)
+        return len(messages)
+    try:
+        with get_redis().pipeline(transaction=False) as pipe:
+            for message in messages:
+                pipe.publish(channel, message)
+            pipe.execute()
+    except redis.RedisError as e:
+        # Clients fall back to refetching; a lost broadcast must not fail the scrape
+        logger.warning(f"Failed to publish {len(messages)} game updates for league {league_id}: {e}")
+        return 0
+    return len(messages)
@@ -0,0 +1,264 @@
+import io
+import csv
+import zlib
+from abc import ABC, abstractmethod
+from datetime import date, datetime, time
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.team import Team
+from app.models.player import Player
+from app.models.game import Game
+from app.models.standing import Standing
+from app.models.statistics import PlayerStatistics
+from app.scrapers.standings import season_bounds
+
+# Bookkeeping columns left out of exports
+_EXCLUDED_COLUMNS = {"fingerprint", "active"}
+
+# Season names season_bounds understands: "YYYY" or a split year like "YYYY-YY"
+SEASON_PATTERN = r"^\d{4}(-\d{2,4})?$"
+
+
+class ExportUnavailable(Exception):
+    """Raised when an export format needs an optional package that is not installed"""
+
+
+def _columns(model) -> List:
+    return [column for column in model.__table__.columns if column.name not in _EXCLUDED_COLUMNS]
+
+
+def teams_statement(league_id: int, season: Optional[str]):
+    return select(*_columns(Team)).where(Team.league_id == league_id).order_by(Team.id)
+
+
+def games_statement(league_id: int, season: Optional[str]):
+    statement = select(*_columns(Game)).where(Game.league_id == league_id)
+    if season:
+        start, end = season_bounds(season)
+        statement = statement.where(Game.game_date.between(start, end))
+    return statement.order_by(Game.game_date, Game.id)
+
+
+def standings_statement(league_id: int, season: Optional[str]):
+    statement = select(*_columns(Standing)).where(Standing.league_id == league_id)
+    if season:
+        statement = statement.where(Standing.season == season)
+    return statement.order_by(Standing.season, Standing.rank, Standing.id)
+
+
+def players_statement(league_id: int, season: Optional[str]):
+    return (
+        select(*_columns(Player))
+        .join(Team, Team.id == Player.team_id)
+        .where(Team.league_id == league_id)
+        .order_by(Player.id)
+    )
+
+
+def player_stats_statement(league_id: int, season: Optional[str]):
+    statement = (
+        select(*_columns(PlayerStatistics), Player.team_id)
+        .join(Player, Player.id == PlayerStatistics.player_id)
+        .join(Team, Team.id == Player.team_id)
+        .where(Team.league_id == league_id)
+    )
+    if season:
+        statement = statement.where(PlayerStatistics.season == season)
+    return statement.order_by(PlayerStatistics.id)
+
+
+# Dataset name -> statement over a league (and optionally one season) of plain columns
+DATASETS: Dict[str, Callable] = {
+    "teams": teams_statement,
+    "games": games_statement,
+    "standings": standings_statement,
+    "players": players_statement,
+    "player_stats": player_stats_statement,
+}
+
+# Datasets a season filters; teams and players are not kept per season
+SEASONAL_DATASETS = frozenset(("games", "standings", "player_stats"))
+
+
+class _Sink(io.RawIOBase):
+    """Write-only buffer pyarrow writes into and the exporter drains after each batch
+    
+    tell() keeps counting across drains, since Parquet records offsets in its footer.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportWriter(ABC):
+    """Encodes batches of row tuples into one export file, returning the bytes ready to send"""
+    
+    extension = ""
+    media_type = "application/octet-stream"
+    
+    def __init__(self, columns: Sequence):
+        self.names = [column.name for column in columns]
+        self.rows = 0
+    
+    def start(self) -> bytes:
+        return b""
+    
+    @abstractmethod
+    def write(self, rows: Sequence[Sequence]) -> bytes:
+        """Encode one batch of rows"""
+        pass
+    
+    def close(self) -> bytes:
+        return b""
+
+
+class CsvGzipWriter(ExportWriter):
+    extension = "csv.gz"
+    media_type = "application/gzip"
+    
+    def __init__(self, columns: Sequence):
+        super().__init__(columns)
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    
+    def start(self) -> bytes:
+        return self._encode([self.names])
+    
+    def write(self, rows: Sequence[Sequence]) -> bytes:
+        self.rows += len(rows)
+        return self._encode(rows)
+    
+    def close(self) -> bytes:
+        return self._compressor.flush()
+    
+    def _encode(self, rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return self._compressor.compress(buffer.getvalue().encode())
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ExportUnavailable("Arrow and Parquet exports need pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+def _arrow_type(pa, column):
+    python_type = column.type.python_type
+    # datetime before date: it is a subclass
+    if python_type is datetime:
+        return pa.timestamp("us", tz="UTC")
+    return {
+        bool: pa.bool_(),
+        int: pa.int64(),
+        float: pa.float64(),
+        str: pa.string(),
+        date: pa.date32(),
+        time: pa.time64("us"),
+    }[python_type]
+
+
+class _ArrowWriter(ExportWriter):
+    """Base for the pyarrow formats: each batch becomes one columnar record batch"""
+    
+    def __init__(self, columns: Sequence):
+        super().__init__(columns)
+        self._pa = _pyarrow()
+        self.schema = self._pa.schema([
+            self._pa.field(column.name, _arrow_type(self._pa, column)) for column in columns
+        ])
+        self._sink = _Sink()
+        self._writer = self._open()
+    
+    def write(self, rows: Sequence[Sequence]) -> bytes:
+        self.rows += len(rows)
+        columns = list(zip(*rows))
+        batch = self._pa.RecordBatch.from_arrays(
+            [self._pa.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema
+        )
+        self._writer.write_batch(batch)
+        return self._sink.drain()
+    
+    def start(self) -> bytes:
+        return self._sink.drain()
+    
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+    
+    @abstractmethod
+    def _open(self):
+        """Open the pyarrow writer over the sink"""
+        pass
+
+
+class ArrowStreamWriter(_ArrowWriter):
+    extension = "arrow"
+    media_type = "application/vnd.apache.arrow.stream"
+    
+    def _open(self):
+        return self._pa.ipc.new_stream(self._sink, self.schema)
+
+
+class ParquetWriter(_ArrowWriter):
+    extension = "parquet"
+    media_type = "application/vnd.apache.parquet"
+    
+    def _open(self):
+        import pyarrow.parquet
+        # One row group per batch, so memory stays bounded by EXPORT_BATCH_SIZE
+        return pyarrow.parquet.ParquetWriter(self._sink, self.schema, compression="zstd")
+
+
+EXPORT_FORMATS = {
+    "csv.gz": CsvGzipWriter,
+    "arrow": ArrowStreamWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def create_writer(export_format: str, statement) -> ExportWriter:
+    """Writer for a statement's columns; raises ExportUnavailable before any bytes are produced"""
+    return EXPORT_FORMATS[export_format](statement.selected_columns)
+
+
+def export_batches(connection: Connection, statement, writer: ExportWriter) -> Iterator[bytes]:
+    """Encode a statement's rows from a server-side cursor, a batch at a time"""
+    result = connection.execution_options(yield_per=settings.export_batch_size).execute(statement)
+    yield writer.start()
+    for rows in result.partitions():
+        yield writer.write(rows)
+    yield writer.close()
+
+
+async def stream_export_batches(db: AsyncSession, statement, writer: ExportWriter) -> AsyncIterator[bytes]:
+    """export_batches for an async session; rows stay plain tuples, no ORM objects are built"""
+    result = await db.stream(statement.execution_options(yield_per=settings.export_batch_size))
+    yield writer.start()
+    async for rows in result.partitions():
+        yield writer.write(rows)
+    yield writer.close()
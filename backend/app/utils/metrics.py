@@ -0,0 +1,223 @@
+import os
+import time
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Tuple
+from celery import signals
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest,
+    start_http_server,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from app.config import settings
+
+# Scrape call the current fetches belong to; set in the thread running the call and
+# inherited by the asyncio tasks it starts
+_endpoint: ContextVar[str] = ContextVar("scrape_endpoint", default="other")
+
+TASK_BUCKETS = (0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200)
+
+FETCH_SECONDS = Histogram(
+    "scraper_fetch_duration_seconds",
+    "Time from sending a page request to receiving its response, per attempt",
+    ["platform", "endpoint"],
+)
+FETCH_BYTES = Counter(
+    "scraper_fetch_bytes",
+    "Response bytes downloaded",
+    ["platform", "endpoint"],
+)
+FETCH_RETRIES = Counter(
+    "scraper_fetch_retries",
+    "Failed page requests that were retried",
+    ["platform", "endpoint"],
+)
+FETCH_FAILURES = Counter(
+    "scraper_fetch_failures",
+    "Pages given up on after every retry failed",
+    ["platform", "endpoint"],
+)
+PARSE_SECONDS = Histogram(
+    "scraper_parse_duration_seconds",
+    "Time spent parsing fetched pages",
+    ["platform", "backend"],
+)
+UPSERT_SECONDS = Histogram(
+    "scraper_upsert_duration_seconds",
+    "Time spent writing one batch of rows to a table",
+    ["table"],
+)
+UPSERT_ROWS = Counter(
+    "scraper_upsert_rows",
+    "Rows written per table, by outcome",
+    ["table", "outcome"],
+)
+TASK_SECONDS = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task run time by final state",
+    ["task", "state"],
+    buckets=TASK_BUCKETS,
+)
+TASK_RETRIES = Counter(
+    "celery_task_retries",
+    "Celery task retries requested",
+    ["task"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "api_request_duration_seconds",
+    "API request latency per route template",
+    ["method", "route", "status"],
+)
+
+LIVE_CLIENTS = Gauge(
+    "api_live_clients",
+    "Clients connected to live score streams",
+    multiprocess_mode="livesum",
+)
+LIVE_EVENTS = Counter(
+    "api_live_events",
+    "Live score events sent to clients (resync when a slow client's backlog was dropped)",
+    ["event"],
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Database connections currently checked out of the pool",
+    ["role"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS = Counter(
+    "db_pool_connections_opened",
+    "New database connections opened by the pool",
+    ["role"],
+)
+DB_POOL_INVALIDATED = Counter(
+    "db_pool_connections_invalidated",
+    "Pooled connections discarded after an error or a failed pre-ping",
+    ["role"],
+)
+DB_READ_SESSIONS = Counter(
+    "api_db_read_sessions",
+    "API read sessions by the database that served them (primary or replica)",
+    ["target"],
+)
+DB_REPLICA_HEALTHY = Gauge(
+    "db_replica_healthy",
+    "Whether a read replica passed its last health check (1) or is out of rotation (0)",
+    ["replica"],
+    multiprocess_mode="max",
+)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Registry to expose: this process's, or every process's when PROMETHEUS_MULTIPROC_DIR is set"""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Body and content type of a Prometheus scrape"""
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int):
+    """Serve /metrics from a background thread (for processes without the API, e.g. workers)"""
+    start_http_server(port, registry=metrics_registry())
+
+
+@contextmanager
+def scrape_endpoint(name: str):
+    """Label the fetches made inside the block with the scrape call they serve"""
+    token = _endpoint.set(name.removeprefix("scrape_"))
+    try:
+        yield
+    finally:
+        _endpoint.reset(token)
+
+
+def observe_fetch(platform: str, seconds: float, size: int):
+    endpoint = _endpoint.get()
+    FETCH_SECONDS.labels(platform, endpoint).observe(seconds)
+    FETCH_BYTES.labels(platform, endpoint).inc(size)
+
+
+def count_fetch_retry(platform: str):
+    FETCH_RETRIES.labels(platform, _endpoint.get()).inc()
+
+
+def count_fetch_failure(platform: str):
+    FETCH_FAILURES.labels(platform, _endpoint.get()).inc()
+
+
+def observe_upsert(result, seconds: float):
+    """Record the duration and row counts of an UpsertResult"""
+    UPSERT_SECONDS.labels(result.table).observe(seconds)
+    for outcome, rows in result.as_dict().items():
+        if rows:
+            UPSERT_ROWS.labels(result.table, outcome).inc(rows)
+
+
+def timed_upsert(method):
+    """Decorate a method returning an UpsertResult to record its duration and rows"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = method(*args, **kwargs)
+        observe_upsert(result, time.perf_counter() - start)
+        return result
+    return wrapper
+
+
+def instrument_pool(engine, role: str):
+    """Track an engine's checked out connections, new connections and invalidations"""
+    checked_out = DB_POOL_CHECKED_OUT.labels(role)
+    
+    @event.listens_for(engine, "connect")
+    def connection_opened(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS.labels(role).inc()
+    
+    @event.listens_for(engine, "checkout")
+    def connection_checked_out(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+    
+    @event.listens_for(engine, "checkin")
+    def connection_checked_in(dbapi_connection, connection_record):
+        checked_out.dec()
+    
+    @event.listens_for(engine, "invalidate")
+    def connection_invalidated(dbapi_connection, connection_record, exception):
+        DB_POOL_INVALIDATED.labels(role).inc()
+
+
+def instrument_celery():
+    """Record task durations and retries through Celery signals"""
+    started: Dict[str, float] = {}
+    
+    @signals.task_prerun.connect(weak=False)
+    def task_started(task_id=None, **kwargs):
+        started[task_id] = time.perf_counter()
+    
+    @signals.task_postrun.connect(weak=False)
+    def task_finished(task_id=None, task=None, state=None, **kwargs):
+        start = started.pop(task_id, None)
+        if start is not None:
+            TASK_SECONDS.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - start)
+    
+    @signals.task_retry.connect(weak=False)
+    def task_retried(sender=None, **kwargs):
+        TASK_RETRIES.labels(sender.name).inc()
+    
+    @signals.worker_process_shutdown.connect(weak=False)
+    def process_shutdown(pid=None, **kwargs):
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            multiprocess.mark_process_dead(pid or os.getpid())
+    
+    @signals.worker_ready.connect(weak=False)
+    def worker_ready(**kwargs):
+        if settings.metrics_port:
+            start_metrics_server(settings.metrics_port)
@@ -0,0 +1,46 @@
+from contextlib import contextmanager
+from typing import Iterator, List
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Count the statements engines execute while the counter is open
+    
+    Accepts sync or async engines (an async engine is counted through its sync
+    engine). Everything the engines run is counted, so keep other work off them
+    while counting.
+    """
+    
+    def __init__(self, *engines):
+        self.engines = [getattr(engine, "sync_engine", engine) for engine in engines]
+        self.statements: List[str] = []
+    
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+    
+    def __enter__(self) -> "QueryCounter":
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._record)
+        return self
+    
+    def __exit__(self, *exc_info):
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._record)
+    
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def assert_max_queries(limit: int, *engines) -> Iterator[QueryCounter]:
+    """Fail with the statements run when the block executes more than limit queries
+    
+    Catches N+1 regressions: an endpoint or scrape stage with a fixed budget keeps
+    it however many rows it returns.
+    """
+    with QueryCounter(*engines) as counter:
+        yield counter
+    if counter.count > limit:
+        statements = "\n".join(f"  {statement}" for statement in counter.statements)
+        raise AssertionError(f"Expected at most {limit} queries, ran {counter.count}:\n{statements}")
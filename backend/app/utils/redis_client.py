@@ -0,0 +1,16 @@
+from functools import lru_cache
+import redis
+import redis.asyncio as aioredis
+from app.config import settings
+
+
+@lru_cache(maxsize=None)
+def get_redis() -> redis.Redis:
+    """Shared Redis client for coordination state (per process)"""
+    return redis.Redis.from_url(settings.redis_url)
+
+
+@lru_cache(maxsize=None)
+def get_async_redis() -> aioredis.Redis:
+    """Shared asyncio Redis client for the API's event loop (per process)"""
+    return aioredis.Redis.from_url(settings.redis_url)
@@ -0,0 +1,47 @@
+import time
+import uuid
+import logging
+from typing import Optional
+import redis
+
+logger = logging.getLogger(__name__)
+
+# Drop expired leases, then take a slot if one is free
+ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+    redis.call('ZADD', KEYS[1], ARGV[3], ARGV[4])
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+    return 1
+end
+return 0
+"""
+
+
+class RedisSemaphore:
+    """Counting semaphore shared by all workers, backed by a Redis sorted set of leases"""
+    
+    def __init__(self, client: redis.Redis, name: str, limit: int, lease_seconds: int):
+        self.client = client
+        self.key = f"semaphore:{name}"
+        self.limit = limit
+        self.lease_seconds = lease_seconds
+        self._acquire = client.register_script(ACQUIRE_SCRIPT)
+    
+    def acquire(self) -> Optional[str]:
+        """Take a slot without blocking; returns a lease token or None when all slots are busy"""
+        token = uuid.uuid4().hex
+        now = time.time()
+        acquired = self._acquire(
+            keys=[self.key],
+            args=[now, self.limit, now + self.lease_seconds, token, self.lease_seconds]
+        )
+        return token if acquired else None
+    
+    def release(self, token: str):
+        """Give a slot back"""
+        try:
+            self.client.zrem(self.key, token)
+        except redis.RedisError as e:
+            # The lease expires on its own, so a failed release only delays the next task
+            logger.warning(f"Failed to release {self.key} slot: {e}")
@@ -0,0 +1,60 @@
+import logging
+from pathlib import Path
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+from app.models.database import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Newest first: a table or index each revision adds, so a schema built by
+# create_all() without migration history can be stamped with the revision it
+# matches. Add the marker of every new migration that adds a table or index;
+# data-only migrations (0006) run on top of the stamped revision.
+REVISION_MARKERS = [
+    ("0005", "scrape_checkpoints", None),
+    ("0004", "scrape_runs", None),
+    ("0003", "team_aliases", None),
+    ("0002", "teams", "uq_teams_league_slug"),
+    ("0001", "leagues", None),
+]
+
+
+def alembic_config() -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    return config
+
+
+def unversioned_revision(connection: Connection) -> Optional[str]:
+    """Revision an existing schema without alembic_version matches, or None if there is nothing to adopt"""
+    inspector = inspect(connection)
+    tables = set(inspector.get_table_names())
+    if "alembic_version" in tables:
+        return None
+    for revision, table, index in REVISION_MARKERS:
+        if table not in tables:
+            continue
+        if index is None or index in {item["name"] for item in inspector.get_indexes(table)}:
+            return revision
+    return None
+
+
+def upgrade_database(engine: Engine = default_engine) -> Optional[str]:
+    """Bring a database to the latest migration, first adopting a schema created without Alembic
+    
+    Returns the revision an unversioned schema was stamped with, if any.
+    """
+    config = alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        revision = unversioned_revision(connection)
+        if revision is not None:
+            logger.info(f"Found tables without migration history, stamping them as revision {revision}")
+            command.stamp(config, revision)
+        command.upgrade(config, "head")
+    return revision
@@ -0,0 +1,4 @@
+"""Benchmark suite: parsing, fixture-replay scraping, synthetic-league upserts and the API
+
+Run from backend/, e.g. `python -m benchmarks run --database-url postgresql://localhost/bench --reset`.
+"""
@@ -0,0 +1,38 @@
+"""Recorded page fixtures: a league's pages captured from a live scrape, replayable offline"""
+import json
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from app.scrapers.base_scraper import BaseScraper
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DEFAULT_FIXTURE = FIXTURES_DIR / "reference_league.json"
+
+
+class Recording:
+    """Pages keyed by path and query, plus the path of the league page they belong to"""
+    
+    def __init__(self, league_path: str, pages: Optional[Dict[str, str]] = None, platform: str = "reference"):
+        self.league_path = league_path
+        self.pages: Dict[str, str] = pages or {}
+        self.platform = platform
+    
+    @classmethod
+    def load(cls, path: Path) -> "Recording":
+        data = json.loads(Path(path).read_text())
+        return cls(data["league_path"], data["pages"], data.get("platform", "reference"))
+    
+    def save(self, path: Path):
+        Path(path).write_text(json.dumps({
+            "platform": self.platform,
+            "league_path": self.league_path,
+            "pages": dict(sorted(self.pages.items())),
+        }, indent=1) + "\n")
+    
+    def attach(self, scraper: BaseScraper):
+        """Record every successful page the scraper's session fetches from now on"""
+        def record(response, *args, **kwargs):
+            if response.status_code == 200:
+                url = urlsplit(response.url)
+                self.pages[url.path + (f"?{url.query}" if url.query else "")] = response.text
+        scraper.session.hooks["response"].append(record)
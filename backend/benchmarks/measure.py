@@ -0,0 +1,123 @@
+"""Timing, percentiles and peak memory for benchmark cases"""
+import time
+import resource
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process so far (each suite runs in its own process)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@dataclass
+class CaseResult:
+    """One measured case: ops done in seconds of wall time, with per-sample latencies"""
+    suite: str
+    case: str
+    unit: str
+    ops: int = 0
+    seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    database: str = "-"
+    peak_rss_mib: float = 0.0
+    queries: Optional[int] = None
+    
+    @property
+    def throughput(self) -> float:
+        return self.ops / self.seconds if self.seconds else 0.0
+    
+    def add(self, ops: int, seconds: float):
+        """Record one sample: ops completed in seconds"""
+        self.ops += ops
+        self.seconds += seconds
+        self.latencies.append(seconds)
+    
+    def as_dict(self) -> Dict:
+        latencies = sorted(self.latencies)
+        return {
+            "suite": self.suite,
+            "case": self.case,
+            "database": self.database,
+            "unit": self.unit,
+            "ops": self.ops,
+            "seconds": round(self.seconds, 6),
+            "throughput": round(self.throughput, 3),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "samples": len(latencies),
+            "peak_rss_mib": round(self.peak_rss_mib, 1),
+            "queries": self.queries,
+        }
+
+
+class Stopwatch:
+    """Context manager measuring the wall time of a block"""
+    
+    def __init__(self):
+        self.seconds = 0.0
+        self._started: Optional[float] = None
+    
+    def __enter__(self) -> "Stopwatch":
+        self._started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.seconds = time.perf_counter() - self._started
+
+
+def format_table(rows: List[Dict]) -> str:
+    """Render result dicts as an aligned text table"""
+    columns = [
+        ("database", "database", "{}"),
+        ("suite", "suite", "{}"),
+        ("case", "case", "{}"),
+        ("ops", "ops", "{}"),
+        ("unit", "unit", "{}"),
+        ("throughput", "ops/s", "{:.1f}"),
+        ("p50_ms", "p50 ms", "{:.2f}"),
+        ("p95_ms", "p95 ms", "{:.2f}"),
+        ("p99_ms", "p99 ms", "{:.2f}"),
+        ("peak_rss_mib", "peak MiB", "{:.1f}"),
+        ("queries", "queries", "{}"),
+    ]
+    cells = [[title for _, title, _ in columns]]
+    for row in rows:
+        cells.append([
+            "-" if row.get(key) is None else fmt.format(row[key]) for key, _, fmt in columns
+        ])
+    widths = [max(len(line[index]) for line in cells) for index in range(len(columns))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip()
+        for line in cells
+    )
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Cases whose throughput fell or p95 latency rose by more than tolerance (a fraction),
+    or that now run more queries per request
+    """
+    previous = {(row["database"], row["suite"], row["case"]): row for row in baseline}
+    regressions = []
+    for row in results:
+        before = previous.get((row["database"], row["suite"], row["case"]))
+        if before is None:
+            continue
+        name = f"{row['database']} {row['suite']}/{row['case']}"
+        if before["throughput"] and row["throughput"] < before["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {row['throughput']:.1f} {row['unit']}/s, was {before['throughput']:.1f}"
+            )
+        if before["p95_ms"] and row["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {row['p95_ms']:.2f} ms, was {before['p95_ms']:.2f}")
+        if before.get("queries") is not None and (row.get("queries") or 0) > before["queries"]:
+            regressions.append(f"{name}: {row['queries']} queries, was {before['queries']}")
+    return regressions
@@ -0,0 +1,178 @@
+"""Command line for the benchmark suite
+
+Each suite runs in a child process per database so its settings are fixed before
+the app is imported and its peak memory is its own.
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+from urllib.parse import urlsplit
+from typing import Dict, List
+from sqlalchemy.engine import make_url
+from benchmarks.measure import compare, format_table, peak_rss_mib
+
+SUITE_NAMES = ("parsing", "scrape", "upsert", "api")
+DATABASE_SUITES = {"scrape", "upsert", "api"}
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def child_environment(database_url: str, api_cache: bool = False) -> Dict[str, str]:
+    """Settings for a suite process: no rate limiting, HTTP cache, Redis or SQL echo"""
+    env = dict(os.environ)
+    env.update(
+        DATABASE_URL=database_url,
+        DEBUG="false",
+        RATE_LIMIT_DELAY="0",
+        HTTP_CACHE_ENABLED="false",
+        CACHE_VERSIONS_BACKEND="memory",
+        API_CACHE_BACKEND="memory" if api_cache else "none",
+        LIVE_EVENTS_BACKEND="none",
+        PYTHONPATH=os.pathsep.join(filter(None, [str(BACKEND_DIR), env.get("PYTHONPATH")])),
+    )
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    return env
+
+
+def run_suite(options: argparse.Namespace, suite: str, database_url: str, output: Path) -> List[Dict]:
+    """Run one suite in a child process and return its result rows"""
+    command = [
+        sys.executable, "-m", "benchmarks", "run", suite,
+        "--child-output", str(output),
+        *child_arguments(options),
+    ]
+    env = child_environment(database_url, options.api_cache)
+    subprocess.run(command, env=env, cwd=BACKEND_DIR, check=True)
+    return json.loads(output.read_text())
+
+
+def run_child(options: argparse.Namespace):
+    """Inside the suite process: run it and write the results as JSON"""
+    from benchmarks.suites import SUITES, prepare_database
+    
+    (suite,) = options.suites
+    database = "-"
+    if suite in DATABASE_SUITES:
+        prepare_database(options.reset)
+        database = make_url(os.environ["DATABASE_URL"]).get_backend_name()
+    results = SUITES[suite](options)
+    peak = peak_rss_mib()
+    rows = []
+    for result in results:
+        result.database = database
+        result.peak_rss_mib = peak
+        rows.append(result.as_dict())
+    Path(options.child_output).write_text(json.dumps(rows))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark parsing, scraping, upserts and the API"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    run = commands.add_parser("run", help="Run benchmark suites")
+    run.add_argument("suites", nargs="*", metavar="suite",
+                     help=f"Suites to run ({', '.join(SUITE_NAMES)}; default all)")
+    run.add_argument("--database-url", action="append", dest="database_urls",
+                     help="Database for the scrape, upsert and api suites (repeatable; default a temporary SQLite file)")
+    run.add_argument("--reset", action="store_true",
+                     help="Drop and recreate the tables first (use a scratch database)")
+    run.add_argument("--repeat", type=int, default=3, help="Samples per case")
+    run.add_argument("--teams", type=int, default=16, help="Teams per synthetic league")
+    run.add_argument("--games", type=int, default=240, help="Games per synthetic league")
+    run.add_argument("--players", type=int, default=20, help="Players per synthetic team")
+    run.add_argument("--rows", type=int, default=5000, help="Rows in the parsing suite's table")
+    run.add_argument("--fixture", type=Path, default=None,
+                     help="Recorded pages to replay in the scrape suite (default the bundled league)")
+    run.add_argument("--synthetic", action="store_true",
+                     help="Scrape suite: serve a synthetic league of the given size instead of a recording")
+    run.add_argument("--latency", type=float, default=0.0, help="Stub server delay per page in seconds")
+    run.add_argument("--requests", type=int, default=200, help="Requests per API endpoint")
+    run.add_argument("--concurrency", type=int, default=10, help="Concurrent API requests")
+    run.add_argument("--api-cache", action="store_true", help="Keep the in-memory API response cache on")
+    run.add_argument("--per-row", action="store_true", help="Use the per-row write path instead of bulk upserts")
+    run.add_argument("--json", type=Path, help="Write the results to this file")
+    run.add_argument("--compare", type=Path, help="Results file to compare against")
+    run.add_argument("--tolerance", type=float, default=0.25,
+                     help="Allowed throughput drop or p95 rise before a case counts as a regression")
+    run.add_argument("--child-output", help=argparse.SUPPRESS)
+    
+    record = commands.add_parser("record", help="Record a league's pages as a replayable fixture")
+    record.add_argument("platform", help="Registered platform name")
+    record.add_argument("league_url", help="League URL to scrape")
+    record.add_argument("output", type=Path, help="Fixture file to write")
+    return parser
+
+
+def child_arguments(options: argparse.Namespace) -> List[str]:
+    """Options of a run to hand to each suite process"""
+    arguments = []
+    for name in ("repeat", "teams", "games", "players", "rows", "fixture", "latency", "requests", "concurrency"):
+        value = getattr(options, name)
+        if isinstance(value, Path):
+            value = value.resolve()
+        if value is not None:
+            arguments.extend([f"--{name}", str(value)])
+    for name in ("reset", "synthetic", "api_cache", "per_row"):
+        if getattr(options, name):
+            arguments.append(f"--{name.replace('_', '-')}")
+    return arguments
+
+
+def record_fixture(options: argparse.Namespace):
+    """Scrape a league into a throwaway database while recording every page fetched"""
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.update(child_environment(f"sqlite:///{directory}/record.db"))
+        from app.scrapers.registry import create_scraper
+        from benchmarks.fixtures import Recording
+        from benchmarks.suites import prepare_database, scrape
+        
+        prepare_database(reset=False)
+        recording = Recording(urlsplit(options.league_url).path or "/", platform=options.platform)
+        scraper = create_scraper(options.platform, options.league_url)
+        recording.attach(scraper)
+        rows, seconds = scrape(scraper, options.league_url, bulk_upsert=True)
+        recording.save(options.output)
+        print(f"Recorded {len(recording.pages)} pages ({rows} rows, {seconds:.1f} s) to {options.output}")
+
+
+def main(argv: List[str] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    options = build_parser().parse_args(argv)
+    if options.command == "record":
+        record_fixture(options)
+        return
+    unknown = set(options.suites) - set(SUITE_NAMES)
+    if unknown:
+        raise SystemExit(f"Unknown suites: {', '.join(sorted(unknown))} (choose from {', '.join(SUITE_NAMES)})")
+    if options.teams < 2:
+        raise SystemExit("--teams must be at least 2")
+    if options.child_output:
+        run_child(options)
+        return
+    
+    suites = options.suites or list(SUITE_NAMES)
+    rows: List[Dict] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for suite in suites:
+            if suite in DATABASE_SUITES:
+                urls = options.database_urls or [f"sqlite:///{directory}/{suite}.db"]
+            else:
+                urls = ["sqlite://"]
+            for url in urls:
+                rows.extend(run_suite(options, suite, url, Path(directory) / f"{suite}.json"))
+    
+    print(format_table(rows))
+    if options.json:
+        options.json.write_text(json.dumps(rows, indent=1) + "\n")
+    if options.compare:
+        regressions = compare(rows, json.loads(options.compare.read_text()), options.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
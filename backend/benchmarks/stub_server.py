@@ -0,0 +1,72 @@
+"""Local HTTP server replaying recorded pages, for scraping without touching real platforms"""
+import time
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+
+class StubServer:
+    """Serve pages keyed by path (and query) on localhost, with ETags and optional latency
+    
+    Use as a context manager; url is the server's origin. Each request's service time
+    is kept in timings.
+    """
+    
+    def __init__(self, pages: Dict[str, str], latency: float = 0.0):
+        self.pages = {path: body.encode() for path, body in pages.items()}
+        self.etags = {path: f'"{hashlib.sha1(body).hexdigest()}"' for path, body in self.pages.items()}
+        self.latency = latency
+        self.requests = 0
+        self.timings: List[float] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+    
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+    
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def _handler(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def do_GET(self):
+                started = time.perf_counter()
+                if stub.latency:
+                    time.sleep(stub.latency)
+                body = stub.pages.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                elif self.headers.get("If-None-Match") == stub.etags[self.path]:
+                    self.send_response(304)
+                    self.send_header("ETag", stub.etags[self.path])
+                    self.end_headers()
+                else:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.send_header("ETag", stub.etags[self.path])
+                    self.end_headers()
+                    self.wfile.write(body)
+                with stub._lock:
+                    stub.requests += 1
+                    stub.timings.append(time.perf_counter() - started)
+            
+            def log_message(self, *args):
+                pass
+        
+        return Handler
@@ -0,0 +1,229 @@
+"""Benchmark suites; import only after the runner has set DATABASE_URL and friends"""
+import time
+import uuid
+import asyncio
+from argparse import Namespace
+from typing import Callable, Dict, List, Tuple
+import httpx
+from sqlalchemy import select, text
+from app.main import app
+from app.models import League, Player, Team
+from app.models.database import Base, SessionLocal, async_engine, engine
+from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.parsing import element_text, iter_table_rows, parse_html, select as select_nodes, select_one
+from app.scrapers.registry import create_scraper
+from app.scrapers.scraper_manager import ScraperManager
+from app.utils.query_counter import assert_max_queries
+from app.utils.schema import upgrade_database
+from benchmarks.fixtures import DEFAULT_FIXTURE, Recording
+from benchmarks.measure import CaseResult, Stopwatch
+from benchmarks.stub_server import StubServer
+from benchmarks.synthetic import SyntheticLeague, SyntheticScraper, build_schedule_page
+
+# Name, path and the most queries one uncached request may run (team and player
+# routes include the first lookup of their league for the response cache scope)
+API_ENDPOINTS = [
+    ("leagues", "/api/leagues", 1),
+    ("league", "/api/leagues/{league_id}", 1),
+    ("league teams", "/api/leagues/{league_id}/teams", 1),
+    ("league standings", "/api/leagues/{league_id}/standings", 1),
+    ("league games", "/api/leagues/{league_id}/games", 1),
+    ("league overview", "/api/leagues/{league_id}/overview", 4),
+    ("team", "/api/teams/{team_id}", 2),
+    ("team players", "/api/teams/{team_id}/players", 2),
+    ("team games", "/api/teams/{team_id}/games", 2),
+    ("team stats", "/api/teams/{team_id}/stats", 2),
+    ("player", "/api/players/{player_id}", 2),
+    ("player stats", "/api/players/{player_id}/stats", 2),
+]
+
+
+def prepare_database(reset: bool):
+    """Migrate the benchmark database to head, so it has the indexes production has"""
+    if reset:
+        Base.metadata.drop_all(engine)
+        with engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    upgrade_database(engine)
+
+
+def scrape(scraper: BaseScraper, league_url: str, bulk_upsert: bool) -> Tuple[int, float]:
+    """Run one full league scrape, returning the rows it stored and its wall time"""
+    manager = ScraperManager(bulk_upsert=bulk_upsert)
+    try:
+        manager.register_scraper(scraper.platform_name, scraper)
+        with Stopwatch() as stopwatch:
+            if not manager.scrape_league(scraper.platform_name, league_url):
+                raise RuntimeError(f"Scrape of {league_url} failed")
+        return sum(result.total for result in manager.last_results), stopwatch.seconds
+    finally:
+        manager.close()
+
+
+def synthetic_league(options: Namespace, seed: int = 0) -> SyntheticLeague:
+    return SyntheticLeague(
+        slug=f"bench-{uuid.uuid4().hex[:8]}",
+        teams=options.teams,
+        games=options.games,
+        players=options.players,
+        seed=seed,
+    )
+
+
+def run_parsing(options: Namespace) -> List[CaseResult]:
+    """Parse a schedule table with each backend: bs4 and lxml selectors, and lxml iterparse"""
+    content = build_schedule_page(options.rows)
+    
+    def extract_with_selectors(backend: str) -> int:
+        document = parse_html(content, backend)
+        count = 0
+        for row in select_nodes(document, "table#schedule tr.game"):
+            record = {
+                field: element_text(select_one(row, f"td.{field}"))
+                for field in ("date", "home", "away", "score", "venue")
+            }
+            count += bool(record)
+        return count
+    
+    cases: List[Tuple[str, Callable[[], int]]] = [
+        ("bs4 selectors", lambda: extract_with_selectors("bs4")),
+        ("lxml selectors", lambda: extract_with_selectors("lxml")),
+        ("lxml iterparse", lambda: sum(1 for _ in iter_table_rows(content, table_id="schedule"))),
+    ]
+    results = []
+    for name, extract in cases:
+        result = CaseResult("parsing", name, "rows")
+        for _ in range(options.repeat):
+            with Stopwatch() as stopwatch:
+                rows = extract()
+            result.add(rows, stopwatch.seconds)
+        results.append(result)
+    return results
+
+
+def run_scrape(options: Namespace) -> List[CaseResult]:
+    """Replay recorded pages through their platform's scraper and ScraperManager via the stub server
+    
+    Throughput is pages per second of the whole scrape (fetch, parse and store);
+    latencies are per page fetch. The first run stores a new league, the others
+    rescrape it unchanged.
+    """
+    if options.synthetic:
+        league = synthetic_league(options)
+        league_path = f"/leagues/{league.slug}"
+        recording = Recording(league_path, league.render_site(league_path))
+    else:
+        recording = Recording.load(options.fixture or DEFAULT_FIXTURE)
+    
+    cold = CaseResult("scrape", "replay new league", "pages")
+    warm = CaseResult("scrape", "replay unchanged", "pages")
+    with StubServer(recording.pages, options.latency) as stub:
+        league_url = stub.url + recording.league_path
+        for attempt in range(max(2, options.repeat)):
+            scraper = create_scraper(recording.platform, league_url)
+            elapsed: List[float] = []
+            scraper.session.hooks["response"].append(
+                lambda response, *args, **kwargs: elapsed.append(response.elapsed.total_seconds())
+            )
+            requests_before = stub.requests
+            _, seconds = scrape(scraper, league_url, not options.per_row)
+            case = cold if attempt == 0 else warm
+            case.ops += stub.requests - requests_before
+            case.seconds += seconds
+            case.latencies.extend(elapsed)
+    return [cold, warm]
+
+
+def run_upsert(options: Namespace) -> List[CaseResult]:
+    """Store synthetic leagues through ScraperManager with no HTTP involved
+    
+    Each repeat inserts a new league, rescrapes it unchanged, then rescrapes it with
+    a tenth of the games rescored. Throughput is rows processed per second and each
+    sample is one whole scrape.
+    """
+    cases = {
+        name: CaseResult("upsert", name, "rows") for name in ("insert", "unchanged", "rescored")
+    }
+    for attempt in range(options.repeat):
+        league = synthetic_league(options, seed=attempt)
+        scraper = SyntheticScraper(league)
+        league_url = scraper.base_url
+        cases["insert"].add(*scrape(scraper, league_url, not options.per_row))
+        cases["unchanged"].add(*scrape(scraper, league_url, not options.per_row))
+        league.revision = attempt + 1
+        cases["rescored"].add(*scrape(scraper, league_url, not options.per_row))
+    return list(cases.values())
+
+
+def run_api(options: Namespace) -> List[CaseResult]:
+    """Hit each read endpoint in-process over ASGI with a synthetic league loaded
+    
+    Team and player ids rotate so requests are not all for the same rows. Each
+    endpoint's first request runs alone and fails the suite if it goes over the
+    endpoint's query budget, which catches N+1 regressions.
+    """
+    league = synthetic_league(options)
+    scraper = SyntheticScraper(league)
+    scrape(scraper, scraper.base_url, not options.per_row)
+    
+    db = SessionLocal()
+    try:
+        league_id = db.scalar(select(League.id).where(League.slug == league.slug))
+        team_ids = db.scalars(select(Team.id).where(Team.league_id == league_id)).all()
+        player_ids = db.scalars(
+            select(Player.id).where(Player.team_id.in_(team_ids)).limit(options.requests)
+        ).all()
+    finally:
+        db.close()
+    
+    def paths(template: str) -> List[str]:
+        return [
+            template.format(
+                league_id=league_id,
+                team_id=team_ids[index % len(team_ids)],
+                player_id=player_ids[index % len(player_ids)] if player_ids else 0,
+            )
+            for index in range(options.requests)
+        ]
+    
+    return asyncio.run(_load_endpoints(
+        [(name, paths(template), budget) for name, template, budget in API_ENDPOINTS], options.concurrency
+    ))
+
+
+async def _load_endpoints(endpoints: List[Tuple[str, List[str], int]], concurrency: int) -> List[CaseResult]:
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name, paths, budget in endpoints:
+            result = CaseResult("api", name, "requests")
+            with assert_max_queries(budget, async_engine) as counter:
+                response = await client.get(paths[0])
+            if response.status_code >= 500:
+                raise RuntimeError(f"GET {paths[0]} returned {response.status_code}")
+            result.queries = counter.count
+            queue = list(reversed(paths))
+            
+            async def worker():
+                while queue:
+                    path = queue.pop()
+                    started = time.perf_counter()
+                    response = await client.get(path)
+                    if response.status_code >= 500:
+                        raise RuntimeError(f"GET {path} returned {response.status_code}")
+                    result.latencies.append(time.perf_counter() - started)
+            
+            with Stopwatch() as stopwatch:
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+            result.ops = len(paths)
+            result.seconds = stopwatch.seconds
+            results.append(result)
+    return results
+
+
+SUITES: Dict[str, Callable[[Namespace], List[CaseResult]]] = {
+    "parsing": run_parsing,
+    "scrape": run_scrape,
+    "upsert": run_upsert,
+    "api": run_api,
+}
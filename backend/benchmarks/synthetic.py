@@ -0,0 +1,247 @@
+"""Synthetic leagues of any size, as scraper output or as pages of the reference site layout"""
+import random
+from datetime import date, time, timedelta
+from html import escape
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.reference import (
+    PLAYER_STATS_COLUMNS, ROSTER_COLUMNS, SCORES_COLUMNS, STANDINGS_COLUMNS,
+)
+
+FIRST_NAMES = ("Alex", "Sam", "Jordan", "Casey", "Riley", "Morgan", "Jamie", "Taylor", "Drew", "Quinn")
+LAST_NAMES = ("Smith", "Brown", "Lee", "Martin", "Roy", "Walsh", "Clark", "Young", "King", "Hill")
+POSITIONS = ("C", "LW", "RW", "D", "D", "G")
+
+
+class SyntheticLeague:
+    """Deterministic league data: teams, a schedule with results, rosters and player stats
+    
+    A revision above zero rescores one game in ten (a different tenth per revision),
+    which is what an update-heavy rescrape looks like.
+    """
+    
+    def __init__(
+        self,
+        slug: str = "synthetic",
+        teams: int = 16,
+        games: int = 240,
+        players: int = 20,
+        season: str = "2024",
+        seed: int = 0,
+        start: date = date(2024, 1, 6)
+    ):
+        self.slug = slug
+        self.team_count = teams
+        self.game_count = games
+        self.players_per_team = players
+        self.season = season
+        self.seed = seed
+        self.start = start
+        self.revision = 0
+        self.team_names = [f"{slug.replace('-', ' ').title()} Team {index + 1}" for index in range(teams)]
+    
+    def league_info(self, league_url: str) -> Dict[str, Any]:
+        return {
+            "name": f"{self.slug.replace('-', ' ').title()} League",
+            "slug": self.slug,
+            "description": f"Synthetic league with {self.team_count} teams",
+            "source_url": league_url,
+        }
+    
+    def source_team_id(self, index: int) -> str:
+        return f"{self.slug}-t{index + 1}"
+    
+    def scores(self) -> List[Dict[str, Any]]:
+        rng = random.Random(self.seed)
+        per_day = max(1, self.team_count // 2)
+        final_games = int(self.game_count * 0.9)
+        games = []
+        for index in range(self.game_count):
+            home = rng.randrange(self.team_count)
+            away = (home + 1 + rng.randrange(self.team_count - 1)) % self.team_count
+            home_score, away_score = rng.randrange(7), rng.randrange(7)
+            if self.revision and (index + self.revision) % 10 == 0:
+                home_score, away_score = away_score + 1, home_score
+            played = index < final_games
+            games.append({
+                "source_game_id": f"{self.slug}-g{index + 1}",
+                "game_date": self.start + timedelta(days=index // per_day),
+                "game_time": time(19, 0),
+                "home_team": self.team_names[home],
+                "home_source_team_id": self.source_team_id(home),
+                "away_team": self.team_names[away],
+                "away_source_team_id": self.source_team_id(away),
+                "home_score": home_score if played else None,
+                "away_score": away_score if played else None,
+                "status": "final" if played else "scheduled",
+                "venue": f"Arena {home + 1}",
+            })
+        return games
+    
+    def standings(self) -> List[Dict[str, Any]]:
+        """Standings tallied from the final games (two points a win, one a tie)"""
+        table = {
+            name: {"wins": 0, "losses": 0, "ties": 0, "goals_for": 0, "goals_against": 0}
+            for name in self.team_names
+        }
+        for game in self.scores():
+            if game["status"] != "final":
+                continue
+            for team, scored, conceded in (
+                (game["home_team"], game["home_score"], game["away_score"]),
+                (game["away_team"], game["away_score"], game["home_score"]),
+            ):
+                record = table[team]
+                record["goals_for"] += scored
+                record["goals_against"] += conceded
+                outcome = "wins" if scored > conceded else "losses" if scored < conceded else "ties"
+                record[outcome] += 1
+        
+        rows = []
+        for index, name in enumerate(self.team_names):
+            record = table[name]
+            rows.append({
+                "team_name": name,
+                "source_team_id": self.source_team_id(index),
+                "season": self.season,
+                "games_played": record["wins"] + record["losses"] + record["ties"],
+                "points": record["wins"] * 2 + record["ties"],
+                "goal_difference": record["goals_for"] - record["goals_against"],
+                **record,
+            })
+        rows.sort(key=lambda row: (-row["points"], -row["goal_difference"], row["team_name"]))
+        for rank, row in enumerate(rows, start=1):
+            row["rank"] = rank
+        return rows
+    
+    def roster(self, source_team_id: str) -> List[Dict[str, Any]]:
+        rng = random.Random(f"{self.seed}-{source_team_id}")
+        players = []
+        for number in range(1, self.players_per_team + 1):
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            players.append({
+                "source_player_id": f"{source_team_id}-p{number}",
+                "first_name": first_name,
+                "last_name": last_name,
+                "full_name": f"{first_name} {last_name}",
+                "jersey_number": number,
+                "position": POSITIONS[number % len(POSITIONS)],
+            })
+        return players
+    
+    def player_stats(self, source_player_id: str) -> Dict[str, Any]:
+        rng = random.Random(f"{self.seed}-{source_player_id}")
+        goals, assists, shots = rng.randrange(30), rng.randrange(40), rng.randrange(60, 200)
+        return {
+            "season": self.season,
+            "games_played": rng.randrange(20, 82),
+            "goals": goals,
+            "assists": assists,
+            "points": goals + assists,
+            "shots": shots,
+            "shots_on_goal": shots // 2,
+            "penalty_minutes": rng.randrange(60),
+            "plus_minus": rng.randrange(-20, 21),
+        }
+    
+    def render_site(self, league_path: str) -> Dict[str, str]:
+        """Pages of the reference site layout, keyed by path (and query)"""
+        league_path = "/" + league_path.strip("/")
+        info = self.league_info(league_path)
+        pages = {
+            league_path: (
+                f"<html><head><title>{escape(info['name'])}</title></head><body>"
+                f"<h1 class='league-name'>{escape(info['name'])}</h1>"
+                f"<p class='league-description'>{escape(info['description'])}</p>"
+                "</body></html>"
+            ),
+        }
+        
+        standings = self.standings()
+        pages[f"{league_path}/standings"] = _page("Standings", "standings", STANDINGS_COLUMNS, (
+            (row["team_name"], row["source_team_id"], row["season"], row["games_played"], row["wins"],
+             row["losses"], row["ties"], row["points"], row["goals_for"], row["goals_against"])
+            for row in standings
+        ))
+        pages[f"{league_path}/scores"] = _page("Scores", "scores", SCORES_COLUMNS, (
+            (game["source_game_id"], game["game_date"].isoformat(), game["game_time"].strftime("%H:%M"),
+             game["home_team"], game["home_source_team_id"], game["away_team"], game["away_source_team_id"],
+             _blank(game["home_score"]), _blank(game["away_score"]), game["status"].title(), game["venue"])
+            for game in self.scores()
+        ))
+        for row in standings:
+            roster = self.roster(row["source_team_id"])
+            pages[f"{league_path}/teams/{row['source_team_id']}/roster"] = _page(
+                row["team_name"], "roster", ROSTER_COLUMNS, (
+                    (player["source_player_id"], player["first_name"], player["last_name"],
+                     player["jersey_number"], player["position"])
+                    for player in roster
+                )
+            )
+            for player in roster:
+                stats = self.player_stats(player["source_player_id"])
+                pages[f"{league_path}/players/{player['source_player_id']}"] = _page(
+                    player["full_name"], "stats", PLAYER_STATS_COLUMNS, [(
+                        stats["season"], stats["games_played"], stats["goals"], stats["assists"],
+                        stats["points"], stats["shots"], stats["shots_on_goal"],
+                        stats["penalty_minutes"], stats["plus_minus"],
+                    )]
+                )
+        return pages
+
+
+class SyntheticScraper(BaseScraper):
+    """Scraper returning a SyntheticLeague's data without any HTTP, to isolate the write path"""
+    
+    def __init__(self, league: SyntheticLeague, platform_name: str = "synthetic"):
+        super().__init__(platform_name, f"https://{league.slug}.example")
+        self.league = league
+    
+    def scrape_league_info(self, league_url: str) -> Dict[str, Any]:
+        return self.league.league_info(league_url)
+    
+    def scrape_standings(self, league_url: str) -> List[Dict[str, Any]]:
+        return self.league.standings()
+    
+    def scrape_scores(self, league_url: str, date: Optional[str] = None) -> List[Dict[str, Any]]:
+        games = self.league.scores()
+        return [game for game in games if game["game_date"].isoformat() == date] if date else games
+    
+    def scrape_rosters(self, team_url: str) -> List[Dict[str, Any]]:
+        return self.league.roster(team_url)
+    
+    def scrape_player_stats(self, player_url: str) -> Dict[str, Any]:
+        return self.league.player_stats(player_url)
+
+
+def _blank(value: Optional[int]) -> str:
+    return "" if value is None else str(value)
+
+
+def _page(title: str, table_id: str, columns: Sequence[str], rows: Iterable[Sequence]) -> str:
+    parts = [
+        f"<html><head><title>{escape(title)}</title></head><body><table id='{table_id}'><tr>",
+        "".join(f"<th>{escape(column)}</th>" for column in columns),
+        "</tr>",
+    ]
+    for row in rows:
+        parts.append("<tr>" + "".join(f"<td>{escape(str(cell))}</td>" for cell in row) + "</tr>")
+    parts.append("</table></body></html>")
+    return "".join(parts)
+
+
+def build_schedule_page(rows: int) -> bytes:
+    """Generate a schedule page with the given number of game rows (for the parsing suite)"""
+    parts = [
+        "<html><head><title>Schedule</title></head><body>",
+        "<table id='schedule'><tr><th>Date</th><th>Home</th><th>Away</th><th>Score</th><th>Venue</th></tr>",
+    ]
+    for i in range(rows):
+        parts.append(
+            f"<tr class='game'><td class='date'>2024-01-{i % 28 + 1:02d}</td>"
+            f"<td class='home'><a href='/teams/{i % 30}'>Team {i % 30}</a></td>"
+            f"<td class='away'><a href='/teams/{(i + 1) % 30}'>Team {(i + 1) % 30}</a></td>"
+            f"<td class='score'>{i % 7} - {i % 5}</td><td class='venue'>Arena {i % 12}</td></tr>"
+        )
+    parts.append("</table></body></html>")
+    return "".join(parts).encode()
@@ -0,0 +1,209 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('leagues',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('slug', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('source_url', sa.String(length=500), nullable=True),
+    sa.Column('source_platform', sa.String(length=100), nullable=True),
+    sa.Column('logo_url', sa.String(length=500), nullable=True),
+    sa.Column('active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_leagues_active', 'leagues', ['active'], unique=False)
+    op.create_index('ix_leagues_id', 'leagues', ['id'], unique=False)
+    op.create_index('ix_leagues_name', 'leagues', ['name'], unique=False)
+    op.create_index('ix_leagues_slug', 'leagues', ['slug'], unique=True)
+
+    op.create_table('teams',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('league_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('slug', sa.String(length=255), nullable=False),
+    sa.Column('abbreviation', sa.String(length=10), nullable=True),
+    sa.Column('logo_url', sa.String(length=500), nullable=True),
+    sa.Column('source_team_id', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['league_id'], ['leagues.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_teams_id', 'teams', ['id'], unique=False)
+    op.create_index('ix_teams_league_id', 'teams', ['league_id'], unique=False)
+    op.create_index('ix_teams_name', 'teams', ['name'], unique=False)
+    op.create_index('ix_teams_slug', 'teams', ['slug'], unique=False)
+
+    op.create_table('games',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('league_id', sa.Integer(), nullable=False),
+    sa.Column('home_team_id', sa.Integer(), nullable=False),
+    sa.Column('away_team_id', sa.Integer(), nullable=False),
+    sa.Column('game_date', sa.Date(), nullable=False),
+    sa.Column('game_time', sa.Time(), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('home_score', sa.Integer(), nullable=True),
+    sa.Column('away_score', sa.Integer(), nullable=True),
+    sa.Column('venue', sa.String(length=255), nullable=True),
+    sa.Column('source_game_id', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['away_team_id'], ['teams.id'], ),
+    sa.ForeignKeyConstraint(['home_team_id'], ['teams.id'], ),
+    sa.ForeignKeyConstraint(['league_id'], ['leagues.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_games_away_team_id', 'games', ['away_team_id'], unique=False)
+    op.create_index('ix_games_game_date', 'games', ['game_date'], unique=False)
+    op.create_index('ix_games_home_team_id', 'games', ['home_team_id'], unique=False)
+    op.create_index('ix_games_id', 'games', ['id'], unique=False)
+    op.create_index('ix_games_league_id', 'games', ['league_id'], unique=False)
+    op.create_index('ix_games_status', 'games', ['status'], unique=False)
+
+    op.create_table('players',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=False),
+    sa.Column('last_name', sa.String(length=100), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=False),
+    sa.Column('jersey_number', sa.Integer(), nullable=True),
+    sa.Column('position', sa.String(length=50), nullable=True),
+    sa.Column('date_of_birth', sa.Date(), nullable=True),
+    sa.Column('height', sa.String(length=20), nullable=True),
+    sa.Column('weight', sa.Integer(), nullable=True),
+    sa.Column('photo_url', sa.String(length=500), nullable=True),
+    sa.Column('source_player_id', sa.String(length=100), nullable=True),
+    sa.Column('active', sa.String(length=10), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_players_active', 'players', ['active'], unique=False)
+    op.create_index('ix_players_full_name', 'players', ['full_name'], unique=False)
+    op.create_index('ix_players_id', 'players', ['id'], unique=False)
+    op.create_index('ix_players_team_id', 'players', ['team_id'], unique=False)
+
+    op.create_table('standings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('league_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('season', sa.String(length=50), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=True),
+    sa.Column('losses', sa.Integer(), nullable=True),
+    sa.Column('ties', sa.Integer(), nullable=True),
+    sa.Column('points', sa.Integer(), nullable=True),
+    sa.Column('goals_for', sa.Integer(), nullable=True),
+    sa.Column('goals_against', sa.Integer(), nullable=True),
+    sa.Column('goal_difference', sa.Integer(), nullable=True),
+    sa.Column('win_percentage', sa.Float(), nullable=True),
+    sa.Column('games_played', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['league_id'], ['leagues.id'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_standings_id', 'standings', ['id'], unique=False)
+    op.create_index('ix_standings_league_id', 'standings', ['league_id'], unique=False)
+    op.create_index('ix_standings_season', 'standings', ['season'], unique=False)
+    op.create_index('ix_standings_team_id', 'standings', ['team_id'], unique=False)
+
+    op.create_table('team_statistics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('season', sa.String(length=50), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=True),
+    sa.Column('goals_for', sa.Integer(), nullable=True),
+    sa.Column('goals_against', sa.Integer(), nullable=True),
+    sa.Column('goal_difference', sa.Integer(), nullable=True),
+    sa.Column('shots_per_game', sa.Float(), nullable=True),
+    sa.Column('goals_per_game', sa.Float(), nullable=True),
+    sa.Column('power_play_percentage', sa.Float(), nullable=True),
+    sa.Column('penalty_kill_percentage', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_team_statistics_id', 'team_statistics', ['id'], unique=False)
+    op.create_index('ix_team_statistics_season', 'team_statistics', ['season'], unique=False)
+    op.create_index('ix_team_statistics_team_id', 'team_statistics', ['team_id'], unique=False)
+
+    op.create_table('player_statistics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('season', sa.String(length=50), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=True),
+    sa.Column('goals', sa.Integer(), nullable=True),
+    sa.Column('assists', sa.Integer(), nullable=True),
+    sa.Column('points', sa.Integer(), nullable=True),
+    sa.Column('shots', sa.Integer(), nullable=True),
+    sa.Column('shots_on_goal', sa.Integer(), nullable=True),
+    sa.Column('penalty_minutes', sa.Integer(), nullable=True),
+    sa.Column('plus_minus', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['player_id'], ['players.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_player_statistics_id', 'player_statistics', ['id'], unique=False)
+    op.create_index('ix_player_statistics_player_id', 'player_statistics', ['player_id'], unique=False)
+    op.create_index('ix_player_statistics_season', 'player_statistics', ['season'], unique=False)
+
+
+
+def downgrade():
+    op.drop_index('ix_player_statistics_season', table_name='player_statistics')
+    op.drop_index('ix_player_statistics_player_id', table_name='player_statistics')
+    op.drop_index('ix_player_statistics_id', table_name='player_statistics')
+    op.drop_table('player_statistics')
+    op.drop_index('ix_team_statistics_team_id', table_name='team_statistics')
+    op.drop_index('ix_team_statistics_season', table_name='team_statistics')
+    op.drop_index('ix_team_statistics_id', table_name='team_statistics')
+    op.drop_table('team_statistics')
+    op.drop_index('ix_standings_team_id', table_name='standings')
+    op.drop_index('ix_standings_season', table_name='standings')
+    op.drop_index('ix_standings_league_id', table_name='standings')
+    op.drop_index('ix_standings_id', table_name='standings')
+    op.drop_table('standings')
+    op.drop_index('ix_players_team_id', table_name='players')
+    op.drop_index('ix_players_id', table_name='players')
+    op.drop_index('ix_players_full_name', table_name='players')
+    op.drop_index('ix_players_active', table_name='players')
+    op.drop_table('players')
+    op.drop_index('ix_games_status', table_name='games')
+    op.drop_index('ix_games_league_id', table_name='games')
+    op.drop_index('ix_games_id', table_name='games')
+    op.drop_index('ix_games_home_team_id', table_name='games')
+    op.drop_index('ix_games_game_date', table_name='games')
+    op.drop_index('ix_games_away_team_id', table_name='games')
+    op.drop_table('games')
+    op.drop_index('ix_teams_slug', table_name='teams')
+    op.drop_index('ix_teams_name', table_name='teams')
+    op.drop_index('ix_teams_league_id', table_name='teams')
+    op.drop_index('ix_teams_id', table_name='teams')
+    op.drop_table('teams')
+    op.drop_index('ix_leagues_slug', table_name='leagues')
+    op.drop_index('ix_leagues_name', table_name='leagues')
+    op.drop_index('ix_leagues_id', table_name='leagues')
+    op.drop_index('ix_leagues_active', table_name='leagues')
+    op.drop_table('leagues')
@@ -0,0 +1,56 @@
+"""Unique indexes on natural keys and composite indexes for hot reads
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+UNIQUE_INDEXES = [
+    ('uq_teams_league_slug', 'teams', ['league_id', 'slug']),
+    ('uq_games_league_source', 'games', ['league_id', 'source_game_id']),
+    ('uq_players_team_source', 'players', ['team_id', 'source_player_id']),
+    ('uq_standings_league_team_season', 'standings', ['league_id', 'team_id', 'season']),
+    ('uq_team_statistics_team_season', 'team_statistics', ['team_id', 'season']),
+    ('uq_player_statistics_player_season', 'player_statistics', ['player_id', 'season']),
+]
+
+INDEXES = [
+    ('ix_games_league_date', 'games', ['league_id', 'game_date', 'id']),
+    ('ix_games_home_team_date', 'games', ['home_team_id', 'game_date', 'id']),
+    ('ix_games_away_team_date', 'games', ['away_team_id', 'game_date', 'id']),
+    ('ix_games_league_status_date', 'games', ['league_id', 'status', 'game_date']),
+    ('ix_standings_league_season_rank', 'standings', ['league_id', 'season', 'rank']),
+]
+
+# Derived rows are rebuilt on the next scrape, so duplicates there keep only the newest
+DERIVED_TABLES = [
+    ('standings', ['league_id', 'team_id', 'season']),
+    ('team_statistics', ['team_id', 'season']),
+    ('player_statistics', ['player_id', 'season']),
+]
+
+
+def upgrade():
+    for table, columns in DERIVED_TABLES:
+        key = ', '.join(columns)
+        op.execute(sa.text(
+            f"DELETE FROM {table} WHERE id NOT IN "
+            f"(SELECT MAX(id) FROM {table} GROUP BY {key})"
+        ))
+    for name, table, columns in UNIQUE_INDEXES:
+        op.create_index(name, table, columns, unique=True)
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES + UNIQUE_INDEXES):
+        op.drop_index(name, table_name=table)
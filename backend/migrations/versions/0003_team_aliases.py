@@ -0,0 +1,37 @@
+"""Team aliases for resolving inconsistently spelled team names
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('team_aliases',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('league_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('alias', sa.String(length=255), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['league_id'], ['leagues.id'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_team_aliases_id', 'team_aliases', ['id'], unique=False)
+    op.create_index('ix_team_aliases_team_id', 'team_aliases', ['team_id'], unique=False)
+    op.create_index('uq_team_aliases_league_alias', 'team_aliases', ['league_id', 'alias'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_team_aliases_league_alias', table_name='team_aliases')
+    op.drop_index('ix_team_aliases_team_id', table_name='team_aliases')
+    op.drop_index('ix_team_aliases_id', table_name='team_aliases')
+    op.drop_table('team_aliases')
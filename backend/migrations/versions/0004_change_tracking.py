@@ -0,0 +1,69 @@
+"""Record fingerprints and a change log per scrape run
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+FINGERPRINTED_TABLES = ('leagues', 'standings', 'games', 'players', 'team_statistics', 'player_statistics')
+
+
+def upgrade():
+    for table in FINGERPRINTED_TABLES:
+        op.add_column(table, sa.Column('fingerprint', sa.String(length=32), nullable=True))
+    
+    op.create_table('scrape_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('league_id', sa.Integer(), nullable=True),
+    sa.Column('platform', sa.String(length=100), nullable=False),
+    sa.Column('mode', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('inserted', sa.Integer(), nullable=True),
+    sa.Column('updated', sa.Integer(), nullable=True),
+    sa.Column('unchanged', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['league_id'], ['leagues.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_scrape_runs_id', 'scrape_runs', ['id'], unique=False)
+    op.create_index('ix_scrape_runs_started_at', 'scrape_runs', ['started_at'], unique=False)
+    op.create_index('ix_scrape_runs_league_started', 'scrape_runs', ['league_id', 'started_at'], unique=False)
+    
+    op.create_table('scrape_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('operation', sa.String(length=10), nullable=False),
+    sa.Column('fields', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['run_id'], ['scrape_runs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_scrape_changes_id', 'scrape_changes', ['id'], unique=False)
+    op.create_index('ix_scrape_changes_run_id', 'scrape_changes', ['run_id'], unique=False)
+    op.create_index('ix_scrape_changes_table_row', 'scrape_changes', ['table_name', 'row_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_scrape_changes_table_row', table_name='scrape_changes')
+    op.drop_index('ix_scrape_changes_run_id', table_name='scrape_changes')
+    op.drop_index('ix_scrape_changes_id', table_name='scrape_changes')
+    op.drop_table('scrape_changes')
+    op.drop_index('ix_scrape_runs_league_started', table_name='scrape_runs')
+    op.drop_index('ix_scrape_runs_started_at', table_name='scrape_runs')
+    op.drop_index('ix_scrape_runs_id', table_name='scrape_runs')
+    op.drop_table('scrape_runs')
+    
+    for table in reversed(FINGERPRINTED_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('fingerprint')
@@ -0,0 +1,41 @@
+"""Checkpoint scrape runs by stage and team so failed scrapes can resume
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('scrape_runs', sa.Column('attempts', sa.Integer(), nullable=True))
+    op.add_column('scrape_runs', sa.Column('touched_teams', sa.JSON(), nullable=True))
+    
+    op.create_table('scrape_checkpoints',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('stage', sa.String(length=20), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['run_id'], ['scrape_runs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_scrape_checkpoints_id', 'scrape_checkpoints', ['id'], unique=False)
+    op.create_index('ix_scrape_checkpoints_run_id', 'scrape_checkpoints', ['run_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_scrape_checkpoints_run_id', table_name='scrape_checkpoints')
+    op.drop_index('ix_scrape_checkpoints_id', table_name='scrape_checkpoints')
+    op.drop_table('scrape_checkpoints')
+    
+    with op.batch_alter_table('scrape_runs') as batch_op:
+        batch_op.drop_column('touched_teams')
+        batch_op.drop_column('attempts')
@@ -0,0 +1,78 @@
+"""Backfill fingerprints of rows written before change tracking
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+import json
+import hashlib
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# The fields each table's fingerprint covers, as of this revision
+FINGERPRINT_FIELDS = {
+    'leagues': ('name', 'description', 'source_url', 'logo_url'),
+    'standings': (
+        'rank', 'wins', 'losses', 'ties', 'points', 'goals_for',
+        'goals_against', 'goal_difference', 'win_percentage', 'games_played',
+    ),
+    'games': (
+        'home_team_id', 'away_team_id', 'game_date', 'game_time',
+        'status', 'home_score', 'away_score', 'venue',
+    ),
+    'players': ('first_name', 'last_name', 'full_name', 'jersey_number', 'position', 'photo_url'),
+    'team_statistics': (
+        'games_played', 'goals_for', 'goals_against', 'goal_difference', 'shots_per_game',
+        'goals_per_game', 'power_play_percentage', 'penalty_kill_percentage',
+    ),
+    'player_statistics': (
+        'games_played', 'goals', 'assists', 'points', 'shots', 'shots_on_goal',
+        'penalty_minutes', 'plus_minus',
+    ),
+}
+
+
+def _fingerprint(values):
+    # Same digest as app.scrapers.bulk_upsert.fingerprint over a record carrying every field
+    payload = json.dumps([list(item) for item in values], default=str, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def upgrade():
+    # Rows without a fingerprint were compared field by field on every scrape; hashing
+    # their stored values lets a rescrape that carries the same fields skip them
+    connection = op.get_bind()
+    for name, fields in FINGERPRINT_FIELDS.items():
+        # Reflected so dates and times come back as the objects scrapers hash
+        table = sa.Table(name, sa.MetaData(), autoload_with=connection)
+        statement = sa.update(table).where(table.c.id == sa.bindparam('row_id')).values(
+            fingerprint=sa.bindparam('digest')
+        )
+        last_id = 0
+        while True:
+            rows = connection.execute(
+                sa.select(table.c.id, *[table.c[field] for field in fields])
+                .where(table.c.fingerprint.is_(None), table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            connection.execute(statement, [
+                {'row_id': row[0], 'digest': _fingerprint(zip(fields, row[1:]))}
+                for row in rows
+            ])
+            last_id = rows[-1][0]
+
+
+def downgrade():
+    # Fingerprints only let scrapes skip unchanged rows, so leaving them is harmless
+    pass
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Add an alternative spelling of a team name, so scrapes resolve it to that team"""
+import sys
+import argparse
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.models.database import SessionLocal
+from app.models.team import Team, TeamAlias
+from app.scrapers.team_resolver import match_key
+from app.utils.logging_config import setup_logging
+
+setup_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add a team name alias")
+    parser.add_argument("league_id", type=int, help="League ID")
+    parser.add_argument("team_id", type=int, help="Team the alias refers to")
+    parser.add_argument("alias", help="Team name as a platform spells it")
+    
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        team = db.get(Team, args.team_id)
+        if team is None or team.league_id != args.league_id:
+            print(f"Team {args.team_id} not found in league {args.league_id}")
+            sys.exit(1)
+        key = match_key(args.alias)
+        if not key:
+            print("Alias needs at least one letter or digit")
+            sys.exit(1)
+        existing = [
+            alias for alias in db.query(TeamAlias).filter(TeamAlias.league_id == args.league_id)
+            if match_key(alias.alias) == key
+        ]
+        if existing:
+            print(f"Alias {existing[0].alias!r} already maps to team {existing[0].team_id}")
+            sys.exit(1)
+        db.add(TeamAlias(league_id=args.league_id, team_id=args.team_id, alias=args.alias))
+        db.commit()
+        print(f"Added alias {args.alias!r} for {team.name} (team {team.id})")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
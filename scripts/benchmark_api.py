@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Load-test API endpoints and report requests per second and latency percentiles
+
+Run it against a live server (e.g. `uvicorn app.main:app --workers 1`) before and
+after a change. Set API_CACHE_BACKEND=none and CACHE_VERSIONS_BACKEND=memory on the
+server to measure the database path rather than the response cache.
+"""
+import time
+import asyncio
+import argparse
+import statistics
+from typing import List
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/api/leagues",
+    "/api/leagues/1",
+    "/api/leagues/1/standings",
+    "/api/leagues/1/games",
+    "/api/teams/1/games",
+]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_load(base_url: str, paths: List[str], concurrency: int, duration: float) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker(offset: int):
+            nonlocal errors
+            index = offset
+            while time.perf_counter() < deadline:
+                path = paths[index % len(paths)]
+                index += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the stats API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", dest="paths", help="Endpoint to hit (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds to run")
+    args = parser.parse_args()
+    
+    result = asyncio.run(run_load(args.base_url, args.paths or DEFAULT_PATHS, args.concurrency, args.duration))
+    print(
+        f"{result['requests']} requests, {result['errors']} errors: "
+        f"{result['rps']:.0f} req/s, p50 {result['p50_ms']:.1f} ms, "
+        f"p99 {result['p99_ms']:.1f} ms, mean {result['mean_ms']:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
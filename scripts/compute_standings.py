@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Recompute a league's standings from its final game results"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.scrapers.standings import StandingsEngine
+from app.models.database import SessionLocal
+from app.utils.cache import bump_league_version
+from app.utils.logging_config import setup_logging
+
+setup_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute standings from final games")
+    parser.add_argument("league_id", type=int, help="League ID")
+    parser.add_argument("--season", help="Only recompute this season (e.g. 2024 or 2024-25)")
+    
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        engine = StandingsEngine(db)
+        started = time.perf_counter()
+        if args.season:
+            results = [engine.recompute(args.league_id, args.season)]
+        else:
+            results = engine.refresh(args.league_id)
+        db.commit()
+        elapsed = (time.perf_counter() - started) * 1000
+        bump_league_version(args.league_id)
+        for result in results:
+            print(result)
+        print(f"Recomputed standings for league {args.league_id} in {elapsed:.1f} ms")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
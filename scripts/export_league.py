@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Export a league's datasets as gzip CSV, Arrow IPC or Parquet files"""
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from sqlalchemy import select
+from app.models.database import engine
+from app.models.league import League
+from app.utils.export import (
+    DATASETS, EXPORT_FORMATS, SEASON_PATTERN, SEASONAL_DATASETS, ExportUnavailable, create_writer, export_batches
+)
+from app.utils.logging_config import setup_logging
+
+setup_logging()
+
+
+def season_name(value: str) -> str:
+    if not re.match(SEASON_PATTERN, value):
+        raise argparse.ArgumentTypeError(f"invalid season {value!r} (expected e.g. 2024 or 2024-25)")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export league datasets to files")
+    parser.add_argument("league_id", type=int, help="League ID")
+    parser.add_argument("output_dir", type=Path, help="Directory to write the files to")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="parquet", help="File format")
+    parser.add_argument(
+        "--season", type=season_name,
+        help="Only this season (e.g. 2024 or 2024-25); teams and players are not per season and export whole"
+    )
+    parser.add_argument(
+        "--datasets", nargs="+", choices=sorted(DATASETS), default=list(DATASETS),
+        help="Datasets to export (default all)"
+    )
+    
+    args = parser.parse_args()
+    
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    with engine.connect() as connection:
+        if connection.scalar(select(League.id).where(League.id == args.league_id)) is None:
+            print(f"League {args.league_id} not found")
+            sys.exit(1)
+        for dataset in args.datasets:
+            season = args.season if dataset in SEASONAL_DATASETS else None
+            statement = DATASETS[dataset](args.league_id, season)
+            try:
+                writer = create_writer(args.format, statement)
+            except ExportUnavailable as e:
+                print(e)
+                sys.exit(1)
+            suffix = f"-{season}" if season else ""
+            path = args.output_dir / f"league-{args.league_id}-{dataset}{suffix}.{writer.extension}"
+            started = time.perf_counter()
+            with open(path, "wb") as output:
+                for chunk in export_batches(connection, statement, writer):
+                    output.write(chunk)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"Wrote {writer.rows} {dataset} rows to {path} ({path.stat().st_size} bytes, {elapsed:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
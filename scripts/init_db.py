@@ -1,25 +1,21 @@
 #!/usr/bin/env python3
-"""Initialize database tables"""
+"""Create or migrate database tables"""
 import sys
 from pathlib import Path
 
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
 
-from app.models.database import Base, engine
-from app.models.league import League
-from app.models.team import Team
-from app.models.player import Player
-from app.models.game import Game
-from app.models.standing import Standing
-from app.models.statistics import PlayerStatistics, TeamStatistics
+from app.utils.schema import upgrade_database
 
 
 def init_database():
-    """Create all database tables"""
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully!")
+    """Bring the database schema up to the latest migration"""
+    print("Applying database migrations...")
+    revision = upgrade_database()
+    if revision is not None:
+        print(f"Adopted tables without migration history as revision {revision}")
+    print("Database schema is up to date!")
 
 
 if __name__ == "__main__":
@@ -8,6 +8,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
 
 from app.scrapers.scraper_manager import ScraperManager
+from app.scrapers.registry import SCRAPERS, create_scraper
 from app.utils.logging_config import setup_logging
 
 setup_logging()
@@ -15,15 +16,13 @@ setup_logging()
 
 def main():
     parser = argparse.ArgumentParser(description="Run scraper for a league")
-    parser.add_argument("platform", help="Platform name")
+    parser.add_argument("platform", choices=sorted(SCRAPERS), help="Platform name")
     parser.add_argument("url", help="League URL to scrape")
     
     args = parser.parse_args()
     
     manager = ScraperManager()
-    
-    # Register scrapers here when implemented
-    # manager.register_scraper("platform_name", PlatformScraper())
+    manager.register_scraper(args.platform, create_scraper(args.platform, args.url))
     
     try:
         print(f"Scraping {args.platform} league from {args.url}")